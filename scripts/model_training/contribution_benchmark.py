@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark de contribuciones por predicción.
+Mide el costo por fila de la descomposición por caminos (CompiledForest.contributions)
+sobre el modelo de producción de 150 árboles, comparado con la predicción sola,
+y verifica que base + contribuciones reproduce la predicción.
+"""
+
+import os
+import sys
+import json
+import time
+from datetime import datetime
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.app.models.compiled_forest import CompiledForest
+from src.app.models.ml_model import SteelRebarPredictor
+from src.app.utils.data_processor import DataProcessor
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DATA_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed', 'enhanced_steel_data_v2.csv')
+MODELS_DIR = os.path.join(PROJECT_ROOT, 'data', 'models')
+
+BATCH_SIZES = (1, 10, 100, 1000)
+
+
+def median_ms(fn, repeats):
+    """Mediana del tiempo de una llamada en milisegundos."""
+
+    fn()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return float(np.median(times))
+
+
+def main():
+    """Función principal del benchmark."""
+
+    print("🔍 BENCHMARK DE CONTRIBUCIONES POR PREDICCIÓN")
+    print("=" * 60)
+
+    history = DataProcessor.load_processed_history(DATA_PATH) if os.path.exists(DATA_PATH) \
+        else DataProcessor.generate_synthetic_history()
+    predictor = SteelRebarPredictor()
+    predictor.train(history)
+    matrices = predictor.feature_matrices(history)
+    X = matrices['X_scaled']
+
+    start = time.perf_counter()
+    forest = CompiledForest.from_estimator(predictor.model)
+    compile_ms = (time.perf_counter() - start) * 1000
+    print(f"\n🌲 Modelo: {forest.n_trees} árboles, {forest.n_nodes} nodos, profundidad {forest.max_depth}, "
+          f"{forest.n_features} features (compilación {compile_ms:.1f} ms, una vez por versión)")
+
+    bias, contributions = forest.contributions(X)
+    additivity_error = float(np.abs(bias + contributions.sum(axis=1) - predictor.model.predict(X)).max())
+    print(f"✅ Error máximo |base + contribuciones - predicción|: {additivity_error:.2e}")
+
+    print(f"\n{'Filas':<8} {'Predicción (ms)':<17} {'Contribuciones (ms)':<21} {'ms/fila':<10}")
+    print("-" * 60)
+    results = {}
+    for batch_size in BATCH_SIZES:
+        rows = X[np.arange(batch_size) % len(X)]
+        repeats = 50 if batch_size <= 100 else 10
+        predict_ms = median_ms(lambda: predictor.model.predict(rows), repeats)
+        contributions_ms = median_ms(lambda: forest.contributions(rows), repeats)
+        results[batch_size] = {
+            'predict_ms': predict_ms,
+            'contributions_ms': contributions_ms,
+            'contributions_ms_per_row': contributions_ms / batch_size
+        }
+        print(f"{batch_size:<8} {predict_ms:<17.3f} {contributions_ms:<21.3f} {contributions_ms / batch_size:<10.4f}")
+
+    report = {
+        'n_trees': forest.n_trees,
+        'n_nodes': forest.n_nodes,
+        'max_depth': forest.max_depth,
+        'n_features': forest.n_features,
+        'compile_ms': compile_ms,
+        'additivity_error': additivity_error,
+        'batches': results
+    }
+    os.makedirs(MODELS_DIR, exist_ok=True)
+    report_path = os.path.join(MODELS_DIR, f"contribution_benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Reporte guardado: {os.path.basename(report_path)}")
+
+
+if __name__ == "__main__":
+    main()
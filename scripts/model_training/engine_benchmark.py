@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark de motores de entrenamiento: Random Forest vs HistGradientBoosting.
+Compara tiempo de ajuste, memoria pico, tamaño del artefacto, latencia por
+fila y MAPE sobre el dataset procesado y los generadores sintéticos, incluido
+un dataset ancho del tamaño del modelo comprehensive (~136 features).
+"""
+
+import os
+import sys
+import json
+import time
+import resource
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_percentage_error
+from sklearn.preprocessing import StandardScaler
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.app.models.ml_model import SteelRebarPredictor
+from src.app.utils.data_processor import DataProcessor
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DATA_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed', 'enhanced_steel_data_v2.csv')
+MODELS_DIR = os.path.join(PROJECT_ROOT, 'data', 'models')
+
+ENGINES = ('random_forest', 'random_forest_final', 'hist_gradient_boosting')
+
+
+def build_engine(name):
+    """Construir el modelo de cada motor con la configuración de producción."""
+
+    predictor = SteelRebarPredictor()
+    if name == 'random_forest':
+        return predictor._build_forest()
+    if name == 'random_forest_final':
+        # Configuración de FinalEnhancedTrainer (modelo comprehensive)
+        return RandomForestRegressor(
+            n_estimators=300, max_depth=20, min_samples_split=3, min_samples_leaf=1,
+            max_features='sqrt', random_state=42, n_jobs=-1
+        )
+    return predictor._build_hist_gradient_boosting()
+
+
+def predictor_dataset(history):
+    """Features de SteelRebarPredictor (las que usa la API)."""
+
+    predictor = SteelRebarPredictor()
+    df = predictor.prepare_features(history)
+    return df[predictor.feature_names].values, df['price'].values
+
+
+def wide_frame(n_series=6, seed=42):
+    """Dataset sintético ancho: indicadores técnicos de varias series de mercado."""
+
+    history = DataProcessor.generate_synthetic_history(seed=seed)
+    rng = np.random.default_rng(seed)
+    for i in range(n_series - 4):
+        history[f'market_{i}_price'] = 100 + np.cumsum(rng.normal(0, 1, len(history)))
+
+    series = [col for col in history.columns if col != 'date']
+    df = DataProcessor.add_multi_series_indicators(history, series)
+    df['target'] = df['price'].shift(-1)  # precio del día siguiente
+    df = df.dropna()
+    features = [col for col in df.columns if col not in ('date', 'target')]
+    return df, features
+
+
+def wide_dataset(n_series=6, seed=42):
+    """Matrices X, y del dataset sintético ancho."""
+
+    df, features = wide_frame(n_series, seed)
+    return df[features].values, df['target'].values
+
+
+def load_datasets():
+    """Datasets del benchmark: procesado (si existe) y sintéticos."""
+
+    datasets = {}
+    if os.path.exists(DATA_PATH):
+        datasets['enhanced_steel_data_v2'] = predictor_dataset(DataProcessor.load_processed_history(DATA_PATH))
+    datasets['synthetic'] = predictor_dataset(DataProcessor.generate_synthetic_history())
+    datasets['synthetic_wide'] = wide_dataset()
+    return datasets
+
+
+def benchmark_engine(name, X_train, y_train, X_test, y_test):
+    """Medir un motor en un proceso nuevo para aislar la memoria pico."""
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    model = build_engine(name)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+    # ru_maxrss está en KB en Linux
+    peak_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'model.joblib')
+        joblib.dump(model, path)
+        artifact_kb = os.path.getsize(path) / 1024
+
+    row = X_test[:1]
+    model.predict(row)
+    latencies = []
+    for _ in range(50):
+        start = time.perf_counter()
+        model.predict(row)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'fit_time_s': fit_time,
+        'peak_memory_mb': peak_mb,
+        'artifact_kb': artifact_kb,
+        'single_row_ms': float(np.median(latencies)),
+        'mape': float(mean_absolute_percentage_error(y_test, model.predict(X_test)))
+    }
+
+
+def run_dataset(X, y, test_fraction=0.2):
+    """Comparar todos los motores con un corte temporal train/test."""
+
+    split = int(len(X) * (1 - test_fraction))
+    scaler = StandardScaler().fit(X[:split])
+    X_train, X_test = scaler.transform(X[:split]), scaler.transform(X[split:])
+    y_train, y_test = y[:split], y[split:]
+
+    results = {}
+    for engine in ENGINES:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            results[engine] = executor.submit(benchmark_engine, engine, X_train, y_train, X_test, y_test).result()
+    return results
+
+
+def main():
+    """Función principal del benchmark."""
+
+    print("🏁 BENCHMARK DE MOTORES: RANDOM FOREST VS HISTGRADIENTBOOSTING")
+    print("=" * 70)
+
+    report = {}
+    for dataset_name, (X, y) in load_datasets().items():
+        print(f"\n📊 {dataset_name}: {X.shape[0]} muestras, {X.shape[1]} features")
+        print(f"{'Motor':<24} {'Ajuste (s)':<11} {'Memoria (MB)':<13} {'Artefacto (KB)':<15} {'1 fila (ms)':<12} {'MAPE':<8}")
+        print("-" * 85)
+
+        results = run_dataset(X, y)
+        for engine, result in results.items():
+            print(f"{engine:<24} {result['fit_time_s']:<11.2f} {result['peak_memory_mb']:<13.1f} "
+                  f"{result['artifact_kb']:<15.1f} {result['single_row_ms']:<12.3f} {result['mape']:<8.4f}")
+        report[dataset_name] = {'n_samples': int(X.shape[0]), 'n_features': int(X.shape[1]), 'engines': results}
+
+    os.makedirs(MODELS_DIR, exist_ok=True)
+    report_path = os.path.join(MODELS_DIR, f"engine_benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Reporte guardado: {os.path.basename(report_path)}")
+    print("💡 Usar MODEL_TYPE=hist_gradient_boosting para servir el motor de boosting")
+
+
+if __name__ == "__main__":
+    main()
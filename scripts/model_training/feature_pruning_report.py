@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Reporte de poda de features guiada por importancia.
+Muestra cuántas features de los modelos guardados tienen importancia casi
+nula y ejecuta FeaturePruner (con guardia de MAPE walk-forward) sobre las
+features de la API y sobre un dataset sintético ancho (~130 features).
+"""
+
+import os
+import sys
+import glob
+import json
+from datetime import datetime
+
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.app.models.feature_pruning import FeaturePruner
+from src.app.models.ml_model import SteelRebarPredictor
+from src.app.utils.data_processor import DataProcessor
+from scripts.model_training.engine_benchmark import wide_frame
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DATA_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed', 'enhanced_steel_data_v2.csv')
+MODELS_DIR = os.path.join(PROJECT_ROOT, 'data', 'models')
+
+NEAR_ZERO_IMPORTANCE = 0.001
+
+
+def saved_importance_summary():
+    """Features con importancia casi nula en los CSV de importancia guardados."""
+
+    summary = {}
+    for path in sorted(glob.glob(os.path.join(MODELS_DIR, '*feature_importance*.csv'))):
+        importances = pd.read_csv(path, index_col=0).iloc[:, 0]
+        near_zero = importances[importances < NEAR_ZERO_IMPORTANCE]
+        summary[os.path.basename(path)] = {
+            'n_features': int(len(importances)),
+            'near_zero': int(len(near_zero)),
+            'top_5_share': float(importances.sort_values(ascending=False).head(5).sum())
+        }
+        print(f"   {os.path.basename(path)}: {len(importances)} features, "
+              f"{len(near_zero)} con importancia < {NEAR_ZERO_IMPORTANCE}")
+    return summary
+
+
+def run_pruner(name, X, y, feature_names, tolerance=0.02):
+    """Ejecutar la poda y mostrar el resultado."""
+
+    X_scaled = StandardScaler().fit_transform(X)
+    predictor = SteelRebarPredictor()
+    report = FeaturePruner(predictor._build_forest(), tolerance=tolerance, n_splits=5).fit(X_scaled, y, feature_names)
+
+    reasons = pd.Series([item['reason'] for item in report['dropped_features']]).value_counts().to_dict()
+    print(f"\n✂️ {name}: {report['n_features_before']} → {report['n_features_after']} features "
+          f"en {report['pruning_time']:.1f}s")
+    print(f"   MAPE walk-forward: {report['baseline_mape']:.4f} → {report['final_mape']:.4f} "
+          f"(tolerancia {tolerance:.0%})")
+    print(f"   Eliminadas: {reasons}")
+    return report
+
+
+def main():
+    """Función principal del reporte."""
+
+    print("✂️ REPORTE DE PODA DE FEATURES")
+    print("=" * 60)
+
+    print("\n📋 Importancias de modelos guardados:")
+    report = {'saved_models': saved_importance_summary()}
+
+    history = DataProcessor.load_processed_history(DATA_PATH) if os.path.exists(DATA_PATH) \
+        else DataProcessor.generate_synthetic_history()
+    predictor = SteelRebarPredictor()
+    df = predictor.prepare_features(history)
+    report['api_features'] = run_pruner("Features de la API", df[predictor.feature_names].values,
+                                        df['price'].values, predictor.feature_names)
+
+    wide, wide_features = wide_frame()
+    report['synthetic_wide'] = run_pruner("Dataset sintético ancho", wide[wide_features].values,
+                                          wide['target'].values, wide_features)
+
+    os.makedirs(MODELS_DIR, exist_ok=True)
+    report_path = os.path.join(MODELS_DIR, f"feature_pruning_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Reporte guardado: {os.path.basename(report_path)}")
+    print("💡 Usar FEATURE_PRUNING=true para podar en cada reentrenamiento completo de la API")
+
+
+if __name__ == "__main__":
+    main()
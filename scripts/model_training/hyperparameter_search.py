@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Búsqueda de hiperparámetros con successive halving para el Random Forest.
+Explora n_estimators, max_depth, min_samples_* y max_features, evaluando
+candidatos en paralelo con un presupuesto total de núcleos. Las matrices
+escaladas de cada fold se cachean en disco y se comparten entre procesos.
+El mejor perfil se guarda en un JSON que SteelRebarPredictor puede cargar.
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_percentage_error
+from sklearn.model_selection import TimeSeriesSplit
+from sklearn.preprocessing import StandardScaler
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.app.models.ml_model import SteelRebarPredictor
+from src.app.utils.data_processor import DataProcessor
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DATA_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed', 'enhanced_steel_data_v2.csv')
+MODELS_DIR = os.path.join(PROJECT_ROOT, 'data', 'models')
+CACHE_DIR = os.path.join(PROJECT_ROOT, 'data', 'processed', 'search_cache')
+
+SEARCH_SPACE = {
+    'n_estimators': [100, 150, 200, 300],
+    'max_depth': [8, 10, 12, 15, 20, None],
+    'min_samples_split': [2, 3, 5, 10],
+    'min_samples_leaf': [1, 2, 4],
+    'max_features': ['sqrt', 'log2', 0.5, 1.0]
+}
+
+
+class FoldMatrixCache:
+    """Caché en disco de matrices escaladas por fold, indexada por hash de datos."""
+
+    def __init__(self, X, y, n_splits=3, cache_dir=CACHE_DIR):
+        self.X = np.ascontiguousarray(X, dtype=np.float64)
+        self.y = np.ascontiguousarray(y, dtype=np.float64)
+        self.n_splits = n_splits
+        self.cache_dir = cache_dir
+        self.data_hash = hashlib.sha1(self.X.tobytes() + self.y.tobytes()).hexdigest()[:16]
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def fold_paths(self, data_fraction):
+        """Rutas de los folds para la fracción más reciente de los datos."""
+
+        n_rows = max(int(len(self.X) * data_fraction), (self.n_splits + 1) * 10)
+        key = f"{self.data_hash}_{self.n_splits}_{n_rows}"
+        paths = [os.path.join(self.cache_dir, f"folds_{key}_{i}.joblib") for i in range(self.n_splits)]
+
+        if all(os.path.exists(path) for path in paths):
+            self.hits += 1
+            return paths
+
+        self.misses += 1
+        X, y = self.X[-n_rows:], self.y[-n_rows:]
+        splitter = TimeSeriesSplit(n_splits=self.n_splits)
+        for path, (train_idx, test_idx) in zip(paths, splitter.split(X)):
+            # El escalador se ajusta solo con el pasado de cada fold
+            scaler = StandardScaler().fit(X[train_idx])
+            joblib.dump({
+                'X_train': scaler.transform(X[train_idx]),
+                'y_train': y[train_idx],
+                'X_test': scaler.transform(X[test_idx]),
+                'y_test': y[test_idx]
+            }, path)
+        return paths
+
+
+def evaluate_candidate(params, n_trees, fold_paths, n_jobs):
+    """Entrenar un candidato en todos los folds y devolver su MAPE medio."""
+
+    start_time = time.time()
+    scores = []
+    for path in fold_paths:
+        fold = joblib.load(path, mmap_mode='r')
+        model = RandomForestRegressor(
+            **{**params, 'n_estimators': n_trees},
+            random_state=42,
+            n_jobs=n_jobs,
+            bootstrap=True
+        )
+        model.fit(fold['X_train'], fold['y_train'])
+        scores.append(mean_absolute_percentage_error(fold['y_test'], model.predict(fold['X_test'])))
+    return float(np.mean(scores)), time.time() - start_time
+
+
+class SuccessiveHalvingSearch:
+    """Successive halving sobre número de árboles y tamaño de datos."""
+
+    def __init__(self, n_candidates=27, eta=3, min_trees=25, min_data_fraction=0.35,
+                 core_budget=None, cores_per_candidate=1, n_splits=3, random_state=42):
+        self.n_candidates = n_candidates
+        self.eta = eta
+        self.min_trees = min_trees
+        self.min_data_fraction = min_data_fraction
+        self.core_budget = core_budget or os.cpu_count() or 1
+        self.cores_per_candidate = cores_per_candidate
+        self.n_splits = n_splits
+        self.random_state = random_state
+        self.leaderboard = []
+
+    def sample_candidates(self):
+        """Muestrear candidatos únicos del espacio de búsqueda."""
+
+        grid = [dict(zip(SEARCH_SPACE, values)) for values in itertools.product(*SEARCH_SPACE.values())]
+        rng = np.random.default_rng(self.random_state)
+        chosen = rng.choice(len(grid), size=min(self.n_candidates, len(grid)), replace=False)
+        return [grid[i] for i in chosen]
+
+    def n_rounds(self):
+        return int(np.floor(np.log(self.n_candidates) / np.log(self.eta))) + 1
+
+    def run(self, X, y):
+        """Ejecutar la búsqueda y devolver el mejor candidato."""
+
+        cache = FoldMatrixCache(X, y, n_splits=self.n_splits)
+        candidates = [{'id': i, 'params': params} for i, params in enumerate(self.sample_candidates())]
+        n_rounds = self.n_rounds()
+        max_workers = max(1, self.core_budget // self.cores_per_candidate)
+
+        print(f"🔍 {len(candidates)} candidatos, {n_rounds} rondas, {max_workers} procesos "
+              f"x {self.cores_per_candidate} núcleos (presupuesto: {self.core_budget})")
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for round_idx in range(n_rounds):
+                # La última ronda usa todos los datos y el n_estimators de cada candidato
+                data_fraction = max(self.min_data_fraction, self.eta ** (round_idx - n_rounds + 1))
+                round_trees = self.min_trees * self.eta ** round_idx
+                fold_paths = cache.fold_paths(data_fraction)
+
+                futures = []
+                for candidate in candidates:
+                    n_trees = min(candidate['params']['n_estimators'], round_trees)
+                    if round_idx == n_rounds - 1:
+                        n_trees = candidate['params']['n_estimators']
+                    futures.append((candidate, n_trees, executor.submit(
+                        evaluate_candidate, candidate['params'], n_trees, fold_paths, self.cores_per_candidate
+                    )))
+
+                round_results = []
+                for candidate, n_trees, future in futures:
+                    mape, fit_time = future.result()
+                    entry = {
+                        'round': round_idx,
+                        'candidate_id': candidate['id'],
+                        'n_trees': n_trees,
+                        'data_fraction': round(data_fraction, 3),
+                        'mape': mape,
+                        'fit_time_s': fit_time,
+                        **{f'param_{k}': v for k, v in candidate['params'].items()}
+                    }
+                    round_results.append((mape, candidate))
+                    self.leaderboard.append(entry)
+
+                round_results.sort(key=lambda item: item[0])
+                print(f"   Ronda {round_idx + 1}: {len(candidates)} candidatos, {round_trees} árboles máx, "
+                      f"{data_fraction:.0%} de datos, mejor MAPE {round_results[0][0]:.4f}")
+
+                keep = max(1, len(candidates) // self.eta)
+                candidates = [candidate for _, candidate in round_results[:keep]]
+
+        best_mape = min(entry['mape'] for entry in self.leaderboard if entry['round'] == n_rounds - 1)
+        print(f"💾 Caché de folds: {cache.hits} aciertos, {cache.misses} fallos")
+        return candidates[0], best_mape
+
+
+def save_results(search, best, best_mape, n_features, n_samples):
+    """Guardar leaderboard y el perfil elegido."""
+
+    os.makedirs(MODELS_DIR, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    leaderboard = pd.DataFrame(search.leaderboard).sort_values(['round', 'mape'], ascending=[False, True])
+    leaderboard_path = os.path.join(MODELS_DIR, f'hyperparameter_leaderboard_{timestamp}.csv')
+    leaderboard.to_csv(leaderboard_path, index=False)
+
+    # Formato que carga SteelRebarPredictor.load_training_profile()
+    profile = {
+        'name': f'search_{timestamp}',
+        'params': best['params'],
+        'cv_mape': best_mape,
+        'created_at': datetime.now().isoformat(),
+        'search': {
+            'method': 'successive_halving',
+            'n_candidates': search.n_candidates,
+            'eta': search.eta,
+            'n_splits': search.n_splits,
+            'n_features': n_features,
+            'n_samples': n_samples,
+            'leaderboard_file': os.path.basename(leaderboard_path)
+        }
+    }
+    profile_path = os.path.join(MODELS_DIR, 'training_profile.json')
+    with open(profile_path, 'w') as f:
+        json.dump(profile, f, indent=2)
+
+    return leaderboard_path, profile_path
+
+
+def main():
+    """Función principal de la búsqueda."""
+
+    print("🚀 BÚSQUEDA DE HIPERPARÁMETROS - SUCCESSIVE HALVING")
+    print("=" * 60)
+
+    if os.path.exists(DATA_PATH):
+        history = DataProcessor.load_processed_history(DATA_PATH)
+    else:
+        history = DataProcessor.generate_synthetic_history()
+
+    # Mismas features que usa la API para que el perfil sea transferible
+    predictor = SteelRebarPredictor()
+    df = predictor.prepare_features(history)
+    X = df[predictor.feature_names].values
+    y = df['price'].values
+    print(f"📊 {len(X)} muestras, {X.shape[1]} features")
+
+    search = SuccessiveHalvingSearch()
+    start_time = time.time()
+    best, best_mape = search.run(X, y)
+    print(f"⏱️ Tiempo total: {time.time() - start_time:.1f}s")
+
+    leaderboard_path, profile_path = save_results(search, best, best_mape, X.shape[1], len(X))
+
+    print(f"\n🏆 Mejor perfil (MAPE {best_mape:.4f}):")
+    for name, value in best['params'].items():
+        print(f"   - {name}: {value}")
+    print(f"\n💾 Leaderboard: {os.path.basename(leaderboard_path)}")
+    print(f"💾 Perfil: {os.path.basename(profile_path)} (TRAINING_PROFILE_PATH para la API)")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,13 +12,21 @@ import time
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_absolute_percentage_error, r2_score
-from sklearn.model_selection import cross_val_score
 import json
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.app.utils.indicators import frame_values, indicators_to_frame, rolling_mean, pct_change
+from src.app.models.validation import get_validation_strategy, confidence_from_mape
 
 class OptimizedSteelRebarTrainer:
     """Entrenador optimizado con diferentes perfiles de velocidad/precisión."""
     
-    def __init__(self):
+    def __init__(self, validation_strategy="oob"):
+        self.validation_strategy = validation_strategy
         self.training_profiles = {
             "ultra_fast": {
                 "n_estimators": 50,
@@ -113,11 +121,15 @@ class OptimizedSteelRebarTrainer:
         # Features básicos de precios
         price_columns = ['rebar_price', 'iron_ore_price', 'coal_price']
         
-        for col in price_columns:
-            df[f'{col}_ma_7'] = df[col].rolling(7).mean()
-            df[f'{col}_ma_14'] = df[col].rolling(14).mean()
-            df[f'{col}_change_1d'] = df[col].pct_change(1)
-            df[f'{col}_change_7d'] = df[col].pct_change(7)
+        # Todas las series se calculan en una sola pasada vectorizada
+        prices = frame_values(df, price_columns)
+        price_features = {
+            'ma_7': rolling_mean(prices, 7),
+            'ma_14': rolling_mean(prices, 14),
+            'change_1d': pct_change(prices, 1),
+            'change_7d': pct_change(prices, 7)
+        }
+        df = pd.concat([df, indicators_to_frame(price_features, price_columns, df.index)], axis=1)
         
         # Features de USD/MXN
         df['usd_mxn_ma_7'] = df['usd_mxn_rate'].rolling(7).mean()
@@ -184,18 +196,16 @@ class OptimizedSteelRebarTrainer:
         model.fit(X_scaled, y)
         training_time = time.time() - start_time
         
-        # Evaluar modelo
-        print("📊 Evaluando modelo...")
+        # Evaluar modelo (OOB por defecto: no requiere reentrenar el bosque)
+        print(f"📊 Evaluando modelo (validación: {self.validation_strategy})...")
         eval_start = time.time()
         
-        cv_scores = cross_val_score(
-            model, X_scaled, y, 
-            cv=profile['cv_folds'], 
-            scoring='neg_mean_absolute_percentage_error'
-        )
+        validator = get_validation_strategy(self.validation_strategy, n_splits=profile['cv_folds'])
+        validation = validator.evaluate(model, X_scaled, y)
+        cv_scores = -np.array(validation['fold_scores'])
         
         eval_time = time.time() - eval_start
-        model_confidence = max(0.5, min(0.95, 1 - abs(cv_scores.mean())))
+        model_confidence = confidence_from_mape(validation['mape'])
         
         # Feature importance
         feature_importance = dict(zip(numeric_columns, model.feature_importances_))
@@ -223,7 +233,8 @@ class OptimizedSteelRebarTrainer:
             'eval_time': eval_time,
             'total_time': training_time + eval_time,
             'profile': profile_name,
-            'cv_scores': cv_scores.tolist()
+            'cv_scores': cv_scores.tolist(),
+            'validation': validation
         }
     
     def benchmark_all_profiles(self, data):
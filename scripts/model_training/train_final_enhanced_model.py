@@ -22,6 +22,10 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.
 
 from scripts.data_collection.steel_rebar_specific_sources import SteelRebarSpecificSources
 from scripts.data_collection.additional_real_data_sources import AdditionalRealDataSources
+from src.app.utils.indicators import (
+    frame_values, rolling_mean, rolling_std, rolling_min, rolling_max,
+    pct_change, rsi, macd, bollinger_bands
+)
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -150,44 +154,41 @@ class FinalEnhancedTrainer:
         
         # Add rolling window features for steel price
         logger.info("📊 Adding rolling window features...")
+        prices = frame_values(df, [self.target])
         for window in [7, 14, 30, 60, 90]:
-            df[f'steel_price_ma_{window}'] = df[self.target].rolling(window=window).mean()
-            df[f'steel_price_std_{window}'] = df[self.target].rolling(window=window).std()
-            df[f'steel_price_min_{window}'] = df[self.target].rolling(window=window).min()
-            df[f'steel_price_max_{window}'] = df[self.target].rolling(window=window).max()
+            df[f'steel_price_ma_{window}'] = rolling_mean(prices, window)[:, 0]
+            df[f'steel_price_std_{window}'] = rolling_std(prices, window)[:, 0]
+            df[f'steel_price_min_{window}'] = rolling_min(prices, window)[:, 0]
+            df[f'steel_price_max_{window}'] = rolling_max(prices, window)[:, 0]
             df[f'steel_price_range_{window}'] = df[f'steel_price_max_{window}'] - df[f'steel_price_min_{window}']
         
         # Add momentum and volatility features
         logger.info("🚀 Adding momentum and volatility features...")
         for period in [7, 14, 30, 60]:
             df[f'steel_momentum_{period}'] = df[self.target].diff(period)
-            df[f'steel_momentum_pct_{period}'] = df[self.target].pct_change(period) * 100
-            df[f'steel_volatility_{period}'] = df[self.target].rolling(window=period).std()
+            df[f'steel_momentum_pct_{period}'] = pct_change(prices, period)[:, 0] * 100
+            df[f'steel_volatility_{period}'] = rolling_std(prices, period)[:, 0]
             df[f'steel_volatility_pct_{period}'] = (df[f'steel_volatility_{period}'] / df[self.target]) * 100
         
         # Add technical indicators
         logger.info("📈 Adding technical indicators...")
         # RSI
-        delta = df[self.target].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['steel_rsi'] = 100 - (100 / (1 + rs))
+        df['steel_rsi'] = rsi(prices, 14)[:, 0]
         
         # MACD
-        exp1 = df[self.target].ewm(span=12).mean()
-        exp2 = df[self.target].ewm(span=26).mean()
-        df['steel_macd'] = exp1 - exp2
-        df['steel_macd_signal'] = df['steel_macd'].ewm(span=9).mean()
-        df['steel_macd_histogram'] = df['steel_macd'] - df['steel_macd_signal']
+        macd_result = macd(prices, 12, 26, 9)
+        df['steel_macd'] = macd_result['macd'][:, 0]
+        df['steel_macd_signal'] = macd_result['signal'][:, 0]
+        df['steel_macd_histogram'] = macd_result['histogram'][:, 0]
         
         # Bollinger Bands
-        df['steel_bb_middle'] = df[self.target].rolling(window=20).mean()
-        df['steel_bb_std'] = df[self.target].rolling(window=20).std()
-        df['steel_bb_upper'] = df['steel_bb_middle'] + (df['steel_bb_std'] * 2)
-        df['steel_bb_lower'] = df['steel_bb_middle'] - (df['steel_bb_std'] * 2)
-        df['steel_bb_width'] = df['steel_bb_upper'] - df['steel_bb_lower']
-        df['steel_bb_position'] = (df[self.target] - df['steel_bb_lower']) / (df['steel_bb_upper'] - df['steel_bb_lower'])
+        bands = bollinger_bands(prices, 20)
+        df['steel_bb_middle'] = bands['middle'][:, 0]
+        df['steel_bb_std'] = bands['std'][:, 0]
+        df['steel_bb_upper'] = bands['upper'][:, 0]
+        df['steel_bb_lower'] = bands['lower'][:, 0]
+        df['steel_bb_width'] = bands['width'][:, 0]
+        df['steel_bb_position'] = bands['position'][:, 0]
         
         # Add interaction features
         logger.info("🔗 Adding interaction features...")
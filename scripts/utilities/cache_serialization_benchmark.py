@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark de serialización del caché de datos de entrenamiento.
+Compara pickle con el formato columnar (Arrow IPC si pyarrow está instalado,
+formato numpy con/sin zlib en caso contrario): tamaño del payload, tiempo de
+serialización y de deserialización, y número de chunks de Redis resultantes.
+"""
+
+import os
+import sys
+import json
+import math
+import pickle
+import time
+from datetime import datetime
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.app.utils.data_processor import DataProcessor
+from src.app.utils.frame_serializer import PYARROW_AVAILABLE, serialize_frame, deserialize_frame
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DATA_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed', 'enhanced_steel_data_v2.csv')
+MODELS_DIR = os.path.join(PROJECT_ROOT, 'data', 'models')
+
+CHUNK_SIZE = 1024 * 1024
+REPEATS = 30
+
+
+def median_ms(fn, repeats=REPEATS):
+    """Mediana del tiempo de una llamada en milisegundos."""
+
+    fn()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return float(np.median(times))
+
+
+def main():
+    """Función principal del benchmark."""
+
+    print("📦 BENCHMARK DE SERIALIZACIÓN DEL CACHÉ")
+    print("=" * 70)
+
+    history = DataProcessor.load_processed_history(DATA_PATH) if os.path.exists(DATA_PATH) \
+        else DataProcessor.generate_synthetic_history()
+    print(f"📊 Datos: {len(history)} filas x {len(history.columns)} columnas")
+    print(f"🏹 pyarrow disponible: {'sí' if PYARROW_AVAILABLE else 'no (se usa el formato numpy)'}")
+
+    formats = {'pickle': (lambda df: pickle.dumps(df), pickle.loads)}
+    if PYARROW_AVAILABLE:
+        formats['arrow_zstd'] = (lambda df: serialize_frame(df, 'zstd', use_arrow=True), deserialize_frame)
+        formats['arrow_lz4'] = (lambda df: serialize_frame(df, 'lz4', use_arrow=True), deserialize_frame)
+    formats['columnar_zlib'] = (lambda df: serialize_frame(df, 'zlib', use_arrow=False), deserialize_frame)
+    formats['columnar_raw'] = (lambda df: serialize_frame(df, None, use_arrow=False), deserialize_frame)
+
+    print(f"\n{'Formato':<16} {'Bytes':<10} {'Serializar (ms)':<17} {'Deserializar (ms)':<19} {'Chunks':<6}")
+    print("-" * 70)
+    results = {}
+    for name, (dumps, loads) in formats.items():
+        payload = dumps(history)
+        results[name] = {
+            'bytes': len(payload),
+            'serialize_ms': median_ms(lambda: dumps(history)),
+            'deserialize_ms': median_ms(lambda: loads(payload)),
+            'chunks': max(1, math.ceil(len(payload) / CHUNK_SIZE))
+        }
+        r = results[name]
+        print(f"{name:<16} {r['bytes']:<10} {r['serialize_ms']:<17.3f} {r['deserialize_ms']:<19.3f} {r['chunks']:<6}")
+
+    report = {
+        'rows': len(history),
+        'columns': len(history.columns),
+        'pyarrow_available': PYARROW_AVAILABLE,
+        'chunk_size': CHUNK_SIZE,
+        'formats': results
+    }
+    os.makedirs(MODELS_DIR, exist_ok=True)
+    report_path = os.path.join(MODELS_DIR, f"cache_serialization_benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Reporte guardado: {os.path.basename(report_path)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,22 +5,56 @@ Implementa métricas dinámicas basadas en intervalos de predicción, R-cuadrado
 y cálculos de confianza propios para sistemas de producción.
 """
 
+import copy
+import hashlib
 import numpy as np
 import pandas as pd
-from typing import Dict, Tuple, Optional
+import warnings
+from collections import OrderedDict
+from typing import Dict, Tuple, Optional, Sequence
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import r2_score
 import joblib
+import os
+import sys
 from datetime import datetime
 
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.app.models.compiled_forest import CompiledForest
+from src.app.utils.quantile_sketch import QuantileSketchStore
+from src.app.utils.feature_cache import frame_hash
+
 class DynamicConfidenceCalculator:
     """Calculadora dinámica de confianza para modelos de ML en producción."""
     
-    def __init__(self):
+    # Peso de cada componente en la confianza final
+    COMPONENT_WEIGHTS = {
+        'interval': 0.40,
+        'stability': 0.20,
+        'quality': 0.15,
+        'temporal': 0.15,
+        'volatility': 0.10
+    }
+    
+    def __init__(self, result_cache_size: int = 256):
         self.model = None
         self.scaler = None
         self.feature_names = []
+        self.model_version = None
         self.historical_performance = {}
+        self.compiled_forest = None
+        self._compiled_model_id = None
+        # Máscaras e índices que solo cambian con el modelo
+        self._model_constants = None
+        # LRU de resultados completos por versión de modelo y huella del vector de features
+        self.result_cache_size = result_cache_size
+        self._result_cache = OrderedDict()
+        self.result_cache_hits = 0
+        self.result_cache_misses = 0
+        # Sketches por serie; si existen, la calidad de datos se responde desde ellas
+        self.quality_sketches: Optional[QuantileSketchStore] = None
         self.confidence_thresholds = {
             'excellent': 0.90,
             'good': 0.80,
@@ -35,46 +69,96 @@ class DynamicConfidenceCalculator:
             self.model = model_data['model']
             self.scaler = model_data['scaler']
             self.feature_names = model_data['feature_names']
+            self.model_version = f"{os.path.basename(model_path)}@{os.path.getmtime(model_path):.0f}"
             print(f"✅ Modelo cargado exitosamente desde {model_path}")
             return True
         except Exception as e:
             print(f"❌ Error cargando modelo: {e}")
             return False
     
-    def calculate_prediction_intervals(self, X_scaled: np.ndarray, confidence_level: float = 0.95) -> Tuple[float, float, float]:
-        """Calcular intervalos de predicción usando ensemble de árboles."""
+    def get_model_constants(self) -> Dict:
+        """Máscara de features importantes e índices de volatilidad, calculados una vez por modelo."""
+        
+        constants = self._model_constants
+        if constants is None or constants['model'] is not self.model or constants['feature_names'] != self.feature_names:
+            importances = getattr(self.model, 'feature_importances_', None)
+            top_features_mask = None
+            if importances is not None:
+                importances = np.asarray(importances)
+                top_features_mask = importances > np.percentile(importances, 75)
+            # Modelo nuevo: los resultados guardados ya no son válidos
+            self._result_cache.clear()
+            constants = self._model_constants = {
+                'model': self.model,
+                'feature_names': list(self.feature_names),
+                'top_features_mask': top_features_mask,
+                'volatility_indices': np.array(
+                    [i for i, f in enumerate(self.feature_names) if 'volatility' in f.lower()], dtype=int
+                )
+            }
+        return constants
+    
+    def _result_cache_key(self, X: np.ndarray, data_quality: pd.DataFrame, days_since_training: int) -> Tuple:
+        features_hash = hashlib.sha1(np.ascontiguousarray(X, dtype=np.float64).tobytes()).hexdigest()
+        data_hash = frame_hash(data_quality) if data_quality is not None else None
+        if self.quality_sketches is not None:
+            # El score de calidad también depende del estado de los sketches, ya
+            # alimentados con ``data_quality`` (ver calculate_dynamic_confidence)
+            data_hash = (data_hash, sum(sketch.observations for sketch in self.quality_sketches.series.values()))
+        self.get_model_constants()
+        return (self.model_version, features_hash, data_hash, days_since_training)
+    
+    def get_result_cache_stats(self) -> Dict:
+        """Aciertos y fallos del LRU de resultados de confianza."""
+        total = self.result_cache_hits + self.result_cache_misses
+        return {
+            'size': len(self._result_cache),
+            'max_size': self.result_cache_size,
+            'hits': self.result_cache_hits,
+            'misses': self.result_cache_misses,
+            'hit_rate': self.result_cache_hits / total if total else 0.0
+        }
+    
+    def get_compiled_forest(self) -> CompiledForest:
+        """Obtener la representación compilada del modelo actual (se compila una vez por modelo)."""
+        
+        # Artefactos compactos ya contienen el bosque compilado
+        if isinstance(self.model, CompiledForest):
+            return self.model
         
         if not hasattr(self.model, 'estimators_'):
             raise ValueError("El modelo debe ser un ensemble para calcular intervalos de predicción")
         
-        # Obtener predicciones de todos los árboles
-        tree_predictions = np.array([tree.predict(X_scaled) for tree in self.model.estimators_])
+        if self.compiled_forest is None or self._compiled_model_id != id(self.model):
+            self.compiled_forest = CompiledForest.from_estimator(self.model)
+            self._compiled_model_id = id(self.model)
         
-        # Calcular estadísticas
-        mean_prediction = np.mean(tree_predictions, axis=0)
-        std_prediction = np.std(tree_predictions, axis=0)
+        return self.compiled_forest
+    
+    def calculate_prediction_distribution(self, X_scaled: np.ndarray, confidence_level: float = 0.95,
+                                          quantiles=(0.05, 0.5, 0.95)) -> Dict:
+        """Media, intervalos y cuantiles de todos los árboles en una sola pasada vectorizada."""
         
         # Calcular intervalos de confianza
-        alpha = 1 - confidence_level
         z_score = 1.96  # Para 95% de confianza
         
-        lower_bound = mean_prediction - z_score * std_prediction
-        upper_bound = mean_prediction + z_score * std_prediction
+        return self.get_compiled_forest().prediction_distribution(X_scaled, z_score=z_score, quantiles=quantiles)
+    
+    def calculate_prediction_intervals(self, X_scaled: np.ndarray, confidence_level: float = 0.95) -> Tuple[float, float, float]:
+        """Calcular intervalos de predicción usando ensemble de árboles."""
         
-        # Ancho del intervalo (menor ancho = mayor confianza)
-        interval_width = upper_bound - lower_bound
+        distribution = self.calculate_prediction_distribution(X_scaled, confidence_level)
         
-        return mean_prediction[0], lower_bound[0], upper_bound[0]
+        return distribution['mean'][0], distribution['lower_bound'][0], distribution['upper_bound'][0]
     
     def calculate_feature_stability(self, features: np.ndarray) -> float:
         """Calcular estabilidad de features basada en importancia y valores."""
         
-        if not hasattr(self.model, 'feature_importances_'):
+        # Máscara de features importantes (precalculada por modelo)
+        top_features_mask = self.get_model_constants()['top_features_mask']
+        if top_features_mask is None:
             return 0.5  # Valor por defecto
         
-        # Obtener importancia de features
-        feature_importance = self.model.feature_importances_
-        
         # Asegurar que features sea un array 1D
         if features.ndim > 1:
             features = features.flatten()
@@ -83,7 +167,6 @@ class DynamicConfidenceCalculator:
         features_normalized = (features - np.mean(features)) / (np.std(features) + 1e-8)
         
         # Calcular estabilidad basada en desviación estándar de features importantes
-        top_features_mask = feature_importance > np.percentile(feature_importance, 75)
         top_features_values = features_normalized[top_features_mask]
         
         # Estabilidad inversamente proporcional a la variabilidad
@@ -94,27 +177,77 @@ class DynamicConfidenceCalculator:
         
         return min(1.0, max(0.0, stability))
     
+    def use_quality_sketches(self, path: str) -> QuantileSketchStore:
+        """Usar (y persistir en ``path``) sketches de cuantiles en streaming para la calidad de datos."""
+        self.quality_sketches = QuantileSketchStore.load(path)
+        return self.quality_sketches
+    
     def calculate_data_quality_score(self, data: pd.DataFrame) -> float:
-        """Calcular score de calidad de datos."""
+        """Calcular score de calidad de datos.
+        
+        Con sketches activos, solo las filas nuevas de ``data`` actualizan los
+        sketches y el score sale de su estado en O(columnas).
+        """
+        
+        if self.quality_sketches is not None:
+            if data is not None and len(data):
+                self.quality_sketches.update_frame(data)
+            return self.quality_sketches.quality_score()
+        
+        return self._window_quality_score(data)
+    
+    def _window_quality_score(self, data: pd.DataFrame) -> float:
+        """Score de calidad de un bloque de filas con su propio IQR (sin sketches)."""
         
         # Verificar datos faltantes
         missing_ratio = data.isnull().sum().sum() / (len(data) * len(data.columns))
         
-        # Verificar outliers (usando IQR)
-        outlier_ratio = 0
-        for col in data.select_dtypes(include=[np.number]).columns:
-            Q1 = data[col].quantile(0.25)
-            Q3 = data[col].quantile(0.75)
-            IQR = Q3 - Q1
-            outliers = ((data[col] < (Q1 - 1.5 * IQR)) | (data[col] > (Q3 + 1.5 * IQR))).sum()
-            outlier_ratio += outliers / len(data)
-        
-        outlier_ratio = outlier_ratio / len(data.select_dtypes(include=[np.number]).columns)
+        # Verificar outliers (usando IQR) en todas las columnas numéricas a la vez
+        numeric = data.select_dtypes(include=[np.number]).to_numpy(dtype=np.float64)
+        outlier_ratio = self._outlier_ratio(numeric[None, :, :])[0]
         
         # Calcular score de calidad (0-1, donde 1 es perfecto)
         quality_score = 1.0 - missing_ratio - outlier_ratio
         return max(0.0, min(1.0, quality_score))
     
+    @staticmethod
+    def _outlier_ratio(windows: np.ndarray) -> np.ndarray:
+        """Proporción media de outliers IQR por columna, para ventanas (n_ventanas, filas, columnas)."""
+        
+        with warnings.catch_warnings():
+            # Columnas sin datos en una ventana no tienen outliers (igual que pandas)
+            warnings.simplefilter('ignore', RuntimeWarning)
+            q1, q3 = np.nanquantile(windows, [0.25, 0.75], axis=1)
+        iqr = q3 - q1
+        lower = (q1 - 1.5 * iqr)[:, None, :]
+        upper = (q3 + 1.5 * iqr)[:, None, :]
+        outliers = ((windows < lower) | (windows > upper)).sum(axis=1)
+        return (outliers / windows.shape[1]).mean(axis=1)
+    
+    def calculate_data_quality_scores(self, data: pd.DataFrame, window: Optional[int] = None) -> np.ndarray:
+        """Score de calidad por ventanas consecutivas de ``window`` filas (una sola si es None).
+        
+        Los cuantiles de todas las ventanas completas se calculan en una sola
+        llamada vectorizada; la última ventana parcial se evalúa aparte con el
+        mismo IQR por ventana. Los sketches no se usan ni se actualizan aquí.
+        """
+        
+        if window is None or window >= len(data):
+            return np.array([self._window_quality_score(data)])
+        
+        numeric = data.select_dtypes(include=[np.number]).to_numpy(dtype=np.float64)
+        missing = data.isnull().to_numpy().sum(axis=1)
+        n_full = len(data) // window
+        
+        full = slice(0, n_full * window)
+        missing_ratio = missing[full].reshape(n_full, window).sum(axis=1) / (window * data.shape[1])
+        outlier_ratio = self._outlier_ratio(numeric[full].reshape(n_full, window, -1))
+        scores = np.clip(1.0 - missing_ratio - outlier_ratio, 0.0, 1.0)
+        
+        if len(data) > n_full * window:
+            scores = np.append(scores, self._window_quality_score(data.iloc[n_full * window:]))
+        return scores
+    
     def calculate_temporal_confidence(self, current_date: datetime, last_training_date: datetime) -> float:
         """Calcular confianza basada en la antigüedad del modelo."""
         
@@ -133,23 +266,14 @@ class DynamicConfidenceCalculator:
         if features.ndim > 1:
             features = features.flatten()
         
-        # Buscar features relacionados con volatilidad
-        volatility_features = [f for f in self.feature_names if 'volatility' in f.lower()]
+        # Índices de features de volatilidad (precalculados por modelo)
+        volatility_indices = self.get_model_constants()['volatility_indices']
         
-        if not volatility_features:
+        if not len(volatility_indices):
             return 0.8  # Valor por defecto
         
-        # Obtener índices de features de volatilidad
-        volatility_indices = []
-        for f in volatility_features:
-            if f in self.feature_names:
-                volatility_indices.append(self.feature_names.index(f))
-        
-        if not volatility_indices:
-            return 0.8
-        
         # Calcular volatilidad promedio
-        avg_volatility = np.mean([features[i] for i in volatility_indices])
+        avg_volatility = np.mean(features[volatility_indices])
         
         # Normalizar volatilidad (asumiendo que valores altos = mayor incertidumbre)
         max_expected_volatility = 50.0  # Valor de referencia
@@ -173,6 +297,20 @@ class DynamicConfidenceCalculator:
         if last_training_date is None:
             last_training_date = datetime.now()
         
+        # Las filas nuevas entran en los sketches antes de calcular la clave: el
+        # score de calidad depende del estado posterior, y así una repetición acierta
+        if self.quality_sketches is not None and data_quality is not None and len(data_quality):
+            self.quality_sketches.update_frame(data_quality)
+        
+        # Mismo modelo, mismo vector y mismos datos: el resultado ya está en el LRU
+        cache_key = self._result_cache_key(X, data_quality, (current_date - last_training_date).days)
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            self._result_cache.move_to_end(cache_key)
+            self.result_cache_hits += 1
+            return copy.deepcopy(cached)
+        self.result_cache_misses += 1
+        
         # Escalar features
         X_scaled = self.scaler.transform(X.reshape(1, -1))
         
@@ -197,13 +335,7 @@ class DynamicConfidenceCalculator:
         volatility_confidence = self.calculate_market_volatility_impact(X[0])
         
         # Calcular confianza ponderada
-        weights = {
-            'interval': 0.40,
-            'stability': 0.20,
-            'quality': 0.15,
-            'temporal': 0.15,
-            'volatility': 0.10
-        }
+        weights = dict(self.COMPONENT_WEIGHTS)
         
         dynamic_confidence = (
             weights['interval'] * interval_confidence +
@@ -226,7 +358,7 @@ class DynamicConfidenceCalculator:
         else:
             confidence_level = 'poor'
         
-        return {
+        result = {
             'dynamic_confidence': dynamic_confidence,
             'confidence_level': confidence_level,
             'components': {
@@ -244,6 +376,115 @@ class DynamicConfidenceCalculator:
             },
             'weights_used': weights
         }
+        
+        self._result_cache[cache_key] = copy.deepcopy(result)
+        if len(self._result_cache) > self.result_cache_size:
+            self._result_cache.popitem(last=False)
+        
+        return result
+    
+    def calculate_dynamic_confidence_batch(self,
+                                           X: np.ndarray,
+                                           data_quality: pd.DataFrame,
+                                           current_dates: Optional[Sequence[datetime]] = None,
+                                           last_training_date: datetime = None,
+                                           quality_window: Optional[int] = None) -> pd.DataFrame:
+        """Confianza dinámica de N filas (N x features) en una sola pasada.
+        
+        Todos los árboles se recorren una vez para las N filas; estabilidad,
+        temporalidad y volatilidad se calculan vectorizadas. La calidad de
+        datos se calcula una vez por ventana: con ``quality_window`` las filas
+        de ``data_quality`` (alineadas con X) se agrupan en ventanas
+        consecutivas de ese tamaño y cada fila recibe el score de su ventana;
+        sin ella se usa un único score para todo el lote.
+        
+        Devuelve un DataFrame con la confianza, el nivel, los cinco
+        componentes y el intervalo de predicción de cada fila.
+        """
+        
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        n_rows = len(X)
+        
+        if current_dates is None:
+            current_dates = [datetime.now()] * n_rows
+        if last_training_date is None:
+            last_training_date = datetime.now()
+        
+        X_scaled = self.scaler.transform(X)
+        
+        # 1. Intervalos de predicción: un solo recorrido de todos los árboles
+        try:
+            distribution = self.calculate_prediction_distribution(X_scaled)
+            pred_mean, pred_lower, pred_upper = (distribution['mean'], distribution['lower_bound'],
+                                                 distribution['upper_bound'])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                interval_confidence = np.where(
+                    pred_mean > 0, np.maximum(0.0, 1.0 - (pred_upper - pred_lower) / pred_mean), 0.5
+                )
+        except ValueError:
+            pred_mean = pred_lower = pred_upper = np.full(n_rows, np.nan)
+            interval_confidence = np.full(n_rows, 0.5)
+        
+        # 2. Estabilidad de features (normalización por fila)
+        constants = self.get_model_constants()
+        top_features_mask = constants['top_features_mask']
+        if top_features_mask is None or not top_features_mask.any():
+            feature_stability = np.full(n_rows, 0.5)
+        else:
+            normalized = (X - X.mean(axis=1, keepdims=True)) / (X.std(axis=1, keepdims=True) + 1e-8)
+            feature_stability = np.clip(1.0 / (1.0 + normalized[:, top_features_mask].std(axis=1)), 0.0, 1.0)
+        
+        # 3. Calidad de datos, una vez por ventana
+        quality_scores = self.calculate_data_quality_scores(data_quality, quality_window)
+        if quality_window is None or len(quality_scores) == 1:
+            data_quality_score = np.full(n_rows, quality_scores[0])
+        else:
+            data_quality_score = quality_scores[np.minimum(np.arange(n_rows) // quality_window, len(quality_scores) - 1)]
+        
+        # 4. Confianza temporal
+        days_since_training = (pd.to_datetime(pd.Series(current_dates)) - pd.Timestamp(last_training_date)).dt.days.to_numpy()
+        temporal_confidence = np.maximum(0.5, 1.0 - days_since_training * 0.01)
+        
+        # 5. Impacto de volatilidad del mercado
+        volatility_indices = constants['volatility_indices']
+        if len(volatility_indices):
+            normalized_volatility = np.minimum(1.0, np.abs(X[:, volatility_indices].mean(axis=1)) / 50.0)
+            volatility_confidence = np.maximum(0.5, 1.0 - normalized_volatility * 0.3)
+        else:
+            volatility_confidence = np.full(n_rows, 0.8)
+        
+        weights = self.COMPONENT_WEIGHTS
+        dynamic_confidence = np.clip(
+            weights['interval'] * interval_confidence +
+            weights['stability'] * feature_stability +
+            weights['quality'] * data_quality_score +
+            weights['temporal'] * temporal_confidence +
+            weights['volatility'] * volatility_confidence,
+            0.5, 0.98
+        )
+        
+        thresholds = self.confidence_thresholds
+        confidence_level = np.select(
+            [dynamic_confidence >= thresholds['excellent'], dynamic_confidence >= thresholds['good'],
+             dynamic_confidence >= thresholds['fair']],
+            ['excellent', 'good', 'fair'], default='poor'
+        )
+        
+        return pd.DataFrame({
+            'dynamic_confidence': dynamic_confidence,
+            'confidence_level': confidence_level,
+            'interval_confidence': interval_confidence,
+            'feature_stability': feature_stability,
+            'data_quality_score': data_quality_score,
+            'temporal_confidence': temporal_confidence,
+            'volatility_confidence': volatility_confidence,
+            'mean': pred_mean,
+            'lower_bound': pred_lower,
+            'upper_bound': pred_upper,
+            'width': pred_upper - pred_lower
+        })
 
 def demo_dynamic_confidence():
     """Demostración del cálculo de confianza dinámica."""
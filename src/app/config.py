@@ -1,7 +1,7 @@
 """Configuration settings for the Steel Rebar Price Predictor API."""
 
 import os
-from typing import List
+from typing import Dict, List
 try:
     from pydantic_settings import BaseSettings
     from pydantic import ConfigDict
@@ -22,9 +22,56 @@ class Settings(BaseSettings):
     fred_api_key: str = ""
     
     # Model Configuration
-    model_update_frequency: int = 24  # hours
+    model_update_frequency: int = 24  # hours (fixed retraining clock when drift retraining is off)
     cache_ttl: int = 3600  # seconds (1 hour)
+    cache_l1_max_entries: int = 128  # in-process entries in front of Redis; 0 disables the L1 tier
+    cache_l1_ttl: int = 60  # upper bound in seconds on how long an L1 copy is served
+    cache_chunk_size: int = 1024 * 1024  # bytes per Redis value; larger payloads are split into chunks
+    cache_memory_max_entries: int = 1024  # in-memory fallback bounds when Redis is unavailable
+    cache_memory_max_bytes: int = 256 * 1024 * 1024
+    cache_memory_policy: str = "lru"  # lru or lfu
+    cache_sweep_interval: int = 60  # seconds between sweeps of expired in-memory entries
+    cache_generation_refresh: float = 5.0  # seconds a worker trusts its cached namespace generation
+    cache_cleanup_batch_size: int = 100  # keys per SCAN step when reclaiming cleared generations
+    cache_snapshot_path: str = "data/models/cache_snapshot.bin"  # warm-start snapshot; empty disables
+    cache_snapshot_interval: int = 300  # seconds between snapshot writes
+    cache_snapshot_max_age: int = 86400  # older snapshots are ignored on startup
+    cache_pool_max_connections: int = 20  # async Redis pool size, including the invalidation subscriber
+    cache_pool_timeout: float = 2.0  # seconds to wait for a free pooled connection
+    cache_socket_timeout: float = 1.0  # seconds per Redis command and connection attempt
     rate_limit: int = 100  # requests per hour
+    model_validation_strategy: str = "oob"  # oob, timeseries or kfold
+    model_cv_folds: int = 5
+    model_type: str = "random_forest"  # random_forest, hist_gradient_boosting or ensemble
+    ensemble_weights: Dict[str, float] = {
+        "random_forest": 0.5,
+        "hist_gradient_boosting": 0.3,
+        "linear": 0.2
+    }
+    ensemble_latency_budget_ms: float = 0.0  # 0 disables skipping slow members
+    training_profile_path: str = ""  # JSON profile written by the hyperparameter search
+    model_compaction_profile: str = ""  # lossless, balanced or tiny; empty keeps the full forest
+    incremental_training: bool = False
+    incremental_new_trees: int = 15
+    incremental_window_days: int = 180
+    incremental_full_rebuild_every: int = 7  # incremental updates between full rebuilds
+    drift_retraining: bool = True  # retrain on drift or live error instead of the fixed clock
+    drift_psi_threshold: float = 0.25
+    drift_ks_threshold: float = 0.15
+    drift_min_features: int = 2  # drifted features needed to trigger a retrain
+    drift_error_multiplier: float = 2.0  # live MAPE above this multiple of validation MAPE retrains
+    drift_half_life_rows: int = 60
+    model_max_age_hours: int = 168  # retrain at least this often even without drift
+    feature_pruning: bool = False  # prune features on every full retrain
+    feature_pruning_tolerance: float = 0.02  # allowed relative walk-forward MAPE increase
+    feature_pruning_correlation: float = 0.95
+    model_registry_dir: str = "data/models"
+    model_registry_max_loaded: int = 3  # model versions kept in memory
+    model_registry_poll_interval: int = 60  # seconds between checks for new versions
+    model_registry_auto_promote: bool = True
+    feature_cache_dir: str = ""  # memoized feature matrices, e.g. data/processed/feature_cache; empty disables
+    prediction_interval_alpha: float = 0.05  # conformal intervals cover 1 - alpha
+    quality_sketch_path: str = "data/processed/quantile_sketches.json"  # streaming data-quality sketches
     
     # GCP Configuration
     google_cloud_project: str = ""
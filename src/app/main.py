@@ -6,6 +6,7 @@ from fastapi.responses import JSONResponse
 from datetime import datetime, timedelta
 import logging
 import asyncio
+import pandas as pd
 from typing import Optional
 from contextlib import asynccontextmanager
 
@@ -17,8 +18,12 @@ from src.app.models.schemas import (
     ModelExplanationResponse
 )
 from src.app.services.data_collector import DataCollector
-from src.app.services.cache_service import CacheService
+from src.app.services.async_cache_service import AsyncCacheService
+from src.app.services.cache_service import PREDICTION_ENTRY, TRAINING_DATA_ENTRY
+from src.app.services.cache_snapshot import read_snapshot, write_snapshot
+from src.app.services.model_registry import ModelRegistry
 from src.app.models.ml_model import SteelRebarPredictor
+from src.app.utils.quantile_sketch import QuantileSketchStore
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -26,11 +31,56 @@ logger = logging.getLogger(__name__)
 
 # Initialize services
 data_collector = DataCollector()
-cache_service = CacheService(settings.redis_url)
-ml_model = SteelRebarPredictor()
+cache_service = AsyncCacheService(
+    settings.redis_url,
+    max_connections=settings.cache_pool_max_connections,
+    pool_timeout=settings.cache_pool_timeout,
+    socket_timeout=settings.cache_socket_timeout,
+    l1_max_entries=settings.cache_l1_max_entries,
+    l1_ttl=settings.cache_l1_ttl,
+    chunk_size=settings.cache_chunk_size,
+    memory_max_entries=settings.cache_memory_max_entries,
+    memory_max_bytes=settings.cache_memory_max_bytes,
+    memory_policy=settings.cache_memory_policy,
+    sweep_interval=settings.cache_sweep_interval,
+    generation_refresh=settings.cache_generation_refresh,
+    cleanup_batch_size=settings.cache_cleanup_batch_size
+)
+ml_model = SteelRebarPredictor(
+    validation_strategy=settings.model_validation_strategy,
+    cv_folds=settings.model_cv_folds,
+    model_type=settings.model_type,
+    ensemble_weights=settings.ensemble_weights,
+    latency_budget_ms=settings.ensemble_latency_budget_ms,
+    drift_settings={
+        'psi_threshold': settings.drift_psi_threshold,
+        'ks_threshold': settings.drift_ks_threshold,
+        'min_drifted_features': settings.drift_min_features,
+        'error_multiplier': settings.drift_error_multiplier,
+        'half_life_rows': settings.drift_half_life_rows
+    } if settings.drift_retraining else None,
+    pruning_settings={
+        'tolerance': settings.feature_pruning_tolerance,
+        'correlation_threshold': settings.feature_pruning_correlation
+    } if settings.feature_pruning else None,
+    feature_cache_dir=settings.feature_cache_dir or None,
+    interval_alpha=settings.prediction_interval_alpha
+)
+model_registry = ModelRegistry(
+    settings.model_registry_dir,
+    max_loaded=settings.model_registry_max_loaded,
+    validator=SteelRebarPredictor.is_compatible_artifact
+)
+# Streaming per-series quartiles for data-quality checks, persisted next to the processed data
+quality_sketches = QuantileSketchStore.load(settings.quality_sketch_path)
 
 # Global variables
 last_model_update = None
+serving_model_version = None
+training_data_cached_at = None  # when this instance cached the training window
+event_loop = None
+
+TRAINING_DATA_TTL = 86400  # 24 hours
 
 
 @asynccontextmanager
@@ -38,32 +88,163 @@ async def lifespan(app: FastAPI):
     """Manage application lifespan events."""
     # Startup
     logger.info("Starting Steel Rebar Price Predictor API...")
+    global event_loop
+    event_loop = asyncio.get_running_loop()
+    await cache_service.connect()
     
-    # Try to load existing model
+    # Serve the registry's current version, falling back to the legacy artifact
+    global last_model_update, serving_model_version
     try:
-        ml_model.load_model("model.joblib")
-        global last_model_update
+        version, model_data = model_registry.get_current()
+        if model_data is not None:
+            ml_model.load_model_data(model_data)
+            serving_model_version = version
+            logger.info(f"Loaded model version {version}")
+        else:
+            ml_model.load_model("model.joblib")
+            logger.info("Loaded existing model")
         last_model_update = ml_model.last_training_date
-        logger.info("Loaded existing model")
     except FileNotFoundError:
         logger.info("No existing model found, will train on first request")
     except Exception as e:
         logger.warning(f"Failed to load existing model: {e}")
     
+    # Hot-swap versions published by other workers or training jobs
+    model_registry.add_listener(activate_model_version)
+    registry_watcher = asyncio.create_task(model_registry.watch(
+        settings.model_registry_poll_interval,
+        auto_promote=settings.model_registry_auto_promote
+    ))
+    
+    # Use the searched training profile for the next retrain, if one is configured
+    if settings.training_profile_path:
+        try:
+            ml_model.load_training_profile(settings.training_profile_path)
+        except Exception as e:
+            logger.warning(f"Failed to load training profile: {e}")
+    
+    # Warm the cache from the last snapshot, then keep the snapshot fresh
+    snapshot_writer = None
+    if settings.cache_snapshot_path:
+        await restore_cache_snapshot()
+        snapshot_writer = asyncio.create_task(snapshot_cache_periodically(settings.cache_snapshot_interval))
+    
     yield
     
     # Shutdown
     logger.info("Shutting down Steel Rebar Price Predictor API...")
+    registry_watcher.cancel()
+    if snapshot_writer is not None:
+        snapshot_writer.cancel()
+        await save_cache_snapshot()
+    await cache_service.close()
     
     # Save model if trained
     if hasattr(ml_model, 'model') and ml_model.model is not None:
         try:
-            ml_model.save_model("model.joblib")
+            ml_model.save_model("model.joblib", compaction_profile=settings.model_compaction_profile or None)
             logger.info("Model saved on shutdown")
         except Exception as e:
             logger.warning(f"Failed to save model on shutdown: {e}")
 
 
+def activate_model_version(version: str, model_data: dict):
+    """Registry listener: swap the serving model when the current version changes.
+
+    Listeners run in the registry's worker threads, so the swap itself is
+    handed to the event loop, where requests read the model.
+    """
+    schedule_on_event_loop(swap_serving_model(version, model_data))
+
+
+async def swap_serving_model(version: str, model_data: dict):
+    """Load an artifact into the serving predictor; runs on the event loop only."""
+    global last_model_update, serving_model_version
+    if version == serving_model_version:
+        return
+    # No await until the swap is complete: a prediction sees either model, never a mix
+    ml_model.load_model_data(model_data)
+    serving_model_version = version
+    last_model_update = ml_model.last_training_date
+    logger.info(f"Serving model version {version}")
+    await cache_service.invalidate_prediction()
+
+
+def cache_snapshot_metadata() -> dict:
+    """Identifies the serving model; a snapshotted prediction is only reused by the same one."""
+    return {
+        'model_version': serving_model_version,
+        'training_data_hash': ml_model.training_data_hash
+    }
+
+
+async def save_cache_snapshot():
+    """Write the cached prediction and training window to the snapshot file."""
+    try:
+        cached = await cache_service.get_many([PREDICTION_ENTRY, TRAINING_DATA_ENTRY])
+        if cached[PREDICTION_ENTRY] is None and cached[TRAINING_DATA_ENTRY] is None:
+            return
+        size = await asyncio.to_thread(
+            write_snapshot, settings.cache_snapshot_path,
+            cached[PREDICTION_ENTRY], cached[TRAINING_DATA_ENTRY], cache_snapshot_metadata(),
+            training_data_cached_at.isoformat() if training_data_cached_at else None
+        )
+        logger.info(f"Cache snapshot written ({size} bytes)")
+    except Exception as e:
+        logger.warning(f"Failed to write cache snapshot: {e}")
+
+
+async def snapshot_cache_periodically(interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        await save_cache_snapshot()
+
+
+async def restore_cache_snapshot():
+    """Fill cache entries that are missing with still-valid entries from the snapshot."""
+    global training_data_cached_at
+    snapshot = await asyncio.to_thread(read_snapshot, settings.cache_snapshot_path, settings.cache_snapshot_max_age)
+    if snapshot is None:
+        return
+    
+    cached = await cache_service.get_many([PREDICTION_ENTRY, TRAINING_DATA_ENTRY])
+    items = {}
+    prediction = snapshot['prediction']
+    if prediction is not None and cached[PREDICTION_ENTRY] is None:
+        remaining = settings.cache_ttl - (datetime.now() - datetime.fromisoformat(prediction['cached_at'])).total_seconds()
+        if snapshot['model'] != cache_snapshot_metadata():
+            logger.info("Snapshot prediction was made by another model; not restoring it")
+        elif remaining > 0:
+            items[PREDICTION_ENTRY] = (prediction, int(remaining))
+    # Without its cache time the window's remaining TTL is unknown, so it is not restored
+    cached_at = snapshot['training_data_cached_at']
+    if snapshot['training_data'] is not None and cached[TRAINING_DATA_ENTRY] is None and cached_at:
+        cached_at = datetime.fromisoformat(cached_at)
+        remaining = TRAINING_DATA_TTL - (datetime.now() - cached_at).total_seconds()
+        if remaining > 0:
+            items[TRAINING_DATA_ENTRY] = (snapshot['training_data'], int(remaining))
+    
+    if items and await cache_service.set_many(items):
+        if TRAINING_DATA_ENTRY in items:
+            training_data_cached_at = cached_at
+        logger.info(f"Cache warmed from snapshot: {', '.join(key_type for key_type, _ in items)}")
+
+
+def schedule_on_event_loop(coroutine):
+    """Run a coroutine on the API's loop from sync code (listeners may run in worker threads)."""
+    if event_loop is None or event_loop.is_closed():
+        coroutine.close()
+        return
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+    if running_loop is event_loop:
+        event_loop.create_task(coroutine)
+    else:
+        asyncio.run_coroutine_threadsafe(coroutine, event_loop)
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Steel Rebar Price Predictor",
@@ -87,8 +268,8 @@ app.add_middleware(
 model_training_in_progress = False
 
 
-def verify_api_key(x_api_key: str = Header(None)) -> str:
-    """Verify API key."""
+async def authorize_request(x_api_key: Optional[str], prefetch: tuple = ()) -> dict:
+    """Check the API key and count the request, reading ``prefetch`` entries in the same cache round trip."""
     if not x_api_key:
         raise HTTPException(status_code=401, detail="API key required")
     
@@ -96,16 +277,29 @@ def verify_api_key(x_api_key: str = Header(None)) -> str:
         raise HTTPException(status_code=401, detail="Invalid API key")
     
     # Check rate limit
-    if not cache_service.increment_rate_limit(x_api_key, settings.rate_limit):
+    rate_entry = ("rate_limit", x_api_key)
+    cached, counts = await cache_service.fetch(prefetch, increments={rate_entry: 3600})
+    requests_count = counts.get(rate_entry)
+    if requests_count is None or requests_count > settings.rate_limit:
         raise HTTPException(status_code=429, detail="Rate limit exceeded")
     
+    return cached
+
+
+async def verify_api_key(x_api_key: str = Header(None)) -> str:
+    """Verify API key."""
+    await authorize_request(x_api_key)
     return x_api_key
 
 
-async def get_cached_prediction() -> Optional[PredictionResponse]:
+async def verify_api_key_with_prediction(x_api_key: str = Header(None)) -> Optional[dict]:
+    """Verify API key and return the cached prediction fetched along with the rate limit."""
+    cached = await authorize_request(x_api_key, prefetch=(PREDICTION_ENTRY,))
+    return cached[PREDICTION_ENTRY]
+
+
+def get_cached_prediction(cached_data: Optional[dict]) -> Optional[PredictionResponse]:
     """Get cached prediction if available and not expired."""
-    cached_data = cache_service.get_prediction()
-    
     if cached_data:
         # Check if cache is still valid (less than 1 hour old)
         cached_at = datetime.fromisoformat(cached_data['cached_at'])
@@ -116,41 +310,108 @@ async def get_cached_prediction() -> Optional[PredictionResponse]:
     return None
 
 
+def required_data_sources(for_training: bool = False) -> Optional[list]:
+    """Secondary data sources the serving model needs (None collects all)."""
+    if for_training and ml_model.pruning_settings is not None:
+        # Pruning re-evaluates every candidate feature
+        return None
+    needed_inputs = ml_model.required_inputs()
+    if needed_inputs is None:
+        return None
+    return [ml_model.ECONOMIC_SERIES[column] for column in needed_inputs]
+
+
+def retraining_reasons() -> list:
+    """Why the model should be retrained now; empty if it should not."""
+    if last_model_update is None:
+        return ["no trained model"]
+    
+    model_age = datetime.now() - last_model_update
+    if ml_model.drift_monitor is None:
+        if model_age > timedelta(hours=settings.model_update_frequency):
+            return [f"model older than {settings.model_update_frequency}h"]
+        return []
+    
+    # Drift-triggered retraining, with a maximum age as a safety net
+    if model_age > timedelta(hours=settings.model_max_age_hours):
+        return [f"model older than {settings.model_max_age_hours}h"]
+    return ml_model.drift_monitor.should_retrain()['reasons']
+
+
+def update_quality_sketches(data: pd.DataFrame):
+    """Feed the rows not seen yet into the data-quality sketches and persist them."""
+    if quality_sketches.update_frame(data):
+        quality_sketches.save()
+
+
 async def train_model_if_needed():
     """Train the model if it's outdated or doesn't exist."""
-    global last_model_update, model_training_in_progress
+    global last_model_update, model_training_in_progress, training_data_cached_at
     
     if model_training_in_progress:
         logger.info("Model training already in progress")
         return
     
     # Check if model needs retraining
-    if last_model_update is None or \
-       datetime.now() - last_model_update > timedelta(hours=settings.model_update_frequency):
+    retrain_reasons = retraining_reasons()
+    if retrain_reasons:
         
         model_training_in_progress = True
         try:
-            logger.info("Starting model training...")
+            logger.info(f"Starting model training ({', '.join(retrain_reasons)})...")
             
-            # Check cache first
-            training_data = cache_service.get_training_data()
+            # Drift and live error are about data newer than the cached training
+            # window, so those triggers always collect fresh data
+            monitor_triggered = ml_model.drift_monitor is not None and ml_model.drift_monitor.should_retrain()['retrain']
+            training_data = None if monitor_triggered else await cache_service.get_training_data()
             
             if training_data is None:
                 # Collect new data
                 logger.info("Collecting fresh data for training...")
-                economic_data = data_collector.get_all_economic_data()
+                economic_data = data_collector.get_all_economic_data(required_data_sources(for_training=True))
                 training_data = data_collector.combine_data_for_training(economic_data)
                 
                 # Cache the training data
-                cache_service.set_training_data(training_data, ttl=86400)  # 24 hours
+                if await cache_service.set_training_data(training_data, ttl=TRAINING_DATA_TTL):
+                    training_data_cached_at = datetime.now()
             
             if training_data.empty:
                 raise ValueError("No training data available")
             
-            # Train the model
-            training_result = ml_model.train(training_data)
+            # Train the model (incremental refresh when enabled and a forest exists)
+            if settings.incremental_training:
+                training_result = ml_model.train_incremental(
+                    training_data,
+                    new_trees=settings.incremental_new_trees,
+                    window_days=settings.incremental_window_days,
+                    full_rebuild_every=settings.incremental_full_rebuild_every
+                )
+            else:
+                training_result = ml_model.train(training_data)
             last_model_update = datetime.now()
             
+            if training_result.get('training_mode') == 'skipped':
+                # Same data and configuration as the serving version: nothing to publish
+                training_result['model_version'] = serving_model_version
+                if monitor_triggered:
+                    # Nothing new to learn yet; restart the live window so the same
+                    # drift or error does not re-trigger on every request
+                    ml_model.drift_monitor.reset()
+                logger.info(f"Model training skipped: {training_result}")
+                return
+            
+            # Publish the new version; the previous one stays loaded for rollback
+            training_result['model_version'] = model_registry.publish(
+                lambda path: ml_model.save_model(path, compaction_profile=settings.model_compaction_profile or None),
+                metadata={
+                    'model_type': type(ml_model.model).__name__,
+                    'training_mode': training_result.get('training_mode', 'full'),
+                    'model_confidence': training_result['model_confidence'],
+                    'feature_names': ml_model.feature_names,
+                    'feature_pruning': ml_model.feature_pruning
+                }
+            )
+            
             logger.info(f"Model training completed: {training_result}")
             
         except Exception as e:
@@ -173,12 +434,12 @@ async def root():
 
 
 @app.get("/predict/steel-rebar-price", response_model=PredictionResponse)
-async def predict_steel_rebar_price(api_key: str = Depends(verify_api_key)):
+async def predict_steel_rebar_price(cached_data: Optional[dict] = Depends(verify_api_key_with_prediction)):
     """Predict steel rebar price for the next day."""
     
     try:
         # Check for cached prediction first
-        cached_prediction = await get_cached_prediction()
+        cached_prediction = get_cached_prediction(cached_data)
         if cached_prediction:
             return cached_prediction
         
@@ -187,12 +448,17 @@ async def predict_steel_rebar_price(api_key: str = Depends(verify_api_key)):
         
         # Collect latest data for prediction
         logger.info("Collecting latest data for prediction...")
-        economic_data = data_collector.get_all_economic_data()
+        economic_data = data_collector.get_all_economic_data(required_data_sources())
         latest_data = data_collector.combine_data_for_training(economic_data)
         
         if latest_data.empty:
             raise HTTPException(status_code=503, detail="No data available for prediction")
         
+        # Stream newly arrived observations into the data-quality sketches; the
+        # P² updates are plain Python, so they run off the event loop
+        if quality_sketches.has_unseen_rows(latest_data):
+            await asyncio.to_thread(update_quality_sketches, latest_data)
+        
         # Make prediction
         prediction, prediction_details = ml_model.predict(latest_data)
         
@@ -216,7 +482,7 @@ async def predict_steel_rebar_price(api_key: str = Depends(verify_api_key)):
             'prediction': response_data,
             'prediction_details': prediction_details
         }
-        cache_service.set_prediction(cache_data, settings.cache_ttl)
+        await cache_service.set_prediction(cache_data, settings.cache_ttl)
         
         logger.info(f"Prediction made: ${prediction:.2f} USD/ton")
         return prediction_response
@@ -229,13 +495,12 @@ async def predict_steel_rebar_price(api_key: str = Depends(verify_api_key)):
 
 
 @app.get("/explain/{prediction_date}", response_model=ModelExplanationResponse)
-async def explain_prediction(prediction_date: str, api_key: str = Depends(verify_api_key)):
+async def explain_prediction(prediction_date: str,
+                             cached_data: Optional[dict] = Depends(verify_api_key_with_prediction)):
     """Explain the factors influencing a prediction."""
     
     try:
-        # Get cached prediction details
-        cached_data = cache_service.get_prediction()
-        
+        # Cached prediction details come from the same round trip as the rate limit
         if not cached_data or cached_data.get('prediction', {}).get('prediction_date') != prediction_date:
             raise HTTPException(status_code=404, detail="Prediction not found or expired")
         
@@ -243,19 +508,30 @@ async def explain_prediction(prediction_date: str, api_key: str = Depends(verify
         feature_importance = prediction_details.get('feature_importance', {})
         current_features = prediction_details.get('current_features', {})
         
-        # Create key factors list
+        # Create key factors list, from this prediction's contributions when they were stored
         key_factors = []
-        for feature, importance in sorted(feature_importance.items(), key=lambda x: x[1], reverse=True)[:5]:
-            key_factors.append({
-                'factor': feature,
-                'importance': round(importance, 4),
-                'current_value': round(current_features.get(feature, 0), 4)
-            })
+        contributions = prediction_details.get('contributions')
+        if contributions:
+            for feature, contribution in sorted(contributions.items(), key=lambda x: abs(x[1]), reverse=True)[:5]:
+                key_factors.append({
+                    'factor': feature,
+                    'contribution': round(contribution, 4),
+                    'importance': round(feature_importance.get(feature, 0), 4),
+                    'current_value': round(current_features.get(feature, 0), 4)
+                })
+        else:
+            for feature, importance in sorted(feature_importance.items(), key=lambda x: x[1], reverse=True)[:5]:
+                key_factors.append({
+                    'factor': feature,
+                    'importance': round(importance, 4),
+                    'current_value': round(current_features.get(feature, 0), 4)
+                })
         
         return ModelExplanationResponse(
             prediction_date=prediction_date,
             predicted_price=prediction_details.get('prediction', 0),
             key_factors=key_factors,
+            baseline_price=prediction_details.get('contribution_bias'),
             model_type=prediction_details.get('model_type', 'Unknown'),
             timestamp=datetime.now().isoformat() + "Z"
         )
@@ -272,7 +548,7 @@ async def health_check():
     """Health check endpoint."""
     try:
         # Check cache connection
-        cache_stats = cache_service.get_cache_stats()
+        cache_stats = await cache_service.get_cache_stats()
         
         return {
             "status": "healthy",
@@ -297,15 +573,19 @@ async def health_check():
 async def get_stats(api_key: str = Depends(verify_api_key)):
     """Get API statistics."""
     try:
-        cache_stats = cache_service.get_cache_stats()
+        cache_stats = await cache_service.get_cache_stats()
         
         return {
             "timestamp": datetime.now().isoformat() + "Z",
             "model": {
                 "last_training": last_model_update.isoformat() if last_model_update else None,
                 "training_in_progress": model_training_in_progress,
-                "confidence": ml_model.model_confidence if hasattr(ml_model, 'model_confidence') else None
+                "confidence": ml_model.model_confidence if hasattr(ml_model, 'model_confidence') else None,
+                "version": serving_model_version,
+                "drift": ml_model.drift_monitor.get_status() if ml_model.drift_monitor else None
             },
+            "model_registry": model_registry.get_stats(),
+            "data_quality": quality_sketches.get_stats(),
             "cache": cache_stats,
             "data_sources": settings.data_sources
         }
@@ -314,6 +594,42 @@ async def get_stats(api_key: str = Depends(verify_api_key)):
         raise HTTPException(status_code=500, detail=f"Stats failed: {str(e)}")
 
 
+@app.get("/models")
+async def list_model_versions(api_key: str = Depends(verify_api_key)):
+    """List the model versions known to the registry."""
+    return {
+        "timestamp": datetime.now().isoformat() + "Z",
+        "serving_version": serving_model_version,
+        "versions": model_registry.list_versions()
+    }
+
+
+@app.post("/models/promote/{version}")
+async def promote_model_version(version: str, api_key: str = Depends(verify_api_key)):
+    """Make a specific model version the serving one."""
+    try:
+        await asyncio.to_thread(model_registry.promote, version)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {"serving_version": serving_model_version, "previous_version": model_registry.previous}
+
+
+@app.post("/models/rollback")
+async def rollback_model_version(api_key: str = Depends(verify_api_key)):
+    """Switch back to the previous model version (kept in memory)."""
+    try:
+        await asyncio.to_thread(model_registry.rollback)
+    except (KeyError, FileNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {"serving_version": serving_model_version, "previous_version": model_registry.previous}
+
+
 # Event handlers moved to lifespan function above
 
 
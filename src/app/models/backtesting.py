@@ -0,0 +1,205 @@
+"""Walk-forward backtesting across the history and several forecast horizons."""
+
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.preprocessing import StandardScaler
+import logging
+
+from src.app.models.compiled_forest import CompiledForest
+from src.app.models.conformal import ConformalCalibrator
+from src.app.utils.feature_cache import FeatureMatrixCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join("data", "processed", "backtest_cache")
+
+
+def _data_hash(*arrays: np.ndarray) -> str:
+    digest = hashlib.sha1()
+    for array in arrays:
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def cached_feature_matrix(predictor, history: pd.DataFrame,
+                          cache_dir: str = DEFAULT_CACHE_DIR) -> Tuple[np.ndarray, np.ndarray, pd.Series]:
+    """Compute the predictor's features for the whole history once, cached on disk.
+
+    Returns the unscaled feature matrix, the price series and the dates. The
+    predictor's own feature cache is used when it has one, so the backtest
+    shares matrices with training; the key covers the raw history and the
+    feature configuration, so any change recomputes it.
+    """
+    if predictor.feature_cache is None:
+        predictor.feature_cache = FeatureMatrixCache(cache_dir)
+    matrices = predictor.feature_matrices(history)
+    df = matrices['frame']
+    dates = df['date'].reset_index(drop=True) if 'date' in df.columns else pd.Series(df.index)
+    return matrices['X'], matrices['y'], dates
+
+
+def tree_spread_interval(model, X: np.ndarray, z_score: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Prediction and mean +/- z * std over the trees of a forest."""
+    distribution = CompiledForest.from_estimator(model).prediction_distribution(X, z_score=z_score, quantiles=())
+    return distribution['mean'], distribution['lower_bound'], distribution['upper_bound']
+
+
+def _run_fold(matrix_path: str, estimator, fold: Dict, horizons: Sequence[int], z_score: float,
+              alpha: float) -> List[Dict]:
+    """Fit one model per horizon on the fold's past and predict its test block."""
+    data = joblib.load(matrix_path, mmap_mode='r')
+    X, y = data['X'], data['y']
+    records = []
+
+    for horizon in horizons:
+        # Row t is labelled with y[t + h]; train rows must be labelled before the origin
+        train_end = fold['origin'] - horizon
+        train_idx = np.arange(fold['train_start'], train_end + 1)
+        test_idx = np.arange(fold['origin'], min(fold['test_end'], len(y) - horizon))
+        if len(train_idx) < 30 or len(test_idx) == 0:
+            continue
+
+        scaler = StandardScaler().fit(X[train_idx])
+        X_train = scaler.transform(X[train_idx])
+        model = clone(estimator)
+        model.fit(X_train, y[train_idx + horizon])
+        calibrator = ConformalCalibrator.from_model(model, X_train, y[train_idx + horizon])
+
+        X_test = scaler.transform(X[test_idx])
+        if hasattr(model, 'estimators_'):
+            predicted, lower, upper = tree_spread_interval(model, X_test, z_score)
+        else:
+            predicted = model.predict(X_test)
+            lower = upper = np.full(len(test_idx), np.nan)
+        conformal_lower, conformal_upper = calibrator.interval(predicted, alpha)
+
+        for row, index in enumerate(test_idx):
+            records.append({
+                'fold': fold['fold'],
+                'horizon': horizon,
+                'row': int(index),
+                'actual': float(y[index + horizon]),
+                'predicted': float(predicted[row]),
+                'lower': float(lower[row]),
+                'upper': float(upper[row]),
+                'conformal_lower': float(conformal_lower[row]),
+                'conformal_upper': float(conformal_upper[row])
+            })
+    return records
+
+
+class WalkForwardBacktester:
+    """Expanding- or rolling-origin walk-forward evaluation over several horizons.
+
+    Features are computed once for the whole history and every fold slices
+    the shared matrix (memory-mapped by each worker). Folds run in a process
+    pool; each fold fits one model per horizon on rows whose targets were
+    known at the fold origin and predicts the following ``step`` rows.
+    Intervals are scored twice: the tree spread (``z_score``) and split-
+    conformal intervals at miscoverage ``alpha`` calibrated on the fold's
+    training rows, as served by the predictor.
+    """
+
+    ORIGINS = ('expanding', 'rolling')
+
+    def __init__(self, estimator, horizons: Sequence[int] = (1, 5, 20), origin: str = 'expanding',
+                 initial_train_size: int = 365, window_size: Optional[int] = None, step: int = 30,
+                 max_workers: Optional[int] = None, z_score: float = 1.96, alpha: float = 0.05,
+                 cache_dir: str = DEFAULT_CACHE_DIR):
+        if origin not in self.ORIGINS:
+            raise ValueError(f"Unknown origin '{origin}'. Available: {', '.join(self.ORIGINS)}")
+        self.estimator = estimator
+        self.horizons = sorted(horizons)
+        self.origin = origin
+        self.initial_train_size = initial_train_size
+        self.window_size = window_size or initial_train_size
+        self.step = step
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.z_score = z_score
+        self.alpha = alpha
+        self.cache_dir = cache_dir
+        self.predictions_ = None
+
+    def folds(self, n_rows: int) -> List[Dict]:
+        """Fold boundaries: each fold tests rows ``[origin, test_end)``."""
+        folds = []
+        for fold, origin in enumerate(range(self.initial_train_size, n_rows - min(self.horizons), self.step)):
+            train_start = 0 if self.origin == 'expanding' else max(0, origin - self.window_size)
+            folds.append({
+                'fold': fold,
+                'train_start': train_start,
+                'origin': origin,
+                'test_end': min(origin + self.step, n_rows)
+            })
+        return folds
+
+    def run(self, X: np.ndarray, y: np.ndarray, dates: Optional[pd.Series] = None) -> Dict:
+        """Backtest the estimator and return per-horizon MAPE and interval coverage."""
+        start_time = time.time()
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        y = np.ascontiguousarray(y, dtype=np.float64)
+        folds = self.folds(len(X))
+        if not folds:
+            raise ValueError("History too short for the requested initial training size")
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        matrix_path = os.path.join(self.cache_dir, f"matrix_{_data_hash(X, y)}.joblib")
+        if not os.path.exists(matrix_path):
+            joblib.dump({'X': X, 'y': y}, matrix_path)
+
+        # Parallelism is across folds, so each fold fits single-threaded
+        estimator = clone(self.estimator)
+        if 'n_jobs' in estimator.get_params():
+            estimator.set_params(n_jobs=1)
+
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(folds))) as executor:
+            futures = [
+                executor.submit(_run_fold, matrix_path, estimator, fold, self.horizons, self.z_score, self.alpha)
+                for fold in folds
+            ]
+            records = [record for future in futures for record in future.result()]
+
+        predictions = pd.DataFrame(records)
+        if dates is not None and len(predictions):
+            predictions['date'] = pd.Series(dates).reset_index(drop=True).iloc[predictions['row']].values
+        self.predictions_ = predictions
+
+        result = {
+            'origin': self.origin,
+            'n_folds': len(folds),
+            'step': self.step,
+            'horizons': self.summarize(predictions),
+            'backtest_time': time.time() - start_time
+        }
+        logger.info(f"Backtest finished: {len(folds)} folds, {len(records)} predictions "
+                    f"in {result['backtest_time']:.1f}s")
+        return result
+
+    def summarize(self, predictions: pd.DataFrame) -> Dict:
+        """Per-horizon MAPE, coverage and width of both interval kinds."""
+        summary = {}
+        for horizon, group in predictions.groupby('horizon'):
+            errors = (group['predicted'] - group['actual']).abs() / group['actual']
+            has_interval = group['lower'].notna()
+            inside = group['actual'].between(group['lower'], group['upper'])[has_interval]
+            inside_conformal = group['actual'].between(group['conformal_lower'], group['conformal_upper'])
+            summary[int(horizon)] = {
+                'mape': float(errors.mean()),
+                'fold_mape': [float(value) for value in errors.groupby(group['fold']).mean()],
+                'coverage': float(inside.mean()) if has_interval.any() else None,
+                'mean_interval_width': float((group['upper'] - group['lower'])[has_interval].mean())
+                if has_interval.any() else None,
+                'conformal_coverage': float(inside_conformal.mean()),
+                'conformal_target': 1 - self.alpha,
+                'conformal_interval_width': float((group['conformal_upper'] - group['conformal_lower']).mean()),
+                'n_predictions': int(len(group))
+            }
+        return summary
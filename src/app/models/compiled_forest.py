@@ -0,0 +1,183 @@
+"""Flattened tree-ensemble representation with vectorized all-trees inference."""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledForest:
+    """All trees of a fitted forest stored as flat node arrays.
+
+    Node arrays from every tree are concatenated and child indices are offset
+    so a single traversal can walk every (tree, row) pair at once. Leaves point
+    to themselves, so after ``max_depth`` steps every path has settled on its
+    leaf without any per-tree Python call.
+    """
+
+    def __init__(self, children_left: np.ndarray, children_right: np.ndarray,
+                 feature: np.ndarray, threshold: np.ndarray, value: np.ndarray,
+                 roots: np.ndarray, max_depth: int, n_features: int,
+                 value_offset: float = 0.0, feature_importances: Optional[np.ndarray] = None):
+        self.children_left = children_left
+        self.children_right = children_right
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.n_features = n_features
+        # Leaf values may be stored as a low-precision residual around this offset
+        self.value_offset = value_offset
+        self.feature_importances_ = feature_importances
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.value)
+
+    @classmethod
+    def from_estimator(cls, model) -> "CompiledForest":
+        """Compile a fitted sklearn forest (or a list of fitted regression trees)."""
+        estimators = getattr(model, 'estimators_', model)
+        if not len(estimators):
+            raise ValueError("Cannot compile a forest without fitted estimators")
+
+        lefts, rights, features, thresholds, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in estimators:
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+
+            # Leaves loop back to themselves so extra traversal steps are no-ops
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            values.append(tree.value[:, 0, 0])
+            roots.append(offset)
+
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            children_left=np.concatenate(lefts).astype(np.int32),
+            children_right=np.concatenate(rights).astype(np.int32),
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=np.concatenate(thresholds),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=max_depth,
+            n_features=estimators[0].tree_.n_features,
+            feature_importances=getattr(model, 'feature_importances_', None)
+        )
+
+    def copy_with(self, **arrays) -> "CompiledForest":
+        """Return a new forest with some attributes replaced."""
+        state = dict(self.__dict__)
+        state.update(arrays)
+        forest = CompiledForest.__new__(CompiledForest)
+        forest.__dict__.update(state)
+        return forest
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        # Trees are stored in depth-first order, so every left child directly
+        # follows its parent and can be rebuilt from the right-child array
+        node_ids = np.arange(self.n_nodes)
+        internal = self.children_right != node_ids
+        if np.array_equal(self.children_left[internal], node_ids[internal] + 1):
+            state['children_left'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.children_left is None:
+            node_ids = np.arange(len(self.children_right), dtype=self.children_right.dtype)
+            self.children_left = np.where(self.children_right == node_ids, node_ids, node_ids + 1)
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """Return the leaf node index reached in every tree, shaped (n_trees, n_rows)."""
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {X.shape[1]}")
+
+        # sklearn compares float32 inputs against its split thresholds
+        X = X.astype(np.float32).astype(np.float64)
+
+        rows = np.arange(X.shape[0])[None, :]
+        nodes = np.repeat(self.roots[:, None], X.shape[0], axis=1)
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.children_left[nodes], self.children_right[nodes])
+        return nodes
+
+    def contributions(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Path-based decomposition of the ensemble prediction into feature contributions.
+
+        Walking a tree from the root, every split moves the node value from the
+        parent mean to the child mean; that change is credited to the split
+        feature. Summed over the path it telescopes to ``leaf - root``, so for
+        every row ``bias + contributions.sum(axis=1)`` equals ``predict(X)``.
+        Returns the bias (mean root value) per row and the contributions,
+        shaped (n_rows, n_features), from the same vectorized traversal as
+        ``apply``.
+        """
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {X.shape[1]}")
+
+        X = X.astype(np.float32).astype(np.float64)
+        n_rows = X.shape[0]
+        value = self.value.astype(np.float64)
+
+        rows = np.arange(n_rows)[None, :]
+        nodes = np.repeat(self.roots[:, None], n_rows, axis=1)
+        # Flat (row, feature) cells; leaves loop back to themselves and add zero
+        cells = rows * self.n_features
+        totals = np.zeros(n_rows * self.n_features)
+        for _ in range(self.max_depth):
+            split_feature = self.feature[nodes]
+            go_left = X[rows, split_feature] <= self.threshold[nodes]
+            children = np.where(go_left, self.children_left[nodes], self.children_right[nodes])
+            totals += np.bincount((cells + split_feature).ravel(),
+                                  weights=(value[children] - value[nodes]).ravel(),
+                                  minlength=totals.size)
+            nodes = children
+
+        bias = np.full(n_rows, value[self.roots].mean() + self.value_offset)
+        return bias, totals.reshape(n_rows, self.n_features) / self.n_trees
+
+    def predict_all(self, X: np.ndarray) -> np.ndarray:
+        """Per-tree predictions for every row, shaped (n_trees, n_rows)."""
+        return self.value[self.apply(X)].astype(np.float64) + self.value_offset
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Ensemble mean prediction, equivalent to ``forest.predict``."""
+        return self.predict_all(X).mean(axis=0)
+
+    def prediction_distribution(self, X: np.ndarray, z_score: float = 1.96,
+                                quantiles: Sequence[float] = (0.05, 0.5, 0.95)) -> Dict[str, np.ndarray]:
+        """Mean, spread-based interval and empirical quantiles from one traversal."""
+        tree_predictions = self.predict_all(X)
+        mean = tree_predictions.mean(axis=0)
+        std = tree_predictions.std(axis=0)
+        return {
+            'mean': mean,
+            'std': std,
+            'lower_bound': mean - z_score * std,
+            'upper_bound': mean + z_score * std,
+            'quantiles': {q: np.quantile(tree_predictions, q, axis=0) for q in quantiles},
+            'tree_predictions': tree_predictions
+        }
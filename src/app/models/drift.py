@@ -0,0 +1,239 @@
+"""Streaming feature drift and error monitoring used to decide when to retrain."""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Pseudo-count spread over the bins (in reference proportions) so PSI stays finite
+_SMOOTHING = 1.0
+
+
+class FeatureSketch:
+    """Per-feature training distribution stored as quantile bins and ranges.
+
+    Bin edges are the training deciles (interior edges only), so every bin
+    holds about the same share of training rows. The training min/max are
+    kept too: level features (moving averages of random-walk prices) are
+    checked against the range the trees were fitted on instead of by PSI,
+    since a short live window of a trending level never matches the whole
+    training distribution. The sketch is small enough to be saved with every
+    model version.
+    """
+
+    def __init__(self, feature_names: List[str], edges: np.ndarray, reference: np.ndarray,
+                 lower: np.ndarray, upper: np.ndarray, n_rows: int,
+                 level_features: Sequence[str] = (), autocorrelation: Optional[np.ndarray] = None,
+                 last_date=None, created_at: Optional[datetime] = None):
+        self.feature_names = list(feature_names)
+        self.edges = edges            # (n_features, n_bins - 1)
+        self.reference = reference    # (n_features, n_bins) training bin proportions
+        self.lower = lower
+        self.upper = upper
+        self.n_rows = n_rows
+        self.level_features = [name for name in level_features if name in self.feature_names]
+        # Lag-1 autocorrelation; consecutive rows of smooth features carry little new information
+        self.autocorrelation = autocorrelation if autocorrelation is not None else np.zeros(len(self.feature_names))
+        self.last_date = last_date    # newest training row; later rows are "incoming"
+        self.created_at = created_at or datetime.now()
+
+    @property
+    def level_mask(self) -> np.ndarray:
+        return np.isin(self.feature_names, self.level_features)
+
+    @property
+    def n_bins(self) -> int:
+        return self.reference.shape[1]
+
+    @classmethod
+    def from_matrix(cls, X: np.ndarray, feature_names: Sequence[str], n_bins: int = 10,
+                    level_features: Sequence[str] = (), last_date=None) -> "FeatureSketch":
+        """Build the sketch from the unscaled training feature matrix."""
+        X = np.asarray(X, dtype=np.float64)
+        quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+        edges = np.quantile(X, quantiles, axis=0).T
+        reference = np.zeros((X.shape[1], n_bins))
+        rows = np.arange(X.shape[1])
+        for bin_index in cls._bin_indices(edges, X):
+            reference[rows, bin_index] += 1
+        return cls(list(feature_names), edges, reference / len(X), X.min(axis=0), X.max(axis=0), len(X),
+                   level_features=level_features, autocorrelation=cls._lag1_autocorrelation(X),
+                   last_date=last_date)
+
+    @staticmethod
+    def _lag1_autocorrelation(X: np.ndarray) -> np.ndarray:
+        if len(X) < 3:
+            return np.zeros(X.shape[1])
+        centered = X - X.mean(axis=0)
+        variance = (centered ** 2).sum(axis=0)
+        rho = (centered[1:] * centered[:-1]).sum(axis=0) / np.where(variance > 0, variance, 1)
+        return np.clip(rho, 0.0, 0.99)
+
+    @staticmethod
+    def _bin_indices(edges: np.ndarray, X: np.ndarray) -> np.ndarray:
+        """Bin index of every value, shaped (n_rows, n_features)."""
+        return (X[:, :, None] > edges[None, :, :]).sum(axis=2)
+
+    def bin_row(self, row: np.ndarray) -> np.ndarray:
+        """Bin index of each feature of a single row (O(features))."""
+        return (np.asarray(row, dtype=np.float64)[:, None] > self.edges).sum(axis=1)
+
+
+class DriftMonitor:
+    """Incremental PSI/KS drift scores and live error tracking against a sketch.
+
+    Each incoming row only increments one bin per feature (and an
+    out-of-range counter for level features); counts decay with a
+    configurable half-life so the scores follow the recent distribution.
+    PSI is corrected for the sampling noise expected from the effective
+    number of live rows. ``should_retrain`` compares the scores with the
+    configured thresholds.
+    """
+
+    def __init__(self, sketch: FeatureSketch, psi_threshold: float = 0.25, ks_threshold: float = 0.15,
+                 min_drifted_features: int = 2, range_threshold: float = 0.5,
+                 error_threshold: Optional[float] = None, half_life_rows: int = 60, min_rows: int = 20):
+        self.sketch = sketch
+        self.psi_threshold = psi_threshold
+        self.ks_threshold = ks_threshold
+        self.min_drifted_features = min_drifted_features
+        self.range_threshold = range_threshold
+        self.error_threshold = error_threshold
+        self.decay = 0.5 ** (1.0 / half_life_rows) if half_life_rows else 1.0
+        self.min_rows = min_rows
+        self.last_seen_date = pd.Timestamp(sketch.last_date) if sketch.last_date is not None else None
+        self._pending_prediction = None
+        self.reset()
+
+    def reset(self):
+        """Forget the live window and error history; rows already seen stay seen."""
+        n_features = len(self.sketch.feature_names)
+        self.counts = np.zeros((n_features, self.sketch.n_bins))
+        self.out_of_range = np.zeros(n_features)
+        self.weight = 0.0
+        self.squared_weight = 0.0
+        self.rows_seen = 0
+        self.error_ema = None
+        self.errors_seen = 0
+
+    def update(self, row: np.ndarray):
+        """Add one feature row to the live distribution."""
+        row = np.asarray(row, dtype=np.float64)
+        bins = self.sketch.bin_row(row)
+        self.counts *= self.decay
+        self.out_of_range *= self.decay
+        self.weight = self.weight * self.decay + 1.0
+        self.squared_weight = self.squared_weight * self.decay ** 2 + 1.0
+        self.counts[np.arange(len(bins)), bins] += 1.0
+        self.out_of_range += (row < self.sketch.lower) | (row > self.sketch.upper)
+        self.rows_seen += 1
+
+    def update_from_frame(self, df: pd.DataFrame):
+        """Feed the rows of a prepared feature frame that were not seen yet.
+
+        Rows are identified by their date, so re-sending the same history
+        (every prediction request does) does not inflate the counts. A pending
+        prediction is scored against the first newer price.
+        """
+        if 'date' in df.columns:
+            dates = pd.to_datetime(df['date'])
+            new_rows = df[dates > self.last_seen_date] if self.last_seen_date is not None else df.tail(1)
+        else:
+            new_rows = df.tail(1)
+        if new_rows.empty:
+            return
+
+        for row in new_rows[self.sketch.feature_names].to_numpy(dtype=np.float64):
+            self.update(row)
+
+        if self._pending_prediction is not None and 'price' in new_rows.columns:
+            predicted = self._pending_prediction
+            self._pending_prediction = None
+            self.record_error(abs(predicted - new_rows['price'].iloc[0]) / new_rows['price'].iloc[0])
+
+        if 'date' in new_rows.columns:
+            self.last_seen_date = pd.to_datetime(new_rows['date']).max()
+
+    def record_prediction(self, prediction: float):
+        """Remember a next-day prediction so its error is measured when the price arrives."""
+        self._pending_prediction = float(prediction)
+
+    def record_error(self, absolute_percentage_error: float, alpha: float = 0.2):
+        """Track an exponential moving average of live absolute percentage errors."""
+        self.errors_seen += 1
+        if self.error_ema is None:
+            self.error_ema = absolute_percentage_error
+        else:
+            self.error_ema += alpha * (absolute_percentage_error - self.error_ema)
+
+    @property
+    def effective_rows(self) -> float:
+        """Kish effective sample size of the decayed live window."""
+        return self.weight ** 2 / self.squared_weight if self.squared_weight else 0.0
+
+    def scores(self) -> Dict[str, Dict[str, float]]:
+        """Noise-corrected PSI and KS statistics and out-of-range share per feature.
+
+        Both statistics are reported as the excess over their 95% level for a
+        sample of the same effective size drawn from the training distribution.
+        """
+        if self.weight == 0:
+            return {}
+        reference = np.clip(self.sketch.reference, 1e-6, None)
+        current = (self.counts + _SMOOTHING * reference) / (self.weight + _SMOOTHING)
+        # For samples of the reference itself PSI ~ chi2(bins - 1) / n; subtract its 95% quantile.
+        # n is the AR(1) effective size: (1 - rho) / (1 + rho) of the (decayed) row count
+        rho = self.sketch.autocorrelation
+        sample_scale = (1 / self.effective_rows + 1 / self.sketch.n_rows) * (1 + rho) / (1 - rho)
+        psi = ((current - reference) * np.log(current / reference)).sum(axis=1)
+        psi = np.maximum(psi - chi2.ppf(0.95, self.sketch.n_bins - 1) * sample_scale, 0)
+        # Two-sample KS critical value at the 5% level
+        ks = np.abs(np.cumsum(self.counts / self.weight, axis=1) - np.cumsum(self.sketch.reference, axis=1)).max(axis=1)
+        ks = np.maximum(ks - 1.36 * np.sqrt(sample_scale), 0)
+        out_of_range = self.out_of_range / self.weight
+        return {
+            name: {'psi': float(psi[i]), 'ks': float(ks[i]), 'out_of_range': float(out_of_range[i])}
+            for i, name in enumerate(self.sketch.feature_names)
+        }
+
+    def drifted_features(self) -> List[str]:
+        """Distribution drift for stationary features, range exits for level features."""
+        level_features = set(self.sketch.level_features)
+        drifted = []
+        for name, score in self.scores().items():
+            if name in level_features:
+                if score['out_of_range'] > self.range_threshold:
+                    drifted.append(name)
+            elif score['psi'] > self.psi_threshold or score['ks'] > self.ks_threshold:
+                drifted.append(name)
+        return drifted
+
+    def should_retrain(self) -> Dict:
+        """Decide whether drift or live error justify a retrain, with the reasons."""
+        reasons = []
+        drifted = []
+        if self.rows_seen >= self.min_rows:
+            drifted = self.drifted_features()
+            if len(drifted) >= self.min_drifted_features:
+                reasons.append(f"feature drift in {len(drifted)} features")
+        if self.error_threshold is not None and self.error_ema is not None and self.error_ema > self.error_threshold:
+            reasons.append(f"live MAPE {self.error_ema:.4f} above {self.error_threshold:.4f}")
+        return {'retrain': bool(reasons), 'reasons': reasons, 'drifted_features': drifted}
+
+    def get_status(self) -> Dict:
+        """Drift summary for the stats endpoint."""
+        scores = self.scores()
+        top = sorted(scores.items(), key=lambda item: item[1]['psi'], reverse=True)[:5]
+        return {
+            'rows_seen': self.rows_seen,
+            'last_seen_date': self.last_seen_date.isoformat() if self.last_seen_date is not None else None,
+            'live_mape': self.error_ema,
+            'errors_seen': self.errors_seen,
+            'top_psi': {name: score for name, score in top},
+            **self.should_retrain()
+        }
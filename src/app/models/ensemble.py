@@ -0,0 +1,176 @@
+"""Blended ensemble of heterogeneous regressors trained and served in parallel."""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import BaseEstimator, RegressorMixin, clone
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Shared by every ensemble; members release the GIL in their numeric kernels
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ensemble")
+        return _executor
+
+
+def _fit_member(name: str, estimator, X: np.ndarray, y: np.ndarray):
+    start_time = time.perf_counter()
+    estimator.fit(X, y)
+    return name, estimator, time.perf_counter() - start_time
+
+
+class BlendedEnsemble(BaseEstimator, RegressorMixin):
+    """Weighted blend of regressors fitted on the same feature matrix.
+
+    Members are fitted concurrently and queried concurrently at inference.
+    When ``latency_budget_ms`` is set, members that have not answered within
+    the budget are left out of that blend, and members whose average latency
+    exceeds it are skipped altogether (re-probed every ``probe_every`` calls).
+    Weights are renormalized over the members that answered.
+    """
+
+    def __init__(self, estimators: Optional[List[Tuple[str, object]]] = None,
+                 weights: Optional[Dict[str, float]] = None,
+                 latency_budget_ms: float = 0.0, probe_every: int = 50, n_jobs: int = -1):
+        if estimators and weights is not None and all(
+                float(weights.get(name, 1.0)) <= 0 for name, _ in estimators):
+            raise ValueError("BlendedEnsemble needs at least one member with a positive weight")
+        self.estimators = estimators
+        self.weights = weights
+        self.latency_budget_ms = latency_budget_ms
+        self.probe_every = probe_every
+        self.n_jobs = n_jobs
+
+    def fit(self, X: np.ndarray, y: np.ndarray) -> "BlendedEnsemble":
+        if not self.estimators:
+            raise ValueError("BlendedEnsemble needs at least one estimator")
+
+        # Threads: the members' fit loops run in native code
+        results = Parallel(n_jobs=self.n_jobs, prefer="threads")(
+            delayed(_fit_member)(name, clone(estimator), X, y)
+            for name, estimator in self.estimators
+        )
+        self.estimators_ = {name: estimator for name, estimator, _ in results}
+        self.fit_times_ = {name: fit_time for name, _, fit_time in results}
+        self.n_features_in_ = X.shape[1]
+        self._reset_latency_stats()
+        return self
+
+    def _reset_latency_stats(self):
+        self.latency_stats_ = {
+            name: {'calls': 0, 'mean_ms': 0.0, 'last_ms': 0.0, 'budget_misses': 0, 'skipped': 0}
+            for name in self.estimators_
+        }
+        self._n_predict_calls = 0
+        self._stats_lock = threading.Lock()
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.pop('_stats_lock', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._stats_lock = threading.Lock()
+
+    @property
+    def member_weights(self) -> Dict[str, float]:
+        weights = self.weights or {}
+        return {name: float(weights.get(name, 1.0)) for name in self.estimators_}
+
+    def _record_latency(self, name: str, latency_ms: float):
+        with self._stats_lock:
+            stats = self.latency_stats_[name]
+            stats['calls'] += 1
+            stats['last_ms'] = latency_ms
+            # Exponential moving average so a slow spell is eventually forgiven
+            alpha = 1.0 if stats['calls'] == 1 else 0.2
+            stats['mean_ms'] += alpha * (latency_ms - stats['mean_ms'])
+
+    def _timed_predict(self, name: str, X: np.ndarray) -> np.ndarray:
+        start_time = time.perf_counter()
+        prediction = self.estimators_[name].predict(X)
+        self._record_latency(name, (time.perf_counter() - start_time) * 1000)
+        return prediction
+
+    def _active_members(self) -> List[str]:
+        weights = self.member_weights
+        members = [name for name in self.estimators_ if weights[name] > 0]
+        if not self.latency_budget_ms:
+            return members
+
+        # Concurrent predict() calls share the counters
+        with self._stats_lock:
+            self._n_predict_calls += 1
+            probing = self.probe_every and self._n_predict_calls % self.probe_every == 0
+            active = []
+            for name in members:
+                stats = self.latency_stats_[name]
+                if stats['calls'] and stats['mean_ms'] > self.latency_budget_ms and not probing:
+                    stats['skipped'] += 1
+                    continue
+                active.append(name)
+            # Never skip everything: keep the historically fastest member
+            return active or [min(members, key=lambda name: self.latency_stats_[name]['mean_ms'])]
+
+    def predict_members(self, X: np.ndarray) -> Dict[str, np.ndarray]:
+        """Predictions of the members that answered within the latency budget."""
+        members = self._active_members()
+        if len(members) == 1:
+            return {members[0]: self._timed_predict(members[0], X)}
+
+        executor = _get_executor()
+        futures = {executor.submit(self._timed_predict, name, X): name for name in members}
+        timeout = self.latency_budget_ms / 1000 if self.latency_budget_ms else None
+        done, late = wait(futures, timeout=timeout)
+        if not done:
+            done, late = wait(futures, return_when=FIRST_COMPLETED)
+
+        for future in late:
+            # Late members still finish in the background and update their latency
+            with self._stats_lock:
+                self.latency_stats_[futures[future]]['budget_misses'] += 1
+        return {futures[future]: future.result() for future in done}
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        predictions = self.predict_members(X)
+        weights = self.member_weights
+        total_weight = sum(weights[name] for name in predictions)
+        return sum(weights[name] * prediction for name, prediction in predictions.items()) / total_weight
+
+    @property
+    def feature_importances_(self) -> np.ndarray:
+        """Weighted mean of the members' normalized importances (|coef| for linear models)."""
+        weights = self.member_weights
+        total = np.zeros(self.n_features_in_)
+        total_weight = 0.0
+        for name, estimator in self.estimators_.items():
+            importances = getattr(estimator, 'feature_importances_', None)
+            if importances is None and hasattr(estimator, 'coef_'):
+                importances = np.abs(np.ravel(estimator.coef_))
+            if importances is None or not np.sum(importances):
+                continue
+            total += weights[name] * np.asarray(importances) / np.sum(importances)
+            total_weight += weights[name]
+        return total / total_weight if total_weight else total
+
+    def get_latency_stats(self) -> Dict:
+        """Per-member latency, budget misses and skips since the last fit."""
+        with self._stats_lock:
+            return {
+                'latency_budget_ms': self.latency_budget_ms,
+                'members': {name: dict(stats, fit_time_s=self.fit_times_[name], weight=self.member_weights[name])
+                            for name, stats in self.latency_stats_.items()}
+            }
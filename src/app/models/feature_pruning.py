@@ -0,0 +1,128 @@
+"""Importance-guided feature pruning with a walk-forward accuracy guard."""
+
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.inspection import permutation_importance
+import logging
+
+from src.app.models.validation import get_validation_strategy
+
+logger = logging.getLogger(__name__)
+
+
+class FeaturePruner:
+    """Drop redundant and low-importance features while walk-forward MAPE holds.
+
+    Two passes run against a walk-forward baseline:
+
+    1. Redundancy: of every pair correlated above ``correlation_threshold``
+       the less important feature is dropped.
+    2. Importance: the least important ``drop_fraction`` of the remaining
+       features is dropped per round, importances are refitted, and a
+       rejected batch is halved until a single feature cannot be removed.
+
+    A candidate set is accepted only if its walk-forward MAPE stays within
+    ``tolerance`` (relative) of the baseline with all features.
+    """
+
+    def __init__(self, estimator, tolerance: float = 0.02, correlation_threshold: float = 0.95,
+                 drop_fraction: float = 0.25, min_features: int = 5, n_splits: int = 5, n_jobs: int = -1):
+        self.estimator = estimator
+        self.tolerance = tolerance
+        self.correlation_threshold = correlation_threshold
+        self.drop_fraction = drop_fraction
+        self.min_features = min_features
+        self.validator = get_validation_strategy("timeseries", n_splits=n_splits, n_jobs=n_jobs)
+
+    def _walk_forward_mape(self, X: np.ndarray, y: np.ndarray, columns: List[int]) -> float:
+        return self.validator.evaluate(self.estimator, X[:, columns], y)['mape']
+
+    def _importances(self, X: np.ndarray, y: np.ndarray, columns: List[int]) -> np.ndarray:
+        model = clone(self.estimator).fit(X[:, columns], y)
+        importances = getattr(model, 'feature_importances_', None)
+        if importances is None:
+            recent = slice(-min(len(y), 250), None)
+            importances = permutation_importance(model, X[recent][:, columns], y[recent],
+                                                 n_repeats=3, random_state=42).importances_mean
+        return np.asarray(importances)
+
+    def fit(self, X: np.ndarray, y: np.ndarray, feature_names: Sequence[str]) -> Dict:
+        """Run both passes and return the selected features with an audit trail."""
+        start_time = time.time()
+        X = np.asarray(X, dtype=np.float64)
+        columns = list(range(X.shape[1]))
+        baseline = self._walk_forward_mape(X, y, columns)
+        limit = baseline * (1 + self.tolerance)
+        dropped = []
+        current_mape = baseline
+
+        def try_drop(candidates: List[int], reason: str) -> bool:
+            nonlocal columns, current_mape
+            remaining = [column for column in columns if column not in candidates]
+            if len(remaining) < self.min_features:
+                return False
+            mape = self._walk_forward_mape(X, y, remaining)
+            if mape > limit:
+                return False
+            columns, current_mape = remaining, mape
+            dropped.extend({'feature': feature_names[column], 'reason': reason, 'mape_after': mape}
+                           for column in candidates)
+            return True
+
+        # 1. Redundant features: drop the less important one of each correlated pair
+        importances = dict(zip(columns, self._importances(X, y, columns)))
+        correlation = np.abs(np.nan_to_num(np.corrcoef(X, rowvar=False)))
+        redundant = []
+        for i in sorted(columns, key=lambda column: importances[column], reverse=True):
+            if i in redundant:
+                continue
+            for j in columns:
+                if j != i and j not in redundant and importances[j] <= importances[i] \
+                        and correlation[i, j] > self.correlation_threshold:
+                    redundant.append(j)
+        if redundant and not try_drop(redundant, 'correlated'):
+            # Fall back to one feature at a time when the batch hurts accuracy
+            for column in redundant:
+                try_drop([column], 'correlated')
+
+        # 2. Low-importance features, in shrinking batches
+        batch_size = max(1, int(len(columns) * self.drop_fraction))
+        while len(columns) > self.min_features and batch_size >= 1:
+            importances = self._importances(X, y, columns)
+            order = [columns[k] for k in np.argsort(importances)]
+            batch = order[:min(batch_size, len(columns) - self.min_features)]
+            if not try_drop(batch, 'low_importance'):
+                if batch_size == 1:
+                    break
+                batch_size //= 2
+
+        selected = [feature_names[column] for column in columns]
+        logger.info(f"Feature pruning kept {len(selected)}/{len(feature_names)} features "
+                    f"(MAPE {baseline:.4f} -> {current_mape:.4f})")
+        return {
+            'selected_features': selected,
+            'dropped_features': dropped,
+            'n_features_before': len(feature_names),
+            'n_features_after': len(selected),
+            'baseline_mape': baseline,
+            'final_mape': current_mape,
+            'tolerance': self.tolerance,
+            'pruning_time': time.time() - start_time
+        }
+
+
+def required_inputs(selected_features: Optional[Sequence[str]], series_prefixes: Dict[str, str]) -> Optional[List[str]]:
+    """Raw input columns still needed by a selected feature set (None means all).
+
+    ``series_prefixes`` maps input columns to the prefix of the features
+    derived from them, as in ``SteelRebarPredictor.ECONOMIC_SERIES``.
+    """
+    if selected_features is None:
+        return None
+    return [
+        column for column, prefix in series_prefixes.items()
+        if any(feature.startswith(f"{prefix}_") for feature in selected_features)
+    ]
@@ -1,71 +1,187 @@
 """Machine Learning model for steel rebar price prediction."""
 
+import copy
+import json
 import joblib
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
 from sklearn.linear_model import LinearRegression
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_absolute_percentage_error
+from sklearn.inspection import permutation_importance
 import logging
 
+from src.app.utils.indicators import (
+    frame_values,
+    rolling_mean,
+    rolling_std,
+    pct_change,
+    rsi,
+    bollinger_bands
+)
+from src.app.models.validation import get_validation_strategy, confidence_from_mape
+from src.app.models.model_compaction import save_compact_artifact
+from src.app.models.ensemble import BlendedEnsemble
+from src.app.models.compiled_forest import CompiledForest
+from src.app.models.conformal import ConformalCalibrator
+from src.app.models.drift import FeatureSketch, DriftMonitor
+from src.app.models.feature_pruning import FeaturePruner, required_inputs
+from src.app.utils.feature_cache import FeatureMatrixCache, frame_hash
+
 logger = logging.getLogger(__name__)
 
 
 class SteelRebarPredictor:
     """Machine Learning model for predicting steel rebar prices."""
     
-    def __init__(self):
+    # Optional economic input columns and the prefix used for their features
+    ECONOMIC_SERIES = {
+        'iron_ore_price': 'iron_ore',
+        'coal_price': 'coal',
+        'usd_mxn_rate': 'usd_mxn'
+    }
+    
+    # Production forest hyperparameters (balanced profile); a searched
+    # profile can override them through load_training_profile()
+    DEFAULT_FOREST_PARAMS = {
+        'n_estimators': 150,
+        'max_depth': 12,
+        'min_samples_split': 3,
+        'min_samples_leaf': 1,
+        'max_features': 'sqrt'
+    }
+    
+    DEFAULT_HIST_GB_PARAMS = {
+        'max_iter': 300,
+        'learning_rate': 0.05,
+        'max_leaf_nodes': 31,
+        'min_samples_leaf': 10,
+        'l2_regularization': 0.1
+    }
+    
+    # Blend of the ensemble engine; members with weight 0 are not served
+    DEFAULT_ENSEMBLE_WEIGHTS = {
+        'random_forest': 0.5,
+        'hist_gradient_boosting': 0.3,
+        'linear': 0.2
+    }
+    
+    MODEL_TYPES = ('random_forest', 'hist_gradient_boosting', 'ensemble')
+    
+    # Calendar features cycle by design and would always look drifted
+    DRIFT_EXCLUDED_FEATURES = ('month', 'day_of_week', 'quarter')
+    # Moving averages follow the price level; drift for them means leaving the training range
+    DRIFT_LEVEL_FEATURES = ('price_ma_7', 'price_ma_14', 'price_ma_30', 'iron_ore_ma_7', 'coal_ma_7', 'usd_mxn_ma_7')
+    
+    # Bump whenever prepare_features changes: it is part of every data hash and cache key
+    FEATURE_CONFIG_VERSION = 1
+    
+    def __init__(self, validation_strategy: str = "oob", cv_folds: int = 5,
+                 model_type: str = "random_forest", ensemble_weights: Optional[Dict[str, float]] = None,
+                 latency_budget_ms: float = 0.0, drift_settings: Optional[Dict] = None,
+                 pruning_settings: Optional[Dict] = None, feature_cache_dir: Optional[str] = None,
+                 interval_alpha: float = 0.05):
+        if model_type not in self.MODEL_TYPES:
+            raise ValueError(f"Unknown model type '{model_type}'. Available: {', '.join(self.MODEL_TYPES)}")
         self.model = None
         self.scaler = StandardScaler()
         self.feature_names = []
         self.last_training_date = None
         self.model_confidence = 0.85
-        
+        self.validation_strategy = validation_strategy
+        self.cv_folds = cv_folds
+        self.incremental_updates = 0
+        self.incremental_batches = 0  # never reset; seeds each batch of new trees
+        self.forest_params = dict(self.DEFAULT_FOREST_PARAMS)
+        self.training_profile = 'balanced'
+        self.model_type = model_type
+        self.ensemble_weights = dict(ensemble_weights or self.DEFAULT_ENSEMBLE_WEIGHTS)
+        self.latency_budget_ms = latency_budget_ms
+        self.feature_importances = None
+        # DriftMonitor keyword arguments; None disables drift monitoring
+        self.drift_settings = drift_settings
+        self.drift_sketch = None
+        self.drift_monitor = None
+        # FeaturePruner keyword arguments; None keeps every feature
+        self.pruning_settings = pruning_settings
+        self.selected_features = None
+        self.feature_pruning = None
+        # Hash of the training frame and configuration behind the current model
+        self.training_data_hash = None
+        # On-disk memo of feature matrices; None computes them every time
+        self.feature_cache = FeatureMatrixCache(feature_cache_dir) if feature_cache_dir else None
+        # (model, CompiledForest) pair used for per-prediction contributions
+        self._contribution_forest = None
+        # Split-conformal calibration residuals and the miscoverage level of served intervals
+        self.conformal = None
+        self.interval_alpha = interval_alpha
+        
+    def load_training_profile(self, filepath: str):
+        """Load forest hyperparameters from a profile written by the hyperparameter search."""
+        with open(filepath) as f:
+            profile = json.load(f)
+        
+        unknown = set(profile['params']) - set(self.DEFAULT_FOREST_PARAMS)
+        if unknown:
+            raise ValueError(f"Unsupported parameters in training profile: {sorted(unknown)}")
+        
+        self.forest_params = {**self.DEFAULT_FOREST_PARAMS, **profile['params']}
+        self.training_profile = profile.get('name', filepath)
+        logger.info(f"Training profile '{self.training_profile}' loaded from {filepath}")
+    
     def prepare_features(self, historical_data: pd.DataFrame) -> pd.DataFrame:
         """Prepare features for the ML model."""
         
         df = historical_data.copy()
         
-        # Basic price features
-        df['price_ma_7'] = df['price'].rolling(window=7).mean()
-        df['price_ma_14'] = df['price'].rolling(window=14).mean()
-        df['price_ma_30'] = df['price'].rolling(window=30).mean()
-        
-        # Volatility features
-        df['price_volatility_7'] = df['price'].rolling(window=7).std()
-        df['price_volatility_14'] = df['price'].rolling(window=14).std()
-        
-        # Trend features
-        df['price_change_1d'] = df['price'].pct_change(1)
-        df['price_change_7d'] = df['price'].pct_change(7)
-        df['price_change_30d'] = df['price'].pct_change(30)
-        
-        # Technical indicators
-        df['rsi_14'] = self._calculate_rsi(df['price'], 14)
-        df['bollinger_upper'] = df['price_ma_20'] + (2 * df['price_volatility_20'])
-        df['bollinger_lower'] = df['price_ma_20'] - (2 * df['price_volatility_20'])
-        df['bollinger_position'] = (df['price'] - df['bollinger_lower']) / (df['bollinger_upper'] - df['bollinger_lower'])
+        # Price indicators are computed in one vectorized pass per kernel
+        prices = frame_values(df, ['price'])
+        bands = bollinger_bands(prices, 20)
+        price_features = {
+            # Basic price features
+            'price_ma_7': rolling_mean(prices, 7),
+            'price_ma_14': rolling_mean(prices, 14),
+            'price_ma_30': rolling_mean(prices, 30),
+            
+            # Volatility features
+            'price_volatility_7': rolling_std(prices, 7),
+            'price_volatility_14': rolling_std(prices, 14),
+            
+            # Trend features
+            'price_change_1d': pct_change(prices, 1),
+            'price_change_7d': pct_change(prices, 7),
+            'price_change_30d': pct_change(prices, 30),
+            
+            # Technical indicators
+            'rsi_14': rsi(prices, 14),
+            'bollinger_upper': bands['upper'],
+            'bollinger_lower': bands['lower'],
+            'bollinger_position': bands['position']
+        }
+        for name, values in price_features.items():
+            df[name] = values[:, 0]
         
         # Seasonal features
         df['month'] = pd.to_datetime(df['date']).dt.month
         df['day_of_week'] = pd.to_datetime(df['date']).dt.dayofweek
         df['quarter'] = pd.to_datetime(df['date']).dt.quarter
         
-        # Economic indicators (if available)
-        if 'iron_ore_price' in df.columns:
-            df['iron_ore_ma_7'] = df['iron_ore_price'].rolling(window=7).mean()
-            df['iron_ore_change_7d'] = df['iron_ore_price'].pct_change(7)
-            
-        if 'coal_price' in df.columns:
-            df['coal_ma_7'] = df['coal_price'].rolling(window=7).mean()
-            df['coal_change_7d'] = df['coal_price'].pct_change(7)
-            
-        if 'usd_mxn_rate' in df.columns:
-            df['usd_mxn_ma_7'] = df['usd_mxn_rate'].rolling(window=7).mean()
-            df['usd_mxn_change_7d'] = df['usd_mxn_rate'].pct_change(7)
+        # Economic indicators (if available and still used), batched across all series
+        needed_inputs = self.required_inputs()
+        economic_series = [
+            (column, prefix) for column, prefix in self.ECONOMIC_SERIES.items()
+            if column in df.columns and (needed_inputs is None or column in needed_inputs)
+        ]
+        if economic_series:
+            economic_values = frame_values(df, [column for column, _ in economic_series])
+            economic_ma_7 = rolling_mean(economic_values, 7)
+            economic_change_7d = pct_change(economic_values, 7)
+            for j, (_, prefix) in enumerate(economic_series):
+                df[f'{prefix}_ma_7'] = economic_ma_7[:, j]
+                df[f'{prefix}_change_7d'] = economic_change_7d[:, j]
         
         # Drop rows with NaN values
         df = df.dropna()
@@ -80,68 +196,150 @@ class SteelRebarPredictor:
         ]
         
         # Add economic indicators if available
-        if 'iron_ore_ma_7' in df.columns:
-            feature_columns.extend(['iron_ore_ma_7', 'iron_ore_change_7d'])
-        if 'coal_ma_7' in df.columns:
-            feature_columns.extend(['coal_ma_7', 'coal_change_7d'])
-        if 'usd_mxn_ma_7' in df.columns:
-            feature_columns.extend(['usd_mxn_ma_7', 'usd_mxn_change_7d'])
+        for _, prefix in economic_series:
+            feature_columns.extend([f'{prefix}_ma_7', f'{prefix}_change_7d'])
+        
+        if self.selected_features is not None:
+            feature_columns = [name for name in feature_columns if name in self.selected_features]
         
         self.feature_names = feature_columns
         
         return df[['date'] + feature_columns + ['price']]
     
+    def required_inputs(self) -> Optional[List[str]]:
+        """Economic input columns the selected features need (None means all)."""
+        return required_inputs(self.selected_features, self.ECONOMIC_SERIES)
+    
+    def training_hash(self, historical_data: pd.DataFrame) -> str:
+        """Content hash of a training frame and everything that shapes the fitted model."""
+        return frame_hash(historical_data, {
+            'feature_version': self.FEATURE_CONFIG_VERSION,
+            'model_type': self.model_type,
+            'forest_params': self.forest_params,
+            'hist_gb_params': self.DEFAULT_HIST_GB_PARAMS,
+            'ensemble_weights': self.ensemble_weights if self.model_type == 'ensemble' else None,
+            'pruning_settings': self.pruning_settings,
+            'validation': [self.validation_strategy, self.cv_folds]
+        })
+    
+    def feature_matrices(self, historical_data: pd.DataFrame) -> Dict:
+        """Prepared features, target and scaled matrix, memoized by content hash.
+        
+        Returns the prepared frame, ``X`` (unscaled), ``X_scaled`` with the
+        ``scaler`` fitted on it, ``y``, the cache ``key`` and whether it was
+        a ``cache_hit``. The key covers the raw frame, the feature version and
+        the selected features, so any change recomputes the matrices.
+        """
+        key = frame_hash(historical_data, {
+            'feature_version': self.FEATURE_CONFIG_VERSION,
+            'selected_features': self.selected_features
+        })
+        entry = self.feature_cache.load(key) if self.feature_cache is not None else None
+        if entry is not None:
+            self.feature_names = list(entry['feature_names'])
+            return {**entry, 'key': key, 'cache_hit': True}
+        
+        df = self.prepare_features(historical_data)
+        X = df[self.feature_names].values.astype(np.float64)
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X) if len(X) else X
+        entry = {
+            'frame': df,
+            'feature_names': list(self.feature_names),
+            'X': X,
+            'X_scaled': X_scaled,
+            'y': df['price'].values.astype(np.float64),
+            'scaler': scaler
+        }
+        if self.feature_cache is not None:
+            self.feature_cache.save(key, entry)
+        return {**entry, 'key': key, 'cache_hit': False}
+    
+    def select_features(self, historical_data: pd.DataFrame, **pruning_settings) -> Dict:
+        """Prune the candidate features with a walk-forward accuracy guard."""
+        self.selected_features = None
+        matrices = self.feature_matrices(historical_data)
+        
+        pruner = FeaturePruner(self._build_model(), n_splits=self.cv_folds, **pruning_settings)
+        report = pruner.fit(matrices['X_scaled'], matrices['y'], self.feature_names)
+        report['feature_matrix_hit'] = matrices['cache_hit']
+        
+        self.selected_features = report['selected_features']
+        self.feature_pruning = report
+        return report
+    
     def _calculate_rsi(self, prices: pd.Series, window: int = 14) -> pd.Series:
         """Calculate Relative Strength Index."""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return pd.Series(rsi(prices.to_numpy(dtype=np.float64), window)[:, 0], index=prices.index)
     
-    def train(self, historical_data: pd.DataFrame) -> Dict:
-        """Train the ML model."""
+    def _skipped_training_result(self, data_hash: str) -> Dict:
+        logger.info(f"Training data unchanged (hash {data_hash}), keeping the current model")
+        return {
+            'training_mode': 'skipped',
+            'training_samples': 0,
+            'feature_count': len(self.feature_names),
+            'model_confidence': self.model_confidence,
+            'last_training_date': self.last_training_date.isoformat() if self.last_training_date else None,
+            'cache_hits': {'training_data': True, 'feature_matrices': 0, 'feature_matrix_misses': 0},
+            'training_data_hash': data_hash
+        }
+    
+    def train(self, historical_data: pd.DataFrame, force: bool = False) -> Dict:
+        """Train the ML model.
+        
+        Training is skipped when the frame and configuration hash to the same
+        value as the current model's, unless ``force`` is set.
+        """
+        
+        data_hash = self.training_hash(historical_data)
+        if not force and self.model is not None and data_hash == self.training_data_hash:
+            return self._skipped_training_result(data_hash)
         
         logger.info("Starting model training...")
         
-        # Prepare features
-        df = self.prepare_features(historical_data)
+        matrix_hits = []
+        if self.pruning_settings is not None:
+            report = self.select_features(historical_data, **self.pruning_settings)
+            matrix_hits.append(report['feature_matrix_hit'])
+        
+        # Prepare features (memoized on disk when a feature cache is configured)
+        matrices = self.feature_matrices(historical_data)
+        matrix_hits.append(matrices['cache_hit'])
+        df = matrices['frame']
         
         if len(df) < 30:
             raise ValueError("Insufficient data for training. Need at least 30 days of data.")
         
-        # Split features and target
-        X = df[self.feature_names].values
-        y = df['price'].values
-        
-        # Scale features
-        X_scaled = self.scaler.fit_transform(X)
-        
-        # Train model (using optimized Random Forest for production)
-        self.model = RandomForestRegressor(
-            n_estimators=150,      # Balanced profile: 150 trees
-            max_depth=12,          # Balanced profile: depth 12
-            min_samples_split=3,    # More flexible
-            min_samples_leaf=1,     # More flexible
-            max_features='sqrt',    # Optimized feature selection
-            random_state=42,
-            n_jobs=-1,
-            bootstrap=True,
-            oob_score=True
-        )
+        # Scaled features come with their own scaler, so previously published versions keep theirs
+        X_scaled = matrices['X_scaled']
+        y = matrices['y']
+        self.scaler = matrices['scaler']
+        
+        # Train model (optimized Random Forest, or the blended ensemble)
+        self.model = self._build_model()
         
         self.model.fit(X_scaled, y)
+        self.incremental_updates = 0
         
-        # Calculate model confidence based on cross-validation
-        from sklearn.model_selection import cross_val_score
-        cv_scores = cross_val_score(self.model, X_scaled, y, cv=5, scoring='neg_mean_absolute_percentage_error')
-        self.model_confidence = max(0.5, min(0.95, 1 - abs(cv_scores.mean())))
+        # Calculate model confidence with the configured validation strategy
+        strategy = self.validation_strategy
+        if strategy == 'oob' and not isinstance(self.model, RandomForestRegressor):
+            # Only the forest has out-of-bag predictions
+            strategy = 'timeseries'
+        validator = get_validation_strategy(strategy, n_splits=self.cv_folds)
+        validation = validator.evaluate(self.model, X_scaled, y)
+        self.model_confidence = confidence_from_mape(validation['mape'])
+        
+        # Calibration residuals for conformal intervals (out-of-bag for forests)
+        self.conformal = ConformalCalibrator.from_model(self.model, X_scaled, y)
         
         self.last_training_date = datetime.now()
+        self.training_data_hash = data_hash
+        self._build_drift_sketch(df)
         
         # Calculate feature importance
-        feature_importance = dict(zip(self.feature_names, self.model.feature_importances_))
+        self.feature_importances = self._compute_feature_importances(X_scaled, y)
+        feature_importance = dict(zip(self.feature_names, self.feature_importances))
         
         logger.info(f"Model training completed. Confidence: {self.model_confidence:.3f}")
         
@@ -150,7 +348,171 @@ class SteelRebarPredictor:
             'feature_count': len(self.feature_names),
             'model_confidence': self.model_confidence,
             'feature_importance': feature_importance,
-            'last_training_date': self.last_training_date.isoformat()
+            'training_profile': self.training_profile,
+            'model_type': self.model_type,
+            'selected_features': self.selected_features,
+            'validation': validation,
+            'conformal': self.conformal.get_stats(),
+            'last_training_date': self.last_training_date.isoformat(),
+            'cache_hits': {
+                'training_data': False,
+                'feature_matrices': sum(matrix_hits),
+                'feature_matrix_misses': len(matrix_hits) - sum(matrix_hits)
+            },
+            'training_data_hash': data_hash
+        }
+    
+    def _build_drift_sketch(self, df: pd.DataFrame):
+        """Sketch the training distribution and restart drift monitoring."""
+        features = [name for name in self.feature_names if name not in self.DRIFT_EXCLUDED_FEATURES]
+        self.drift_sketch = FeatureSketch.from_matrix(
+            df[features].values, features,
+            level_features=self.DRIFT_LEVEL_FEATURES,
+            last_date=pd.to_datetime(df['date']).max()
+        )
+        self._reset_drift_monitor()
+    
+    def _reset_drift_monitor(self):
+        if self.drift_settings is None or self.drift_sketch is None:
+            self.drift_monitor = None
+            return
+        settings = dict(self.drift_settings)
+        # Live error threshold is relative to the validation error behind model_confidence
+        error_multiplier = settings.pop('error_multiplier', None)
+        if error_multiplier:
+            settings['error_threshold'] = max(1 - self.model_confidence, 0.005) * error_multiplier
+        self.drift_monitor = DriftMonitor(self.drift_sketch, **settings)
+    
+    def _compute_feature_importances(self, X: np.ndarray, y: np.ndarray, max_rows: int = 250) -> np.ndarray:
+        """Impurity importances when the model has them, else permutation importances
+        on the most recent rows (gradient boosting exposes no ``feature_importances_``)."""
+        importances = getattr(self.model, 'feature_importances_', None)
+        if importances is not None:
+            return np.asarray(importances)
+        
+        result = permutation_importance(self.model, X[-max_rows:], y[-max_rows:], n_repeats=3, random_state=42)
+        importances = np.clip(result.importances_mean, 0, None)
+        return importances / importances.sum() if importances.sum() > 0 else importances
+    
+    def _build_model(self):
+        """Create an unfitted model for the configured ``model_type``."""
+        if self.model_type == 'ensemble':
+            members = {
+                'random_forest': self._build_forest(),
+                'hist_gradient_boosting': self._build_hist_gradient_boosting(),
+                'linear': LinearRegression()
+            }
+            return BlendedEnsemble(
+                estimators=[(name, members[name]) for name in self.ensemble_weights if name in members],
+                weights=self.ensemble_weights,
+                latency_budget_ms=self.latency_budget_ms
+            )
+        if self.model_type == 'hist_gradient_boosting':
+            return self._build_hist_gradient_boosting()
+        return self._build_forest()
+    
+    def _build_hist_gradient_boosting(self) -> HistGradientBoostingRegressor:
+        """Create a histogram gradient-boosting model; it bins features once, so
+        fit time and memory grow far slower with the feature count than the forest."""
+        return HistGradientBoostingRegressor(**self.DEFAULT_HIST_GB_PARAMS, random_state=42)
+    
+    def _build_forest(self, n_estimators: Optional[int] = None, random_state: int = 42) -> RandomForestRegressor:
+        """Create a forest with the active training profile's hyperparameters."""
+        params = dict(self.forest_params)
+        if n_estimators is not None:
+            params['n_estimators'] = n_estimators
+        return RandomForestRegressor(
+            **params,
+            random_state=random_state,
+            n_jobs=-1,
+            bootstrap=True,
+            oob_score=True
+        )
+    
+    def train_incremental(self, historical_data: pd.DataFrame, new_trees: int = 15,
+                          window_days: int = 180, full_rebuild_every: int = 7) -> Dict:
+        """Refresh the forest by replacing its oldest trees with trees fitted on recent data.
+        
+        The forest is kept as a pool ordered from oldest to newest tree. Each call
+        fits ``new_trees`` trees on the last ``window_days`` rows and retires the
+        same number of the oldest trees, so the ensemble size stays constant.
+        Falls back to a full ``train()`` when there is no forest yet, the feature
+        set changed, or ``full_rebuild_every`` incremental updates have been made.
+        """
+        
+        data_hash = self.training_hash(historical_data)
+        if self.model is not None and data_hash == self.training_data_hash:
+            return self._skipped_training_result(data_hash)
+        
+        previous_features = list(self.feature_names)
+        matrices = self.feature_matrices(historical_data)
+        df = matrices['frame']
+        
+        needs_full_rebuild = (
+            not isinstance(self.model, RandomForestRegressor)
+            or self.feature_names != previous_features
+            or self.incremental_updates >= full_rebuild_every
+            or new_trees >= len(self.model.estimators_)
+        )
+        if needs_full_rebuild:
+            logger.info("Incremental update not possible, running full rebuild")
+            result = self.train(historical_data)
+            result['training_mode'] = 'full'
+            return result
+        
+        recent = df.tail(window_days)
+        if len(recent) < 30:
+            raise ValueError("Insufficient recent data for incremental training. Need at least 30 days of data.")
+        
+        logger.info(f"Starting incremental training: {new_trees} new trees on {len(recent)} recent rows")
+        start_time = datetime.now()
+        
+        # Reuse the existing scaler so the retained trees stay valid
+        X_recent = self.scaler.transform(recent[self.feature_names].values)
+        y_recent = recent['price'].values
+        
+        # Seeded from a lifetime counter so batches after a full rebuild don't repeat earlier ones
+        self.incremental_batches += 1
+        batch = self._build_forest(n_estimators=new_trees, random_state=42 + self.incremental_batches)
+        batch.fit(X_recent, y_recent)
+        
+        # Retire the oldest trees and append the new batch at the end of the pool.
+        # The forest is copied first: the registry may still serve the old object.
+        self.model = copy.copy(self.model)
+        self.model.estimators_ = self.model.estimators_[new_trees:] + batch.estimators_
+        self.model.n_estimators = len(self.model.estimators_)
+        self.feature_importances = self.model.feature_importances_
+        self.incremental_updates += 1
+        
+        # The retained trees were validated (and conformally calibrated) at the last
+        # full rebuild; the new batch is scored on its own out-of-bag rows from the recent window
+        batch_validation = get_validation_strategy("oob").evaluate(batch, X_recent, y_recent)
+        
+        self.last_training_date = datetime.now()
+        self.training_data_hash = data_hash
+        self._build_drift_sketch(df)
+        
+        logger.info(
+            f"Incremental training completed in {(self.last_training_date - start_time).total_seconds():.2f}s "
+            f"({self.incremental_updates}/{full_rebuild_every} before full rebuild)"
+        )
+        
+        return {
+            'training_mode': 'incremental',
+            'training_samples': len(recent),
+            'feature_count': len(self.feature_names),
+            'trees_replaced': new_trees,
+            'total_trees': self.model.n_estimators,
+            'incremental_updates': self.incremental_updates,
+            'model_confidence': self.model_confidence,
+            'validation': batch_validation,
+            'last_training_date': self.last_training_date.isoformat(),
+            'cache_hits': {
+                'training_data': False,
+                'feature_matrices': int(matrices['cache_hit']),
+                'feature_matrix_misses': int(not matrices['cache_hit'])
+            },
+            'training_data_hash': data_hash
         }
     
     def predict(self, current_data: pd.DataFrame) -> Tuple[float, Dict]:
@@ -172,38 +534,137 @@ class SteelRebarPredictor:
         # Make prediction
         prediction = self.model.predict(latest_features_scaled)[0]
         
+        # Conformal interval: one lookup into the stored calibration residuals
+        prediction_interval = None
+        if self.conformal is not None:
+            radius = self.conformal.radius(self.interval_alpha)
+            prediction_interval = {
+                'lower_bound': float(prediction - radius),
+                'upper_bound': float(prediction + radius),
+                'coverage': 1 - self.interval_alpha
+            }
+        
+        # Feed unseen rows to the drift monitor and score the previous prediction
+        if self.drift_monitor is not None:
+            self.drift_monitor.update_from_frame(df)
+            self.drift_monitor.record_prediction(prediction)
+        
         # Get feature importance for explanation
-        feature_importance = dict(zip(self.feature_names, self.model.feature_importances_))
+        importances = self.feature_importances
+        if importances is None:
+            importances = self.model.feature_importances_
+        feature_importance = dict(zip(self.feature_names, importances))
         
         # Get current feature values for explanation
         current_features = df[self.feature_names].iloc[-1].to_dict()
         
-        return prediction, {
+        details = {
             'prediction': prediction,
             'confidence': self.model_confidence,
             'feature_importance': feature_importance,
             'current_features': current_features,
-            'model_type': 'RandomForestRegressor'
+            'model_type': type(self.model).__name__,
+            'prediction_interval': prediction_interval
         }
+        if isinstance(self.model, BlendedEnsemble):
+            details['ensemble'] = self.model.get_latency_stats()
+        
+        # Per-prediction contributions, stored with the prediction so explanations are a lookup
+        contributions = self.prediction_contributions(latest_features_scaled)
+        if contributions is not None:
+            details['contribution_bias'], details['contributions'] = contributions
+        
+        return prediction, details
     
-    def save_model(self, filepath: str):
-        """Save the trained model."""
+    def prediction_contributions(self, X_scaled: np.ndarray) -> Optional[Tuple[float, Dict[str, float]]]:
+        """Baseline and per-feature contributions to the prediction of one scaled row.
+        
+        Uses the path decomposition of the forest's flattened trees, so the
+        baseline plus the contributions add up to the prediction. Only forest
+        models (sklearn or compacted) are decomposed; other engines return None.
+        """
+        forest = self._compiled_forest()
+        if forest is None:
+            return None
+        bias, contributions = forest.contributions(X_scaled)
+        return float(bias[0]), {
+            name: float(value) for name, value in zip(self.feature_names, contributions[0])
+        }
+    
+    def _compiled_forest(self) -> Optional[CompiledForest]:
+        if isinstance(self.model, CompiledForest):
+            return self.model
+        if not isinstance(self.model, RandomForestRegressor):
+            return None
+        # Compile once per fitted model; retraining and hot swaps replace the model object
+        if self._contribution_forest is None or self._contribution_forest[0] is not self.model:
+            self._contribution_forest = (self.model, CompiledForest.from_estimator(self.model))
+        return self._contribution_forest[1]
+    
+    def save_model(self, filepath: str, compaction_profile: Optional[str] = None):
+        """Save the trained model, optionally as a compacted forest artifact."""
         model_data = {
             'model': self.model,
             'scaler': self.scaler,
             'feature_names': self.feature_names,
             'last_training_date': self.last_training_date,
-            'model_confidence': self.model_confidence
+            'model_confidence': self.model_confidence,
+            'incremental_updates': self.incremental_updates,
+            'incremental_batches': self.incremental_batches,
+            'forest_params': self.forest_params,
+            'training_profile': self.training_profile,
+            'model_type': self.model_type,
+            'ensemble_weights': self.ensemble_weights,
+            'feature_importances': self.feature_importances,
+            'drift_sketch': self.drift_sketch,
+            'selected_features': self.selected_features,
+            'feature_pruning': self.feature_pruning,
+            'training_data_hash': self.training_data_hash,
+            'conformal': self.conformal
         }
+        if compaction_profile and not isinstance(self.model, (RandomForestRegressor, CompiledForest)):
+            logger.warning(f"Compaction only applies to forests, saving the {self.model_type} model as is")
+            compaction_profile = None
+        if compaction_profile:
+            save_compact_artifact(model_data, filepath, compaction_profile)
+            return
         joblib.dump(model_data, filepath)
         logger.info(f"Model saved to {filepath}")
     
+    @staticmethod
+    def is_compatible_artifact(model_data) -> bool:
+        """Check that an artifact was saved by ``save_model`` and can be served."""
+        return (
+            isinstance(model_data, dict)
+            and all(key in model_data for key in ('model', 'scaler', 'feature_names'))
+            and hasattr(model_data['model'], 'predict')
+        )
+    
     def load_model(self, filepath: str):
         """Load a trained model."""
-        model_data = joblib.load(filepath)
+        self.load_model_data(joblib.load(filepath))
+        logger.info(f"Model loaded from {filepath}")
+    
+    def load_model_data(self, model_data: Dict):
+        """Use an already loaded artifact, e.g. one held by the model registry."""
+        if not self.is_compatible_artifact(model_data):
+            raise ValueError("Artifact is not a SteelRebarPredictor model")
         self.model = model_data['model']
         self.scaler = model_data['scaler']
         self.feature_names = model_data['feature_names']
-        self.last_training_date = model_data['last_training_date']
-        self.model_confidence = model_data['model_confidence']
-        logger.info(f"Model loaded from {filepath}")
+        self.last_training_date = model_data.get('last_training_date')
+        self.model_confidence = model_data.get('model_confidence', 0.85)
+        self.incremental_updates = model_data.get('incremental_updates', 0)
+        self.incremental_batches = model_data.get('incremental_batches', self.incremental_updates)
+        self.forest_params = model_data.get('forest_params', dict(self.DEFAULT_FOREST_PARAMS))
+        self.training_profile = model_data.get('training_profile', 'balanced')
+        self.feature_importances = model_data.get('feature_importances')
+        self.drift_sketch = model_data.get('drift_sketch')
+        self.selected_features = model_data.get('selected_features')
+        self.feature_pruning = model_data.get('feature_pruning')
+        self.training_data_hash = model_data.get('training_data_hash')
+        self.conformal = model_data.get('conformal')
+        self._reset_drift_monitor()
+        # model_type stays as configured: it selects the engine of the next retrain
+        if isinstance(self.model, BlendedEnsemble):
+            self.model.latency_budget_ms = self.latency_budget_ms
@@ -0,0 +1,172 @@
+"""Compaction of forest artifacts: leaf pruning, quantization and compression.
+
+A compacted artifact replaces the sklearn forest with a ``CompiledForest``
+whose node arrays are pruned and stored in narrow dtypes. Each step is
+bounded by a configurable absolute prediction error (USD/ton), and the
+compacted forest still exposes ``predict`` and ``feature_importances_`` so
+``SteelRebarPredictor`` can serve it without changes.
+"""
+
+from typing import Dict, Tuple
+
+import joblib
+import numpy as np
+import logging
+
+from src.app.models.compiled_forest import CompiledForest
+
+logger = logging.getLogger(__name__)
+
+
+# Named compaction profiles, from safest to smallest
+COMPACTION_PROFILES = {
+    'lossless': {
+        'prune_error': 0.0,         # only collapse siblings that predict the same value
+        'value_dtype': 'float32',
+        'max_value_error': 0.01,
+        'compress': ('zlib', 3)
+    },
+    'balanced': {
+        'prune_error': 0.5,
+        'value_dtype': 'float32',
+        'max_value_error': 0.01,
+        'compress': ('lzma', 6)
+    },
+    'tiny': {
+        'prune_error': 2.0,
+        'value_dtype': 'float16',
+        'max_value_error': 0.25,
+        'compress': ('lzma', 9)
+    }
+}
+
+
+def prune_forest(forest: CompiledForest, max_abs_error: float = 0.0) -> Tuple[CompiledForest, Dict]:
+    """Collapse sibling leaves into their parent while the error bound allows it.
+
+    Nodes are visited bottom-up (children always follow their parent in the
+    depth-first layout). A parent whose two children are leaves becomes a leaf
+    with its own training mean when the largest deviation from any original
+    leaf underneath stays within ``max_abs_error``.
+    """
+    n_nodes = forest.n_nodes
+    node_ids = np.arange(n_nodes)
+    left = forest.children_left.copy()
+    right = forest.children_right.copy()
+    feature = forest.feature.copy()
+    threshold = forest.threshold.copy()
+    value = forest.value.astype(np.float64)
+
+    is_leaf = left == node_ids
+    deviation = np.zeros(n_nodes)
+    collapsed = 0
+
+    for node in range(n_nodes - 1, -1, -1):
+        if is_leaf[node]:
+            continue
+        l, r = left[node], right[node]
+        if not (is_leaf[l] and is_leaf[r]):
+            continue
+        error = max(deviation[l] + abs(value[l] - value[node]),
+                    deviation[r] + abs(value[r] - value[node]))
+        if error <= max_abs_error:
+            is_leaf[node] = True
+            deviation[node] = error
+            left[node] = right[node] = node
+            feature[node] = 0
+            threshold[node] = np.inf
+            collapsed += 1
+
+    # Drop the nodes that are no longer reachable, keeping depth-first order
+    reachable = np.zeros(n_nodes, dtype=bool)
+    reachable[forest.roots] = True
+    for node in range(n_nodes):
+        if reachable[node] and not is_leaf[node]:
+            reachable[left[node]] = True
+            reachable[right[node]] = True
+
+    new_index = np.cumsum(reachable) - 1
+    keep = np.flatnonzero(reachable)
+
+    pruned = forest.copy_with(
+        children_left=new_index[left[keep]].astype(forest.children_left.dtype),
+        children_right=new_index[right[keep]].astype(forest.children_right.dtype),
+        feature=feature[keep],
+        threshold=threshold[keep],
+        value=forest.value[keep],
+        roots=new_index[forest.roots].astype(forest.roots.dtype)
+    )
+    stats = {
+        'nodes_before': int(n_nodes),
+        'nodes_after': int(len(keep)),
+        'collapsed_nodes': collapsed,
+        'max_leaf_error': float(deviation[keep].max()) if len(keep) else 0.0
+    }
+    return pruned, stats
+
+
+def quantize_forest(forest: CompiledForest, value_dtype: str = 'float32',
+                    max_value_error: float = 0.01) -> Tuple[CompiledForest, Dict]:
+    """Store thresholds as float32 and node values in ``value_dtype``.
+
+    Thresholds are rounded down to the nearest float32, which is exact because
+    inputs are compared in float32. Values are stored as residuals around their
+    mean; if the requested dtype exceeds ``max_value_error`` float32 is used.
+    """
+    threshold = forest.threshold.astype(np.float32)
+    rounded_up = threshold.astype(np.float64) > forest.threshold
+    threshold[rounded_up] = np.nextafter(threshold[rounded_up], np.float32(-np.inf))
+
+    values = forest.value.astype(np.float64) + forest.value_offset
+    offset = float(values.mean())
+    residuals = values - offset
+
+    dtype = np.dtype(value_dtype)
+    quantized = residuals.astype(dtype)
+    value_error = float(np.max(np.abs(quantized.astype(np.float64) - residuals)))
+    if value_error > max_value_error and dtype != np.float32:
+        logger.warning(f"{value_dtype} values exceed error bound ({value_error:.4f} > {max_value_error}), using float32")
+        dtype = np.dtype(np.float32)
+        quantized = residuals.astype(dtype)
+        value_error = float(np.max(np.abs(quantized.astype(np.float64) - residuals)))
+
+    feature_dtype = np.uint8 if forest.n_features <= np.iinfo(np.uint8).max else np.int16
+
+    compact = forest.copy_with(
+        threshold=threshold,
+        value=quantized,
+        value_offset=offset,
+        feature=forest.feature.astype(feature_dtype)
+    )
+    return compact, {'value_dtype': dtype.name, 'max_value_error': value_error}
+
+
+def compact_forest(model, profile: str = 'balanced') -> Tuple[CompiledForest, Dict]:
+    """Compile, prune and quantize a fitted forest according to ``profile``.
+
+    A ``CompiledForest`` comes from an artifact that was already compacted:
+    it is only re-quantized, since pruning it again would stack a second
+    error bound on top of the first.
+    """
+    if profile not in COMPACTION_PROFILES:
+        raise ValueError(f"Unknown compaction profile '{profile}'. Available: {', '.join(COMPACTION_PROFILES)}")
+    settings = COMPACTION_PROFILES[profile]
+
+    if isinstance(model, CompiledForest):
+        forest = model
+        prune_stats = {'nodes_before': forest.n_nodes, 'nodes_after': forest.n_nodes,
+                       'collapsed_nodes': 0, 'max_leaf_error': 0.0}
+    else:
+        forest, prune_stats = prune_forest(CompiledForest.from_estimator(model), settings['prune_error'])
+    forest, quantize_stats = quantize_forest(forest, settings['value_dtype'], settings['max_value_error'])
+
+    return forest, {'profile': profile, **prune_stats, **quantize_stats}
+
+
+def save_compact_artifact(model_data: Dict, filepath: str, profile: str = 'balanced') -> Dict:
+    """Write a model artifact dict with its forest compacted and the file compressed."""
+    compact, stats = compact_forest(model_data['model'], profile)
+    joblib.dump({**model_data, 'model': compact, 'compaction': stats},
+                filepath, compress=COMPACTION_PROFILES[profile]['compress'])
+    logger.info(f"Compact model ({profile}) saved to {filepath}: {stats['nodes_after']}/{stats['nodes_before']} nodes")
+    return stats
@@ -40,5 +40,6 @@ class ModelExplanationResponse(BaseModel):
     prediction_date: str = Field(..., description="Date for the prediction")
     predicted_price: float = Field(..., description="Predicted price")
     key_factors: List[dict] = Field(..., description="Key factors influencing the prediction")
+    baseline_price: Optional[float] = Field(None, description="Average training price the contributions add up from")
     model_type: str = Field(..., description="Type of model used")
     timestamp: str = Field(..., description="ISO timestamp")
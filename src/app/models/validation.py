@@ -0,0 +1,150 @@
+"""Validation strategies used to derive model confidence after training."""
+
+import time
+from typing import Dict, List
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import mean_absolute_percentage_error
+from sklearn.model_selection import TimeSeriesSplit, cross_val_score
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ValidationStrategy:
+    """Base class for post-training validation strategies.
+
+    ``evaluate`` receives the already fitted model together with the scaled
+    training matrix and returns a dict with the mean MAPE and per-fold scores.
+    """
+
+    name = "base"
+
+    def evaluate(self, model, X: np.ndarray, y: np.ndarray) -> Dict:
+        start_time = time.time()
+        fold_scores = self._fold_scores(model, X, y)
+        return {
+            'strategy': self.name,
+            'mape': float(np.mean(fold_scores)),
+            'fold_scores': [float(score) for score in fold_scores],
+            'validation_time': time.time() - start_time
+        }
+
+    def _fold_scores(self, model, X: np.ndarray, y: np.ndarray) -> List[float]:
+        raise NotImplementedError
+
+
+def oob_mask(model, n_samples: int) -> np.ndarray:
+    """Rows left out of at least one tree's bootstrap, i.e. rows with a real OOB prediction.
+
+    sklearn reports 0 (not NaN) for rows that were in every bootstrap, so
+    the mask is rebuilt from the trees' sample indices when available.
+    """
+    estimators_samples = getattr(model, 'estimators_samples_', None)
+    if estimators_samples is None:
+        return np.ravel(model.oob_prediction_) != 0
+
+    votes = np.zeros(n_samples, dtype=np.int64)
+    for sample_indices in estimators_samples:
+        in_bag = np.zeros(n_samples, dtype=bool)
+        in_bag[sample_indices] = True
+        votes += ~in_bag
+    return votes > 0
+
+
+class OOBValidation(ValidationStrategy):
+    """Score the fitted forest on its out-of-bag predictions.
+
+    Requires ``bootstrap=True`` and ``oob_score=True``; no extra model is fitted.
+    """
+
+    name = "oob"
+
+    def _fold_scores(self, model, X: np.ndarray, y: np.ndarray) -> List[float]:
+        oob_prediction = getattr(model, 'oob_prediction_', None)
+        if oob_prediction is None:
+            raise ValueError("OOB validation requires a model fitted with oob_score=True")
+
+        # Samples that were in every bootstrap have no OOB prediction
+        valid = oob_mask(model, len(y))
+        return [mean_absolute_percentage_error(y[valid], oob_prediction[valid])]
+
+
+def _fit_and_score_fold(model, X: np.ndarray, y: np.ndarray, train_idx: np.ndarray, test_idx: np.ndarray) -> float:
+    """Fit a fresh clone on one walk-forward fold and return its MAPE."""
+    fold_model = clone(model)
+    fold_model.fit(X[train_idx], y[train_idx])
+    return mean_absolute_percentage_error(y[test_idx], fold_model.predict(X[test_idx]))
+
+
+class TimeSeriesValidation(ValidationStrategy):
+    """Walk-forward validation with folds fitted in parallel.
+
+    Every fold trains only on the past and scores on the following block.
+    The scaled matrix is shared by all workers (joblib memory-maps it).
+    """
+
+    name = "timeseries"
+
+    def __init__(self, n_splits: int = 5, n_jobs: int = -1):
+        self.n_splits = n_splits
+        self.n_jobs = n_jobs
+
+    def _fold_scores(self, model, X: np.ndarray, y: np.ndarray) -> List[float]:
+        fold_model = clone(model)
+        # Parallelism is across folds, so each fold fits single-threaded
+        if 'n_jobs' in fold_model.get_params():
+            fold_model.set_params(n_jobs=1)
+
+        splitter = TimeSeriesSplit(n_splits=self.n_splits)
+        return Parallel(n_jobs=self.n_jobs)(
+            delayed(_fit_and_score_fold)(fold_model, X, y, train_idx, test_idx)
+            for train_idx, test_idx in splitter.split(X)
+        )
+
+
+class KFoldValidation(ValidationStrategy):
+    """Legacy K-fold ``cross_val_score`` refits, now run with parallel folds."""
+
+    name = "kfold"
+
+    def __init__(self, n_splits: int = 5, n_jobs: int = -1):
+        self.n_splits = n_splits
+        self.n_jobs = n_jobs
+
+    def _fold_scores(self, model, X: np.ndarray, y: np.ndarray) -> List[float]:
+        scores = cross_val_score(
+            clone(model), X, y,
+            cv=self.n_splits,
+            scoring='neg_mean_absolute_percentage_error',
+            n_jobs=self.n_jobs
+        )
+        return list(-scores)
+
+
+VALIDATION_STRATEGIES = {
+    OOBValidation.name: OOBValidation,
+    TimeSeriesValidation.name: TimeSeriesValidation,
+    KFoldValidation.name: KFoldValidation
+}
+
+
+def get_validation_strategy(name: str = "oob", n_splits: int = 5, n_jobs: int = -1) -> ValidationStrategy:
+    """Build a validation strategy by name (``oob``, ``timeseries`` or ``kfold``)."""
+    if name not in VALIDATION_STRATEGIES:
+        raise ValueError(
+            f"Unknown validation strategy '{name}'. "
+            f"Available: {', '.join(VALIDATION_STRATEGIES)}"
+        )
+
+    strategy_class = VALIDATION_STRATEGIES[name]
+    if strategy_class is OOBValidation:
+        return strategy_class()
+    return strategy_class(n_splits=n_splits, n_jobs=n_jobs)
+
+
+def confidence_from_mape(mape: float) -> float:
+    """Map a validation MAPE to the [0.5, 0.95] confidence range."""
+    return max(0.5, min(0.95, 1 - abs(mape)))
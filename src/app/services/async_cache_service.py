@@ -0,0 +1,362 @@
+"""Asyncio cache service for the Steel Rebar Price Predictor API."""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+import redis.asyncio as aioredis
+from redis.asyncio import BlockingConnectionPool
+import logging
+
+from src.app.services.cache_service import (
+    CacheBase, CacheEntry, GENERATION_KEY, GENERATION_SCAN_PATTERN, INVALIDATION_CHANNEL,
+    PREDICTION_ENTRY, TRAINING_DATA_ENTRY
+)
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """Bounded connection pool that records how long callers waited for a connection."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.acquisitions = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+    
+    async def get_connection(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await super().get_connection(*args, **kwargs)
+        except aioredis.ConnectionError as e:
+            # Raised from a TimeoutError when no connection was freed within the pool timeout
+            if isinstance(e.__cause__, asyncio.TimeoutError):
+                self.timeouts += 1
+            raise
+        finally:
+            wait = time.perf_counter() - start
+            self.acquisitions += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+    
+    def get_stats(self) -> Dict:
+        in_use = len(self._in_use_connections)
+        return {
+            'max_connections': self.max_connections,
+            'in_use': in_use,
+            'idle': len(self._available_connections),
+            'utilization': in_use / self.max_connections if self.max_connections else None,
+            'acquisitions': self.acquisitions,
+            'timeouts': self.timeouts,
+            'avg_wait_ms': self.total_wait / self.acquisitions * 1000 if self.acquisitions else None,
+            'max_wait_ms': self.max_wait * 1000
+        }
+
+
+class AsyncCacheService(CacheBase):
+    """Non-blocking counterpart of ``CacheService`` for the async API handlers.
+    
+    Commands go through a ``BlockingConnectionPool`` of at most
+    ``max_connections``: callers wait up to ``pool_timeout`` seconds for a
+    free connection instead of opening new ones, and every command is bounded
+    by ``socket_timeout``. The invalidation subscriber holds one connection
+    of the pool for as long as the service is connected.
+    
+    The connection is checked on ``connect()`` (or the first call); when Redis
+    does not answer, the service falls back to the bounded in-memory cache
+    just like the sync client. L1, chunking and key layout are shared with it,
+    so both clients read each other's entries.
+    """
+    
+    def __init__(self, redis_url: str = "redis://localhost:6379", max_connections: int = 20,
+                 pool_timeout: float = 2.0, socket_timeout: float = 1.0, **options):
+        super().__init__(**options)
+        self.pool = InstrumentedConnectionPool.from_url(
+            redis_url,
+            max_connections=max_connections,
+            timeout=pool_timeout,
+            socket_timeout=socket_timeout,
+            socket_connect_timeout=socket_timeout
+        )
+        self._client = aioredis.Redis(connection_pool=self.pool)
+        self._connected = False
+        self._connect_lock = None
+        self._pubsub = None
+        self._listener = None
+        self._cleanup_task = None
+    
+    async def connect(self):
+        """Ping Redis once, then subscribe to invalidations or fall back to memory."""
+        if self._connected:
+            return
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._connected:
+                return
+            try:
+                await self._client.ping()
+                self.redis_client = self._client
+                logger.info("Connected to Redis cache")
+            except Exception as e:
+                logger.warning(f"Redis connection failed: {e}. Using in-memory cache.")
+                self._use_memory_fallback()
+            if self.redis_client is not None:
+                self._enable_l1()
+                await self._subscribe_invalidations()
+            self._connected = True
+    
+    async def close(self):
+        """Stop the listener and sweeper and release the pool's connections."""
+        if self.memory_cache is not None:
+            self.memory_cache.stop_sweeper()
+        for task in (self._listener, self._cleanup_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._listener = self._cleanup_task = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        await self._client.aclose()
+        # The client does not own a pool passed to it
+        await self.pool.disconnect()
+        self._connected = False
+    
+    async def _subscribe_invalidations(self):
+        try:
+            self._pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+            await self._pubsub.subscribe(**{INVALIDATION_CHANNEL: self._on_invalidation})
+            self._listener = asyncio.create_task(self._pubsub.run(poll_timeout=1.0))
+        except Exception as e:
+            # Without invalidations, L1 entries and the generation still refresh on their timers
+            logger.warning(f"Cache invalidation subscription failed: {e}")
+    
+    async def _publish_invalidation(self, cache_key: str, generation: Optional[int] = None):
+        try:
+            await self.redis_client.publish(INVALIDATION_CHANNEL, self._invalidation_message(cache_key, generation))
+        except Exception as e:
+            logger.warning(f"Error publishing cache invalidation: {e}")
+    
+    async def _ready(self):
+        """Connect on first use and make sure keys are built for the current generation."""
+        await self.connect()
+        if self._generation_stale():
+            self._set_generation(int(await self.redis_client.get(GENERATION_KEY) or 0))
+    
+    async def cleanup_old_generations(self) -> int:
+        """Delete keys of older generations with SCAN, a small batch at a time; returns the count."""
+        self.cleanup_stats['running'] = True
+        self.cleanup_stats['runs'] += 1
+        deleted, cursor = 0, 0
+        try:
+            while True:
+                cursor, keys = await self.redis_client.scan(cursor, match=GENERATION_SCAN_PATTERN,
+                                                            count=self.cleanup_batch_size)
+                self.cleanup_stats['scanned'] += len(keys)
+                old_keys = [key for key in keys if self._is_old_generation(key)]
+                if old_keys:
+                    deleted += await self.redis_client.unlink(*old_keys)
+                if not cursor:
+                    break
+                await asyncio.sleep(self.cleanup_pause)
+        finally:
+            self.cleanup_stats['deleted'] += deleted
+            self.cleanup_stats['running'] = False
+        return deleted
+    
+    async def _run_cleanup(self):
+        try:
+            await self.cleanup_old_generations()
+        except Exception as e:
+            logger.warning(f"Old cache generation cleanup failed: {e}")
+    
+    async def _join_chunks(self, chunk_keys: List[str]) -> Optional[bytes]:
+        chunks = await self.redis_client.mget(chunk_keys)
+        if any(chunk is None for chunk in chunks):
+            return None
+        return b"".join(chunks)
+    
+    async def _write_chunked(self, cache_key: str, payload: bytes, ttl: int):
+        old_chunks = self._manifest_chunks(await self.redis_client.get(cache_key))
+        chunks, manifest = self._chunk_plan(cache_key, payload)
+        
+        pipe = self.redis_client.pipeline(transaction=False)
+        for chunk_key, chunk in chunks:
+            pipe.setex(chunk_key, ttl, chunk)
+        pipe.setex(cache_key, ttl, manifest)
+        if old_chunks:
+            pipe.delete(*old_chunks)
+        await pipe.execute()
+    
+    async def fetch(self, entries: Iterable[CacheEntry] = (),
+                    increments: Optional[Dict[CacheEntry, int]] = None) -> Tuple[Dict[CacheEntry, Any], Dict[CacheEntry, int]]:
+        """Read ``entries`` and increment the ``{entry: window_ttl}`` counters in one round trip."""
+        entries, increments = list(entries), increments or {}
+        try:
+            await self.connect()
+            if not self.redis_client:
+                keys = {entry: self._get_cache_key(*entry) for entry in entries}
+                values = self.memory_cache.get_many(keys.values())
+                results = {entry: values[cache_key] for entry, cache_key in keys.items()}
+                counts = {entry: self.memory_cache.incr(self._get_cache_key(*entry), ttl)
+                          for entry, ttl in increments.items()}
+                return results, counts
+            
+            results, pending = self._prepare_reads(entries)
+            if not pending and not increments and not self._generation_stale():
+                return results, {}
+            
+            pipe = self.redis_client.pipeline(transaction=False)
+            check_generation = self._queue_fetch(pipe, pending, increments)
+            counts, chunked = self._finish_fetch(results, pending, increments, await pipe.execute(), check_generation)
+            for entry, cache_key, chunk_keys, ttl_ms in chunked:
+                results[entry] = self._accept_l2(entry, cache_key, await self._join_chunks(chunk_keys), ttl_ms)
+            return results, counts
+            
+        except Exception as e:
+            logger.error(f"Error reading cache entries: {e}")
+            return {entry: None for entry in entries}, {}
+    
+    async def get_many(self, entries: Iterable[CacheEntry]) -> Dict[CacheEntry, Any]:
+        """Read several entries in one round trip (None for misses)."""
+        return (await self.fetch(entries))[0]
+    
+    async def set_many(self, items: Dict[CacheEntry, Tuple[Any, int]]) -> bool:
+        """Write ``{entry: (value, ttl)}`` in one pipelined round trip (plus one per chunked value)."""
+        try:
+            await self._ready()
+            if not self.redis_client:
+                self.memory_cache.set_many({self._get_cache_key(*entry): item for entry, item in items.items()})
+                return True
+            
+            pipe = self.redis_client.pipeline(transaction=False)
+            large = self._queue_writes(pipe, items)
+            await pipe.execute()
+            for entry, cache_key, value, payload, ttl in large:
+                await self._write_chunked(cache_key, payload, ttl)
+                if self._keep_in_l1(entry, cache_key, value, ttl):
+                    await self._publish_invalidation(cache_key)
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error writing cache entries: {e}")
+            return False
+    
+    async def set_prediction(self, prediction_data: Dict, ttl: int = 3600) -> bool:
+        """Cache a prediction result."""
+        prediction_data['cached_at'] = datetime.now().isoformat()
+        if not await self.set_many({PREDICTION_ENTRY: (prediction_data, ttl)}):
+            return False
+        
+        logger.info(f"Prediction cached with TTL {ttl}s")
+        return True
+    
+    async def get_prediction(self) -> Optional[Dict]:
+        """Get cached prediction."""
+        return (await self.get_many([PREDICTION_ENTRY]))[PREDICTION_ENTRY]
+    
+    async def invalidate_prediction(self) -> bool:
+        """Drop the cached prediction, e.g. after the serving model changed."""
+        try:
+            await self._ready()
+            cache_key = self._get_cache_key(*PREDICTION_ENTRY)
+            
+            if self.redis_client:
+                await self.redis_client.delete(cache_key)
+                if self.l1 is not None:
+                    self.l1.delete(cache_key)
+                    await self._publish_invalidation(cache_key)
+            else:
+                self.memory_cache.delete(cache_key)
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error invalidating cached prediction: {e}")
+            return False
+    
+    async def set_training_data(self, data: pd.DataFrame, ttl: int = 86400) -> bool:
+        """Cache training data."""
+        if not await self.set_many({TRAINING_DATA_ENTRY: (data, ttl)}):
+            return False
+        
+        logger.info(f"Training data cached with TTL {ttl}s")
+        return True
+    
+    async def get_training_data(self) -> Optional[pd.DataFrame]:
+        """Get cached training data."""
+        return (await self.get_many([TRAINING_DATA_ENTRY]))[TRAINING_DATA_ENTRY]
+    
+    async def set_rate_limit(self, api_key: str, requests_count: int, ttl: int = 3600) -> bool:
+        """Set the request counter of an API key for a new window."""
+        return await self.set_many({("rate_limit", api_key): (requests_count, ttl)})
+    
+    async def get_rate_limit(self, api_key: str) -> Optional[Dict]:
+        """Get rate limit for API key."""
+        requests_count = (await self.get_many([("rate_limit", api_key)]))[("rate_limit", api_key)]
+        return {'requests': requests_count} if requests_count is not None else None
+    
+    async def increment_rate_limit(self, api_key: str, limit: int = 100, ttl: int = 3600) -> bool:
+        """Count a request for an API key (atomic INCR); False once the window's limit is exceeded."""
+        entry = ("rate_limit", api_key)
+        requests_count = (await self.fetch(increments={entry: ttl}))[1].get(entry)
+        if requests_count is None:
+            return False
+        if requests_count > limit:
+            logger.warning(f"Rate limit exceeded for API key: {api_key}")
+            return False
+        return True
+    
+    async def clear_cache(self) -> bool:
+        """Clear all cache entries."""
+        try:
+            await self.connect()
+            if self.redis_client:
+                # Every existing key becomes unreachable at once; reclaim them in the background
+                self._set_generation(await self.redis_client.incr(GENERATION_KEY))
+                await self._publish_invalidation('*', self.generation)
+                if self._cleanup_task is None or self._cleanup_task.done():
+                    self._cleanup_task = asyncio.create_task(self._run_cleanup())
+            else:
+                self.memory_cache.clear()
+            
+            logger.info("Cache cleared")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error clearing cache: {e}")
+            return False
+    
+    def get_pool_stats(self) -> Dict:
+        """Connection pool utilization and acquisition wait times."""
+        return self.pool.get_stats()
+    
+    async def get_cache_stats(self) -> Dict:
+        """Get cache statistics."""
+        try:
+            await self.connect()
+            stats = self._tier_stats()
+            stats['pool'] = self.get_pool_stats()
+            
+            if self.redis_client:
+                info = await self.redis_client.info()
+                stats.update({
+                    'redis_used_memory': info.get('used_memory_human'),
+                    'redis_connected_clients': info.get('connected_clients'),
+                    'redis_keyspace_hits': info.get('keyspace_hits'),
+                    'redis_keyspace_misses': info.get('keyspace_misses')
+                })
+            
+            return stats
+        
+        except Exception as e:
+            logger.error(f"Error getting cache stats: {e}")
+            return {'error': str(e)}
@@ -2,18 +2,312 @@
 
 import redis
 import json
-import pickle
-from datetime import datetime, timedelta
-from typing import Any, Optional, Dict
+import re
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import pandas as pd
 import logging
 
+from src.app.services.memory_cache import LRUCache
+from src.app.utils.frame_serializer import PYARROW_AVAILABLE, serialize_frame, deserialize_frame
+
 logger = logging.getLogger(__name__)
 
+# Pub/sub channel announcing written or deleted keys and new generations to the other workers
+INVALIDATION_CHANNEL = "steel_rebar:invalidations"
+# Values larger than the chunk size are stored as a manifest pointing at chunk keys
+CHUNK_MANIFEST_MAGIC = b"SRCHUNK1"
+# Every data key embeds the namespace generation; clearing the cache increments it
+GENERATION_KEY = "steel_rebar:generation"
+GENERATION_SCAN_PATTERN = "steel_rebar:g[0-9]*"
+GENERATION_KEY_RE = re.compile(rb"^steel_rebar:g(\d+):")
+# Counters must be shared exactly between workers, so they never go through L1
+L1_BYPASS_TYPES = ('rate_limit',)
+
+# A cache entry is addressed by (key type, identifier), e.g. ("prediction", "latest")
+CacheEntry = Tuple[str, str]
+PREDICTION_ENTRY = ("prediction", "latest")
+TRAINING_DATA_ENTRY = ("training_data", "latest")
 
-class CacheService:
-    """Service for caching predictions and data."""
+
+class CacheBase:
+    """State and Redis-independent logic shared by the sync and async cache services.
+    
+    Subclasses own the I/O: they call ``_enable_l1`` once Redis answered and
+    ``_use_memory_fallback`` when it did not.
+    
+    Keys live under a namespace generation (``steel_rebar:g<N>:...``), so
+    clearing the cache is one INCR instead of a keyspace walk. Clients learn a
+    new generation from the invalidation channel and re-read it at least every
+    ``generation_refresh`` seconds; keys of older generations are unreachable
+    and are deleted by an incremental SCAN in small batches (they would also
+    expire on their own TTLs).
+    """
+    
+    def __init__(self, l1_max_entries: int = 128, l1_ttl: float = 60.0,
+                 chunk_size: int = 1024 * 1024, frame_compression: Optional[str] = "zstd",
+                 memory_max_entries: int = 1024, memory_max_bytes: int = 256 * 1024 * 1024,
+                 memory_policy: str = 'lru', sweep_interval: float = 60.0,
+                 generation_refresh: float = 5.0, cleanup_batch_size: int = 100,
+                 cleanup_pause: float = 0.01):
+        self.instance_id = uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self.frame_compression = frame_compression
+        if frame_compression and not PYARROW_AVAILABLE:
+            logger.info(f"pyarrow is not installed: training frames use zlib instead of {frame_compression}")
+        self.redis_client = None
+        self.l1 = None
+        self.memory_cache = None
+        self.stats = {'l1_hits': 0, 'l1_misses': 0, 'l2_hits': 0, 'l2_misses': 0}
+        self.generation = 0
+        self.generation_refresh = generation_refresh
+        self.cleanup_batch_size = cleanup_batch_size
+        self.cleanup_pause = cleanup_pause
+        self.cleanup_stats = {'runs': 0, 'scanned': 0, 'deleted': 0, 'running': False}
+        self._generation_checked_at = None
+        self._l1_settings = (l1_max_entries, l1_ttl)
+        self._memory_settings = (memory_max_entries, memory_max_bytes, memory_policy, sweep_interval)
+    
+    def _enable_l1(self) -> bool:
+        l1_max_entries, l1_ttl = self._l1_settings
+        if l1_max_entries > 0 and l1_ttl > 0:
+            self.l1 = LRUCache(l1_max_entries, l1_ttl)
+        return self.l1 is not None
+    
+    def _use_memory_fallback(self):
+        memory_max_entries, memory_max_bytes, memory_policy, sweep_interval = self._memory_settings
+        self.redis_client = None
+        # TTLs are not capped below the longest one callers use (a day of training data)
+        self.memory_cache = LRUCache(memory_max_entries, default_ttl=86400,
+                                     max_bytes=memory_max_bytes, policy=memory_policy)
+        self.memory_cache.start_sweeper(sweep_interval)
+    
+    def _on_invalidation(self, message: Dict):
+        """Adopt a new generation, or drop a key another worker changed from L1."""
+        try:
+            event = json.loads(message['data'])
+        except (TypeError, ValueError, KeyError):
+            return
+        if event.get('origin') == self.instance_id:
+            return
+        if event.get('generation') is not None:
+            self._set_generation(int(event['generation']))
+        elif self.l1 is not None:
+            self.l1.delete(event.get('key'))
+    
+    def _invalidation_message(self, cache_key: str, generation: Optional[int] = None) -> str:
+        event = {'key': cache_key, 'origin': self.instance_id}
+        if generation is not None:
+            event['generation'] = generation
+        return json.dumps(event)
+    
+    def _generation_stale(self) -> bool:
+        return self.redis_client is not None and (
+            self._generation_checked_at is None
+            or time.monotonic() - self._generation_checked_at >= self.generation_refresh)
+    
+    def _set_generation(self, generation: int):
+        """Switch to ``generation`` if it is newer; L1 copies of the old one become unreachable."""
+        self._generation_checked_at = time.monotonic()
+        if generation > self.generation:
+            self.generation = generation
+            if self.l1 is not None:
+                self.l1.clear()
+    
+    def _is_old_generation(self, key: bytes) -> bool:
+        match = GENERATION_KEY_RE.match(key)
+        return match is not None and int(match.group(1)) < self.generation
+    
+    def _get_cache_key(self, key_type: str, identifier: str = "") -> str:
+        """Generate cache key."""
+        return f"steel_rebar:g{self.generation}:{key_type}:{identifier}"
+    
+    def _l1_get(self, cache_key: str) -> Optional[Any]:
+        if self.l1 is None:
+            return None
+        value = self.l1.get(cache_key)
+        self.stats['l1_hits' if value is not None else 'l1_misses'] += 1
+        return value
+    
+    def _codec(self, key_type: str) -> Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]:
+        if key_type == TRAINING_DATA_ENTRY[0]:
+            return self._encode_training_data, deserialize_frame
+        return json.dumps, json.loads
+    
+    def _prepare_reads(self, entries: Iterable[CacheEntry]) -> Tuple[Dict[CacheEntry, Any], List[Tuple[CacheEntry, str]]]:
+        """Answer what L1 can; returns the hits and the (entry, key) pairs left for Redis."""
+        results, pending = {}, []
+        for entry in entries:
+            cache_key = self._get_cache_key(*entry)
+            value = None if entry[0] in L1_BYPASS_TYPES else self._l1_get(cache_key)
+            if value is not None:
+                results[entry] = value
+            else:
+                pending.append((entry, cache_key))
+        return results, pending
+    
+    def _queue_fetch(self, pipe, pending: List[Tuple[CacheEntry, str]],
+                     increments: Dict[CacheEntry, int]) -> bool:
+        """Queue reads (value and remaining TTL), counter increments and, when due, the generation."""
+        check_generation = self._generation_stale()
+        if check_generation:
+            pipe.get(GENERATION_KEY)
+        for _, cache_key in pending:
+            pipe.get(cache_key)
+            pipe.pttl(cache_key)
+        for entry, ttl in increments.items():
+            # The window starts with the first increment and is not extended by later ones
+            cache_key = self._get_cache_key(*entry)
+            pipe.set(cache_key, 0, ex=ttl, nx=True)
+            pipe.incr(cache_key)
+        return check_generation
     
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    def _finish_fetch(self, results: Dict[CacheEntry, Any], pending: List[Tuple[CacheEntry, str]],
+                      increments: Dict[CacheEntry, int], replies: List[Any], check_generation: bool):
+        """Decode pipeline replies into ``results``; returns the counts and the chunked entries left to join."""
+        replies = list(replies)
+        generation_changed = False
+        if check_generation:
+            generation = int(replies.pop(0) or 0)
+            generation_changed = generation > self.generation
+            self._set_generation(generation)
+            if generation_changed:
+                # Keys of a superseded generation were cleared, including what L1 just answered
+                results.update({entry: None for entry in results})
+        
+        chunked = []
+        for i, (entry, cache_key) in enumerate(pending):
+            cached_data = None if generation_changed else replies[2 * i]
+            ttl_ms = replies[2 * i + 1]
+            chunk_keys = self._manifest_chunks(cached_data)
+            if chunk_keys is not None:
+                chunked.append((entry, cache_key, chunk_keys, ttl_ms))
+            else:
+                results[entry] = self._accept_l2(entry, cache_key, cached_data, ttl_ms)
+        
+        offset = 2 * len(pending)
+        counts = {entry: int(replies[offset + 2 * j + 1]) for j, entry in enumerate(increments)}
+        return counts, chunked
+    
+    def _accept_l2(self, entry: CacheEntry, cache_key: str, cached_data: Optional[bytes],
+                   ttl_ms: Optional[int]) -> Optional[Any]:
+        """Decode a value read from Redis and keep it in L1 for the rest of its TTL."""
+        if not cached_data:
+            self.stats['l2_misses'] += 1
+            return None
+        
+        try:
+            value = self._codec(entry[0])[1](cached_data)
+        except Exception as e:
+            # e.g. payloads in a format this version no longer reads (legacy pickles)
+            logger.warning(f"Ignoring undecodable cache entry {cache_key}: {e}")
+            self.stats['l2_misses'] += 1
+            return None
+        self.stats['l2_hits'] += 1
+        if self.l1 is not None and entry[0] not in L1_BYPASS_TYPES and ttl_ms and ttl_ms > 0:
+            self.l1.set(cache_key, value, ttl_ms / 1000)
+        return value
+    
+    def _queue_writes(self, pipe, items: Dict[CacheEntry, Tuple[Any, int]]) -> List[Tuple[CacheEntry, str, Any, bytes, int]]:
+        """Queue SETEX (and invalidations) for every item; returns the ones too large for one value."""
+        large = []
+        for entry, (value, ttl) in items.items():
+            cache_key = self._get_cache_key(*entry)
+            payload = self._codec(entry[0])[0](value)
+            if len(payload) > self.chunk_size:
+                large.append((entry, cache_key, value, payload, ttl))
+                continue
+            pipe.setex(cache_key, ttl, payload)
+            if self._keep_in_l1(entry, cache_key, value, ttl):
+                pipe.publish(INVALIDATION_CHANNEL, self._invalidation_message(cache_key))
+        return large
+    
+    def _keep_in_l1(self, entry: CacheEntry, cache_key: str, value: Any, ttl: int) -> bool:
+        """Store a written value in L1; True if other workers must drop their copy."""
+        if self.l1 is None or entry[0] in L1_BYPASS_TYPES:
+            return False
+        self.l1.set(cache_key, value, ttl)
+        return True
+    
+    @staticmethod
+    def _manifest_chunks(cached_data: Optional[bytes]) -> Optional[List[str]]:
+        """Chunk keys named by a manifest, or None for a plain value."""
+        if not cached_data or not cached_data.startswith(CHUNK_MANIFEST_MAGIC):
+            return None
+        return json.loads(cached_data[len(CHUNK_MANIFEST_MAGIC):])['chunks']
+    
+    def _chunk_plan(self, cache_key: str, payload: bytes) -> Tuple[List[Tuple[str, bytes]], bytes]:
+        """Split a payload into chunks under a fresh write id, plus the manifest naming them."""
+        write_id = uuid.uuid4().hex[:12]
+        chunks = [(f"{cache_key}:chunk:{write_id}:{i}", payload[start:start + self.chunk_size])
+                  for i, start in enumerate(range(0, len(payload), self.chunk_size))]
+        manifest = {'chunks': [chunk_key for chunk_key, _ in chunks], 'nbytes': len(payload)}
+        return chunks, CHUNK_MANIFEST_MAGIC + json.dumps(manifest).encode()
+    
+    def _encode_training_data(self, data: pd.DataFrame) -> bytes:
+        if not isinstance(data, pd.DataFrame):
+            raise TypeError(f"training data must be a DataFrame, got {type(data).__name__}")
+        return serialize_frame(data, compression=self.frame_compression)
+    
+    def _tier_stats(self) -> Dict:
+        stats = {
+            'redis_connected': self.redis_client is not None,
+            'memory_cache_size': len(self.memory_cache) if self.memory_cache is not None else 0
+        }
+        if self.memory_cache is not None:
+            stats['memory_cache'] = self.memory_cache.get_stats()
+        
+        # L1 hit rate is over all reads, L2 hit rate over the reads that reached Redis
+        l1_reads = self.stats['l1_hits'] + self.stats['l1_misses']
+        l2_reads = self.stats['l2_hits'] + self.stats['l2_misses']
+        stats['l1'] = {
+            'enabled': self.l1 is not None,
+            'size': len(self.l1) if self.l1 is not None else 0,
+            'hits': self.stats['l1_hits'],
+            'misses': self.stats['l1_misses'],
+            'hit_rate': self.stats['l1_hits'] / l1_reads if l1_reads else None
+        }
+        stats['l2'] = {
+            'hits': self.stats['l2_hits'],
+            'misses': self.stats['l2_misses'],
+            'hit_rate': self.stats['l2_hits'] / l2_reads if l2_reads else None
+        }
+        stats['generation'] = self.generation
+        stats['generation_cleanup'] = dict(self.cleanup_stats)
+        return stats
+
+
+class CacheService(CacheBase):
+    """Service for caching predictions and data.
+    
+    When Redis is available, predictions and training data are read through
+    an in-process L1 LRU (per-key TTL, bounded size) before Redis (L2).
+    Writes and deletes are published on a Redis channel so every worker
+    drops its stale L1 copy. Rate-limit counters always go to Redis, since
+    they must be shared exactly between workers.
+    
+    Without Redis everything lives in a bounded in-process cache (entry count
+    and estimated bytes, LRU or LFU eviction) whose expired keys are swept
+    in the background, so the fallback cannot grow without limit.
+    
+    Training frames are stored in a columnar format (Arrow IPC when pyarrow
+    is installed) rather than pickled, and split into ``chunk_size`` pieces
+    when they are larger than that.
+    
+    ``fetch``/``get_many``/``set_many`` batch several entries, each with its
+    own TTL, into one pipelined round trip; rate limits are INCR counters so
+    a request's limit check and cache reads share that round trip.
+    
+    This client blocks on every Redis call; the API uses ``AsyncCacheService``.
+    """
+    
+    def __init__(self, redis_url: str = "redis://localhost:6379", **options):
+        super().__init__(**options)
+        self._pubsub_thread = None
+        self._cleanup_thread = None
         try:
             self.redis_client = redis.from_url(redis_url, decode_responses=False)
             # Test connection
@@ -21,191 +315,228 @@ class CacheService:
             logger.info("Connected to Redis cache")
         except Exception as e:
             logger.warning(f"Redis connection failed: {e}. Using in-memory cache.")
-            self.redis_client = None
-            self.memory_cache = {}
+            self._use_memory_fallback()
+        
+        if self.redis_client:
+            self._enable_l1()
+            self._subscribe_invalidations()
     
-    def _get_cache_key(self, key_type: str, identifier: str = "") -> str:
-        """Generate cache key."""
-        return f"steel_rebar:{key_type}:{identifier}"
+    def close(self):
+        """Stop the background sweeper and the invalidation listener."""
+        if self.memory_cache is not None:
+            self.memory_cache.stop_sweeper()
+        if self._pubsub_thread is not None:
+            self._pubsub_thread.stop()
+            self._pubsub_thread = None
     
-    def set_prediction(self, prediction_data: Dict, ttl: int = 3600) -> bool:
-        """Cache a prediction result."""
+    def _subscribe_invalidations(self):
         try:
-            cache_key = self._get_cache_key("prediction", "latest")
-            
-            # Add timestamp
-            prediction_data['cached_at'] = datetime.now().isoformat()
-            
-            if self.redis_client:
-                self.redis_client.setex(
-                    cache_key, 
-                    ttl, 
-                    json.dumps(prediction_data)
-                )
-            else:
-                self.memory_cache[cache_key] = {
-                    'data': prediction_data,
-                    'expires_at': datetime.now() + timedelta(seconds=ttl)
-                }
-            
-            logger.info(f"Prediction cached with TTL {ttl}s")
-            return True
-            
+            pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{INVALIDATION_CHANNEL: self._on_invalidation})
+            self._pubsub_thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
         except Exception as e:
-            logger.error(f"Error caching prediction: {e}")
-            return False
+            # Without invalidations, L1 entries and the generation still refresh on their timers
+            logger.warning(f"Cache invalidation subscription failed: {e}")
     
-    def get_prediction(self) -> Optional[Dict]:
-        """Get cached prediction."""
+    def _publish_invalidation(self, cache_key: str, generation: Optional[int] = None):
         try:
-            cache_key = self._get_cache_key("prediction", "latest")
-            
-            if self.redis_client:
-                cached_data = self.redis_client.get(cache_key)
-                if cached_data:
-                    return json.loads(cached_data)
-            else:
-                if cache_key in self.memory_cache:
-                    cache_entry = self.memory_cache[cache_key]
-                    if datetime.now() < cache_entry['expires_at']:
-                        return cache_entry['data']
-                    else:
-                        del self.memory_cache[cache_key]
-            
-            return None
-            
+            self.redis_client.publish(INVALIDATION_CHANNEL, self._invalidation_message(cache_key, generation))
         except Exception as e:
-            logger.error(f"Error getting cached prediction: {e}")
+            logger.warning(f"Error publishing cache invalidation: {e}")
+    
+    def _refresh_generation(self):
+        if self._generation_stale():
+            self._set_generation(int(self.redis_client.get(GENERATION_KEY) or 0))
+    
+    def cleanup_old_generations(self) -> int:
+        """Delete keys of older generations with SCAN, a small batch at a time; returns the count."""
+        self.cleanup_stats['running'] = True
+        self.cleanup_stats['runs'] += 1
+        deleted, cursor = 0, 0
+        try:
+            while True:
+                cursor, keys = self.redis_client.scan(cursor, match=GENERATION_SCAN_PATTERN,
+                                                      count=self.cleanup_batch_size)
+                self.cleanup_stats['scanned'] += len(keys)
+                old_keys = [key for key in keys if self._is_old_generation(key)]
+                if old_keys:
+                    deleted += self.redis_client.unlink(*old_keys)
+                if not cursor:
+                    break
+                time.sleep(self.cleanup_pause)
+        finally:
+            self.cleanup_stats['deleted'] += deleted
+            self.cleanup_stats['running'] = False
+        return deleted
+    
+    def _start_cleanup(self):
+        if self._cleanup_thread is not None and self._cleanup_thread.is_alive():
+            return
+        
+        def run():
+            try:
+                self.cleanup_old_generations()
+            except Exception as e:
+                logger.warning(f"Old cache generation cleanup failed: {e}")
+        
+        self._cleanup_thread = threading.Thread(target=run, name="cache-generation-cleanup", daemon=True)
+        self._cleanup_thread.start()
+    
+    def _join_chunks(self, chunk_keys: List[str]) -> Optional[bytes]:
+        """Fetch every chunk of a manifest in one MGET; None if any expired."""
+        chunks = self.redis_client.mget(chunk_keys)
+        if any(chunk is None for chunk in chunks):
             return None
+        return b"".join(chunks)
     
-    def set_training_data(self, data: Any, ttl: int = 86400) -> bool:
-        """Cache training data."""
+    def _write_chunked(self, cache_key: str, payload: bytes, ttl: int):
+        """Store the chunks, then swap the manifest and drop the previous chunks.
+        
+        Readers see either the old or the new manifest, and every chunk a
+        manifest names was written before it.
+        """
+        old_chunks = self._manifest_chunks(self.redis_client.get(cache_key))
+        chunks, manifest = self._chunk_plan(cache_key, payload)
+        
+        pipe = self.redis_client.pipeline(transaction=False)
+        for chunk_key, chunk in chunks:
+            pipe.setex(chunk_key, ttl, chunk)
+        pipe.setex(cache_key, ttl, manifest)
+        if old_chunks:
+            pipe.delete(*old_chunks)
+        pipe.execute()
+    
+    def fetch(self, entries: Iterable[CacheEntry] = (),
+              increments: Optional[Dict[CacheEntry, int]] = None) -> Tuple[Dict[CacheEntry, Any], Dict[CacheEntry, int]]:
+        """Read ``entries`` and increment the ``{entry: window_ttl}`` counters in one round trip.
+        
+        Returns the values (None for misses) and the counts after incrementing.
+        L1 hits do not reach Redis; only chunked values need a second trip.
+        """
+        entries, increments = list(entries), increments or {}
         try:
-            cache_key = self._get_cache_key("training_data", "latest")
+            if not self.redis_client:
+                keys = {entry: self._get_cache_key(*entry) for entry in entries}
+                values = self.memory_cache.get_many(keys.values())
+                results = {entry: values[cache_key] for entry, cache_key in keys.items()}
+                counts = {entry: self.memory_cache.incr(self._get_cache_key(*entry), ttl)
+                          for entry, ttl in increments.items()}
+                return results, counts
             
-            if self.redis_client:
-                self.redis_client.setex(
-                    cache_key,
-                    ttl,
-                    pickle.dumps(data)
-                )
-            else:
-                self.memory_cache[cache_key] = {
-                    'data': data,
-                    'expires_at': datetime.now() + timedelta(seconds=ttl)
-                }
+            results, pending = self._prepare_reads(entries)
+            if not pending and not increments and not self._generation_stale():
+                return results, {}
             
-            logger.info(f"Training data cached with TTL {ttl}s")
-            return True
+            pipe = self.redis_client.pipeline(transaction=False)
+            check_generation = self._queue_fetch(pipe, pending, increments)
+            counts, chunked = self._finish_fetch(results, pending, increments, pipe.execute(), check_generation)
+            for entry, cache_key, chunk_keys, ttl_ms in chunked:
+                results[entry] = self._accept_l2(entry, cache_key, self._join_chunks(chunk_keys), ttl_ms)
+            return results, counts
             
         except Exception as e:
-            logger.error(f"Error caching training data: {e}")
-            return False
+            logger.error(f"Error reading cache entries: {e}")
+            return {entry: None for entry in entries}, {}
     
-    def get_training_data(self) -> Optional[Any]:
-        """Get cached training data."""
+    def get_many(self, entries: Iterable[CacheEntry]) -> Dict[CacheEntry, Any]:
+        """Read several entries in one round trip (None for misses)."""
+        return self.fetch(entries)[0]
+    
+    def set_many(self, items: Dict[CacheEntry, Tuple[Any, int]]) -> bool:
+        """Write ``{entry: (value, ttl)}`` in one pipelined round trip (plus one per chunked value)."""
         try:
-            cache_key = self._get_cache_key("training_data", "latest")
+            self._refresh_generation()
+            if not self.redis_client:
+                self.memory_cache.set_many({self._get_cache_key(*entry): item for entry, item in items.items()})
+                return True
             
-            if self.redis_client:
-                cached_data = self.redis_client.get(cache_key)
-                if cached_data:
-                    return pickle.loads(cached_data)
-            else:
-                if cache_key in self.memory_cache:
-                    cache_entry = self.memory_cache[cache_key]
-                    if datetime.now() < cache_entry['expires_at']:
-                        return cache_entry['data']
-                    else:
-                        del self.memory_cache[cache_key]
-            
-            return None
+            pipe = self.redis_client.pipeline(transaction=False)
+            large = self._queue_writes(pipe, items)
+            pipe.execute()
+            for entry, cache_key, value, payload, ttl in large:
+                self._write_chunked(cache_key, payload, ttl)
+                if self._keep_in_l1(entry, cache_key, value, ttl):
+                    self._publish_invalidation(cache_key)
+            return True
             
         except Exception as e:
-            logger.error(f"Error getting cached training data: {e}")
-            return None
+            logger.error(f"Error writing cache entries: {e}")
+            return False
     
-    def set_rate_limit(self, api_key: str, requests_count: int, ttl: int = 3600) -> bool:
-        """Set rate limit for API key."""
+    def set_prediction(self, prediction_data: Dict, ttl: int = 3600) -> bool:
+        """Cache a prediction result."""
+        # Add timestamp
+        prediction_data['cached_at'] = datetime.now().isoformat()
+        if not self.set_many({PREDICTION_ENTRY: (prediction_data, ttl)}):
+            return False
+        
+        logger.info(f"Prediction cached with TTL {ttl}s")
+        return True
+    
+    def get_prediction(self) -> Optional[Dict]:
+        """Get cached prediction."""
+        return self.get_many([PREDICTION_ENTRY])[PREDICTION_ENTRY]
+    
+    def invalidate_prediction(self) -> bool:
+        """Drop the cached prediction, e.g. after the serving model changed."""
         try:
-            cache_key = self._get_cache_key("rate_limit", api_key)
-            
-            rate_data = {
-                'requests': requests_count,
-                'window_start': datetime.now().isoformat()
-            }
+            self._refresh_generation()
+            cache_key = self._get_cache_key(*PREDICTION_ENTRY)
             
             if self.redis_client:
-                self.redis_client.setex(
-                    cache_key,
-                    ttl,
-                    json.dumps(rate_data)
-                )
+                self.redis_client.delete(cache_key)
+                if self.l1 is not None:
+                    self.l1.delete(cache_key)
+                    self._publish_invalidation(cache_key)
             else:
-                self.memory_cache[cache_key] = {
-                    'data': rate_data,
-                    'expires_at': datetime.now() + timedelta(seconds=ttl)
-                }
+                self.memory_cache.delete(cache_key)
             
             return True
             
         except Exception as e:
-            logger.error(f"Error setting rate limit: {e}")
+            logger.error(f"Error invalidating cached prediction: {e}")
+            return False
+    
+    def set_training_data(self, data: pd.DataFrame, ttl: int = 86400) -> bool:
+        """Cache training data."""
+        if not self.set_many({TRAINING_DATA_ENTRY: (data, ttl)}):
             return False
+        
+        logger.info(f"Training data cached with TTL {ttl}s")
+        return True
+    
+    def get_training_data(self) -> Optional[pd.DataFrame]:
+        """Get cached training data."""
+        return self.get_many([TRAINING_DATA_ENTRY])[TRAINING_DATA_ENTRY]
+    
+    def set_rate_limit(self, api_key: str, requests_count: int, ttl: int = 3600) -> bool:
+        """Set the request counter of an API key for a new window."""
+        return self.set_many({("rate_limit", api_key): (requests_count, ttl)})
     
     def get_rate_limit(self, api_key: str) -> Optional[Dict]:
         """Get rate limit for API key."""
-        try:
-            cache_key = self._get_cache_key("rate_limit", api_key)
-            
-            if self.redis_client:
-                cached_data = self.redis_client.get(cache_key)
-                if cached_data:
-                    return json.loads(cached_data)
-            else:
-                if cache_key in self.memory_cache:
-                    cache_entry = self.memory_cache[cache_key]
-                    if datetime.now() < cache_entry['expires_at']:
-                        return cache_entry['data']
-                    else:
-                        del self.memory_cache[cache_key]
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error getting rate limit: {e}")
-            return None
+        requests_count = self.get_many([("rate_limit", api_key)])[("rate_limit", api_key)]
+        return {'requests': requests_count} if requests_count is not None else None
     
     def increment_rate_limit(self, api_key: str, limit: int = 100, ttl: int = 3600) -> bool:
-        """Increment rate limit counter for API key."""
-        try:
-            rate_data = self.get_rate_limit(api_key)
-            
-            if rate_data is None:
-                # First request in the window
-                return self.set_rate_limit(api_key, 1, ttl)
-            
-            current_requests = rate_data.get('requests', 0)
-            
-            if current_requests >= limit:
-                logger.warning(f"Rate limit exceeded for API key: {api_key}")
-                return False
-            
-            # Increment counter
-            return self.set_rate_limit(api_key, current_requests + 1, ttl)
-            
-        except Exception as e:
-            logger.error(f"Error incrementing rate limit: {e}")
+        """Count a request for an API key (atomic INCR); False once the window's limit is exceeded."""
+        entry = ("rate_limit", api_key)
+        requests_count = self.fetch(increments={entry: ttl})[1].get(entry)
+        if requests_count is None:
+            return False
+        if requests_count > limit:
+            logger.warning(f"Rate limit exceeded for API key: {api_key}")
             return False
+        return True
     
     def clear_cache(self) -> bool:
         """Clear all cache entries."""
         try:
             if self.redis_client:
-                # Delete all keys with our prefix
-                keys = self.redis_client.keys("steel_rebar:*")
-                if keys:
-                    self.redis_client.delete(*keys)
+                # Every existing key becomes unreachable at once; reclaim them in the background
+                self._set_generation(self.redis_client.incr(GENERATION_KEY))
+                self._publish_invalidation('*', self.generation)
+                self._start_cleanup()
             else:
                 self.memory_cache.clear()
             
@@ -219,10 +550,7 @@ class CacheService:
     def get_cache_stats(self) -> Dict:
         """Get cache statistics."""
         try:
-            stats = {
-                'redis_connected': self.redis_client is not None,
-                'memory_cache_size': len(self.memory_cache) if not self.redis_client else 0
-            }
+            stats = self._tier_stats()
             
             if self.redis_client:
                 info = self.redis_client.info()
@@ -0,0 +1,81 @@
+"""Disk snapshot of the hot cache entries, used to warm up new instances."""
+
+import json
+import os
+import struct
+import time
+import zlib
+from typing import Dict, Optional
+
+import pandas as pd
+import logging
+
+from src.app.utils.frame_serializer import serialize_frame, deserialize_frame
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"SRS1"
+
+
+def write_snapshot(path: str, prediction: Optional[Dict], training_data: Optional[pd.DataFrame],
+                   model_metadata: Dict, training_data_cached_at: Optional[str] = None) -> int:
+    """Atomically write the latest prediction, training window and model metadata; returns the size.
+
+    Layout: magic, 4-byte header length, zlib-compressed JSON header, then
+    the training frame in the columnar cache format (empty when there is none).
+    ``training_data_cached_at`` is when the window was cached (ISO format), so
+    a restore can give it the rest of its own TTL rather than a fresh one.
+    """
+    frame_payload = serialize_frame(training_data) if training_data is not None else b""
+    header = zlib.compress(json.dumps({
+        'created_at': time.time(),
+        'model': model_metadata,
+        'prediction': prediction,
+        'training_data_cached_at': training_data_cached_at,
+        'training_data_nbytes': len(frame_payload)
+    }, default=str).encode())
+    payload = SNAPSHOT_MAGIC + struct.pack("<I", len(header)) + header + frame_payload
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return len(payload)
+
+
+def read_snapshot(path: str, max_age: float) -> Optional[Dict]:
+    """Load a snapshot no older than ``max_age`` seconds, or None if missing, stale or unreadable.
+
+    The result has ``age`` (seconds), ``model``, ``prediction``, ``training_data``
+    and ``training_data_cached_at``.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            payload = f.read()
+        if payload[:4] != SNAPSHOT_MAGIC:
+            raise ValueError("not a cache snapshot")
+        (header_size,) = struct.unpack("<I", payload[4:8])
+        header = json.loads(zlib.decompress(payload[8:8 + header_size]))
+        age = time.time() - header['created_at']
+        if age > max_age:
+            logger.info(f"Ignoring cache snapshot {path}: {age:.0f}s old (max {max_age}s)")
+            return None
+
+        frame_payload = payload[8 + header_size:]
+        if len(frame_payload) != header['training_data_nbytes']:
+            raise ValueError("truncated training data")
+        return {
+            'age': age,
+            'model': header['model'],
+            'prediction': header['prediction'],
+            'training_data': deserialize_frame(frame_payload) if frame_payload else None,
+            'training_data_cached_at': header.get('training_data_cached_at')
+        }
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable cache snapshot {path}: {e}")
+        return None
@@ -4,7 +4,7 @@ import yfinance as yf
 import pandas as pd
 import requests
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 import logging
 import time
 
@@ -242,8 +242,13 @@ class DataCollector:
         logger.info(f"USD/MXN data: {len(data)} records")
         return data
     
-    def get_all_economic_data(self) -> Dict[str, pd.DataFrame]:
-        """Get all economic data needed for the model."""
+    def get_all_economic_data(self, sources: Optional[Iterable[str]] = None) -> Dict[str, pd.DataFrame]:
+        """Get all economic data needed for the model.
+        
+        ``sources`` limits collection to the listed secondary sources
+        (``iron_ore``, ``coal``, ``usd_mxn``); steel rebar prices are always
+        collected. None collects everything.
+        """
         
         logger.info("Collecting all economic data...")
         
@@ -254,20 +259,22 @@ class DataCollector:
         if not steel_data.empty:
             data['steel_rebar'] = steel_data
         
-        # Iron ore data
-        iron_data = self.get_iron_ore_data()
-        if not iron_data.empty:
-            data['iron_ore'] = iron_data
-        
-        # Coal data
-        coal_data = self.get_coal_data()
-        if not coal_data.empty:
-            data['coal'] = coal_data
-        
-        # USD/MXN rate
-        currency_data = self.get_usd_mxn_rate()
-        if not currency_data.empty:
-            data['usd_mxn'] = currency_data
+        collectors = {
+            'iron_ore': self.get_iron_ore_data,
+            'coal': self.get_coal_data,
+            'usd_mxn': self.get_usd_mxn_rate
+        }
+        wanted = set(collectors) if sources is None else set(sources)
+        skipped = sorted(set(collectors) - wanted)
+        if skipped:
+            logger.info(f"Skipping sources not used by the model: {', '.join(skipped)}")
+        
+        for source, collect in collectors.items():
+            if source not in wanted:
+                continue
+            source_data = collect()
+            if not source_data.empty:
+                data[source] = source_data
         
         logger.info(f"Collected data from {len(data)} sources")
         return data
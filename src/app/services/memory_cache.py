@@ -0,0 +1,194 @@
+"""In-process cache with per-key TTL, entry and byte bounds, and LRU/LFU eviction."""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+EVICTION_POLICIES = ('lru', 'lfu')
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate bytes held by a cached value (frames and arrays by their buffers)."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray, str)):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Thread-safe cache whose entries expire after their own TTL.
+
+    Size is bounded by ``max_entries`` and, optionally, by ``max_bytes`` of
+    estimated value size; when either is exceeded the least recently used
+    (``policy='lru'``) or least frequently used (``policy='lfu'``, ties broken
+    by recency) entries are evicted. Expired entries are dropped when read and
+    by ``sweep``, which ``start_sweeper`` runs periodically in a daemon thread.
+
+    Used as the L1 tier in front of Redis, where values are kept deserialized
+    so a hit is a dict lookup with no network hop and no decoding, and as the
+    whole cache when Redis is unavailable.
+    """
+
+    def __init__(self, max_entries: int = 128, default_ttl: float = 60.0,
+                 max_bytes: Optional[int] = None, policy: str = 'lru'):
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {policy}")
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self._entries = OrderedDict()  # key -> (value, expires_at, size)
+        self._frequency = {}
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._sweeper = None
+        self._stop_sweeper = threading.Event()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'rejected': 0}
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            value, expires_at, _ = entry
+            if time.monotonic() >= expires_at:
+                self._remove(key)
+                self.stats['expirations'] += 1
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._frequency[key] += 1
+            self.stats['hits'] += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a value for ``ttl`` seconds, capped at ``default_ttl``."""
+        ttl = self.default_ttl if ttl is None else min(ttl, self.default_ttl)
+        if ttl <= 0:
+            self.delete(key)
+            return
+        size = estimate_size(value) if self.max_bytes is not None else 0
+        with self._lock:
+            self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                # Caching it would flush everything else and still not fit
+                self.stats['rejected'] += 1
+                return
+            self._entries[key] = (value, time.monotonic() + ttl, size)
+            self._frequency[key] = 1
+            self._bytes += size
+            self._evict(protect=key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[Any]]:
+        with self._lock:
+            return {key: self.get(key) for key in keys}
+
+    def set_many(self, items: Dict[str, Tuple[Any, Optional[float]]]):
+        """Store ``{key: (value, ttl)}`` under one lock acquisition."""
+        with self._lock:
+            for key, (value, ttl) in items.items():
+                self.set(key, value, ttl)
+
+    def incr(self, key: str, ttl: Optional[float] = None) -> int:
+        """Increment a counter; a new counter starts at 1 and expires ``ttl`` seconds later."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() >= entry[1]:
+                self.set(key, 1, ttl)
+                return 1
+            value, expires_at, size = entry
+            self._entries[key] = (value + 1, expires_at, size)
+            self._entries.move_to_end(key)
+            self._frequency[key] += 1
+            return value + 1
+
+    def delete(self, key: str):
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._frequency.clear()
+            self._bytes = 0
+
+    def sweep(self) -> int:
+        """Drop every expired entry; returns how many were removed."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (_, expires_at, _) in self._entries.items() if now >= expires_at]
+            for key in expired:
+                self._remove(key)
+            self.stats['expirations'] += len(expired)
+        return len(expired)
+
+    def start_sweeper(self, interval: float = 60.0):
+        """Sweep expired entries every ``interval`` seconds in a daemon thread."""
+        if self._sweeper is not None or interval <= 0:
+            return
+        self._stop_sweeper.clear()
+
+        def run():
+            while not self._stop_sweeper.wait(interval):
+                try:
+                    self.sweep()
+                except Exception as e:  # keep sweeping on unexpected errors
+                    logger.warning(f"Cache sweep failed: {e}")
+
+        self._sweeper = threading.Thread(target=run, name="memory-cache-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self):
+        if self._sweeper is not None:
+            self._stop_sweeper.set()
+            self._sweeper.join(timeout=1.0)
+            self._sweeper = None
+
+    def get_stats(self) -> Dict:
+        reads = self.stats['hits'] + self.stats['misses']
+        return {
+            'policy': self.policy,
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'bytes': self._bytes if self.max_bytes is not None else None,
+            'max_bytes': self.max_bytes,
+            **self.stats,
+            'hit_rate': self.stats['hits'] / reads if reads else None
+        }
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+            self._frequency.pop(key, None)
+
+    def _evict(self, protect: str):
+        while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes):
+            if self.policy == 'lfu':
+                # Linear scan; min() keeps the first (least recent) of equally frequent keys
+                victim = min((key for key in self._entries if key != protect), key=self._frequency.__getitem__)
+            else:
+                victim = next(iter(self._entries))
+            self._remove(victim)
+            self.stats['evictions'] += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
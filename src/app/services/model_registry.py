@@ -0,0 +1,329 @@
+"""Versioned model registry for the Steel Rebar Price Predictor API."""
+
+import asyncio
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import joblib
+import logging
+
+logger = logging.getLogger(__name__)
+
+VERSION_TIMESTAMP = re.compile(r'(\d{8}_\d{6})')
+ARTIFACT_EXTENSIONS = ('.pkl', '.joblib')
+
+
+class ModelRegistry:
+    """Index of model artifacts with current/previous pointers and an LRU of loaded models.
+
+    Artifacts are the timestamped files in the model directory, e.g.
+    ``alpha_vantage_model_20250928_160405.pkl``, paired with their metadata
+    JSON. The "current" and "previous" pointers live in ``registry.json`` so
+    every instance sharing the directory follows the same version. Both are
+    kept resident in memory, which makes a rollback a pointer swap.
+    """
+
+    POINTER_FILE = "registry.json"
+
+    def __init__(self, model_dir: str = "data/models", max_loaded: int = 3,
+                 validator: Optional[Callable[[Any], bool]] = None):
+        self.model_dir = model_dir
+        self.max_loaded = max(2, max_loaded)
+        self.validator = validator
+        self.versions: Dict[str, Dict] = {}
+        self.current: Optional[str] = None
+        self.previous: Optional[str] = None
+        self._loaded: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._pointer_mtime = None
+        self._listeners: List[Callable[[str, Any], None]] = []
+        os.makedirs(model_dir, exist_ok=True)
+        self.refresh()
+        self._read_pointers()
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> List[str]:
+        """Rescan the model directory and return versions that were not indexed yet."""
+        metadata_by_model = self._index_metadata()
+        found = {}
+        for filename in os.listdir(self.model_dir):
+            if not filename.endswith(ARTIFACT_EXTENSIONS):
+                continue
+            version = os.path.splitext(filename)[0]
+            path = os.path.join(self.model_dir, filename)
+            match = VERSION_TIMESTAMP.search(version)
+            created_at = (datetime.strptime(match.group(1), "%Y%m%d_%H%M%S") if match
+                          else datetime.fromtimestamp(os.path.getmtime(path)))
+            found[version] = {
+                'version': version,
+                'path': path,
+                'created_at': created_at,
+                'size_bytes': os.path.getsize(path),
+                'metadata_path': metadata_by_model.get(filename)
+            }
+
+        with self._lock:
+            new_versions = [version for version in found if version not in self.versions]
+            self.versions = found
+        return sorted(new_versions, key=lambda v: (found[v]['created_at'], v))
+
+    def _index_metadata(self) -> Dict[str, str]:
+        """Map artifact filenames to their metadata JSON files."""
+        metadata = {}
+        for filename in os.listdir(self.model_dir):
+            if not filename.endswith('.json') or filename == self.POINTER_FILE:
+                continue
+            path = os.path.join(self.model_dir, filename)
+            # Naming convention: <name>_metadata_<timestamp>.json
+            for extension in ARTIFACT_EXTENSIONS:
+                metadata[filename.replace('_metadata_', '_model_').replace('.json', extension)] = path
+            # Explicit reference written by some trainers
+            try:
+                with open(path) as f:
+                    model_file = json.load(f).get('model_file')
+                if model_file:
+                    metadata[model_file] = path
+            except (OSError, ValueError, AttributeError):
+                continue
+        return metadata
+
+    def list_versions(self) -> List[Dict]:
+        """Indexed versions, newest first, with pointer and residency flags."""
+        with self._lock:
+            versions = sorted(self.versions.values(), key=lambda v: (v['created_at'], v['version']), reverse=True)
+            return [{
+                'version': v['version'],
+                'created_at': v['created_at'].isoformat(),
+                'size_bytes': v['size_bytes'],
+                'has_metadata': v['metadata_path'] is not None,
+                'is_current': v['version'] == self.current,
+                'is_previous': v['version'] == self.previous,
+                'loaded': v['version'] in self._loaded
+            } for v in versions]
+
+    def get_metadata(self, version: str) -> Dict:
+        """Return the metadata JSON of a version (empty if it has none)."""
+        path = self._get_version(version)['metadata_path']
+        if not path:
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _get_version(self, version: str) -> Dict:
+        if version not in self.versions:
+            self.refresh()
+        if version not in self.versions:
+            raise KeyError(f"Unknown model version: {version}")
+        return self.versions[version]
+
+    # ------------------------------------------------------------------
+    # Loaded-model LRU
+    # ------------------------------------------------------------------
+
+    def load(self, version: str) -> Any:
+        """Return the loaded artifact for ``version``, loading it on a cache miss."""
+        with self._lock:
+            if version in self._loaded:
+                self._loaded.move_to_end(version)
+                return self._loaded[version]
+
+        info = self._get_version(version)
+        artifact = joblib.load(info['path'])
+        if self.validator is not None and not self.validator(artifact):
+            raise ValueError(f"Model version {version} is not compatible with this service")
+
+        with self._lock:
+            self._loaded[version] = artifact
+            self._loaded.move_to_end(version)
+            self._evict(keep=version)
+        logger.info(f"Loaded model version {version}")
+        return artifact
+
+    def _evict(self, keep: Optional[str] = None):
+        """Drop least recently used models, never the current or previous one."""
+        pinned = {self.current, self.previous, keep}
+        for version in list(self._loaded):
+            if len(self._loaded) <= self.max_loaded:
+                break
+            if version not in pinned:
+                del self._loaded[version]
+                logger.info(f"Evicted model version {version} from memory")
+
+    # ------------------------------------------------------------------
+    # Pointers
+    # ------------------------------------------------------------------
+
+    def get_current(self):
+        """Return ``(version, artifact)`` for the current model, or ``(None, None)``.
+
+        The previous version is loaded too, so a rollback does not hit the disk.
+        """
+        with self._lock:
+            version, previous = self.current, self.previous
+        if version is None:
+            return None, None
+        artifact = self.load(version)
+        if previous is not None:
+            try:
+                self.load(previous)
+            except Exception as e:
+                logger.warning(f"Previous model version {previous} is not available for rollback: {e}")
+        return version, artifact
+
+    def promote(self, version: str) -> Any:
+        """Make ``version`` current; the old current becomes previous."""
+        artifact = self.load(version)
+        with self._lock:
+            if version != self.current:
+                self.previous, self.current = self.current, version
+                self._write_pointers()
+                self._evict()
+        logger.info(f"Promoted model version {version} (previous: {self.previous})")
+        self._notify(version, artifact)
+        return artifact
+
+    def rollback(self) -> Any:
+        """Swap current and previous.
+
+        The previous version is normally resident; it is loaded and validated
+        before the pointers change, so a missing or broken artifact leaves the
+        registry as it was.
+        """
+        with self._lock:
+            if self.previous is None:
+                raise ValueError("No previous model version to roll back to")
+            version = self.previous
+        artifact = self.load(version)
+        with self._lock:
+            if self.previous != version:
+                raise ValueError("Model versions changed during rollback")
+            pointers = (self.current, self.previous)
+            self.current, self.previous = version, self.current
+            try:
+                self._write_pointers()
+            except Exception:
+                self.current, self.previous = pointers
+                raise
+        logger.info(f"Rolled back to model version {version}")
+        self._notify(version, artifact)
+        return artifact
+
+    def publish(self, save_fn: Callable[[str], None], prefix: str = "steel_rebar",
+                metadata: Optional[Dict] = None, extension: str = ".joblib") -> str:
+        """Save a new version through ``save_fn(path)``, write its metadata and promote it."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base = f"{prefix}_model_{timestamp}"
+        filename = f"{base}{extension}"
+        suffix = 0
+        while os.path.exists(os.path.join(self.model_dir, filename)):
+            suffix += 1
+            filename = f"{base}_{suffix}{extension}"
+        timestamp = filename[len(f"{prefix}_model_"):-len(extension)]
+        save_fn(os.path.join(self.model_dir, filename))
+
+        metadata_path = os.path.join(self.model_dir, f"{prefix}_metadata_{timestamp}.json")
+        with open(metadata_path, 'w') as f:
+            json.dump({'timestamp': datetime.now().isoformat(), 'model_file': filename, **(metadata or {})},
+                      f, indent=2, default=str)
+
+        self.refresh()
+        version = os.path.splitext(filename)[0]
+        self.promote(version)
+        return version
+
+    def _read_pointers(self) -> bool:
+        """Reload pointers if another process changed them; return True on change."""
+        path = os.path.join(self.model_dir, self.POINTER_FILE)
+        if not os.path.exists(path):
+            return False
+        mtime = os.path.getmtime(path)
+        if mtime == self._pointer_mtime:
+            return False
+        with open(path) as f:
+            pointers = json.load(f)
+        with self._lock:
+            self._pointer_mtime = mtime
+            changed = pointers.get('current') != self.current
+            self.current = pointers.get('current')
+            self.previous = pointers.get('previous')
+        return changed
+
+    def _write_pointers(self):
+        path = os.path.join(self.model_dir, self.POINTER_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'current': self.current,
+                'previous': self.previous,
+                'updated_at': datetime.now().isoformat()
+            }, f, indent=2)
+        os.replace(tmp_path, path)
+        self._pointer_mtime = os.path.getmtime(path)
+
+    # ------------------------------------------------------------------
+    # Hot reload
+    # ------------------------------------------------------------------
+
+    def add_listener(self, callback: Callable[[str, Any], None]):
+        """Register ``callback(version, artifact)``, called whenever the current model changes."""
+        self._listeners.append(callback)
+
+    def _notify(self, version: str, artifact: Any):
+        for callback in self._listeners:
+            try:
+                callback(version, artifact)
+            except Exception as e:
+                logger.error(f"Model change listener failed for {version}: {e}")
+
+    def check_for_updates(self, auto_promote: bool = True) -> Optional[str]:
+        """Pick up pointer changes and, optionally, promote the newest compatible version.
+
+        Returns the version that became current, or None if nothing changed.
+        """
+        if self._read_pointers() and self.current:
+            version, artifact = self.get_current()
+            self._notify(version, artifact)
+            return version
+
+        new_versions = self.refresh()
+        if not auto_promote or not new_versions:
+            return None
+
+        current_created = self.versions[self.current]['created_at'] if self.current in self.versions else None
+        for version in reversed(new_versions):
+            if current_created is not None and self.versions[version]['created_at'] < current_created:
+                break
+            try:
+                self.promote(version)
+                return version
+            except Exception as e:
+                logger.warning(f"Skipping model version {version}: {e}")
+        return None
+
+    async def watch(self, interval: float = 60.0, auto_promote: bool = True):
+        """Poll the model directory forever, hot-swapping new versions."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.check_for_updates, auto_promote)
+            except Exception as e:
+                logger.error(f"Model registry watch failed: {e}")
+
+    def get_stats(self) -> Dict:
+        """Registry summary for health and stats endpoints."""
+        with self._lock:
+            return {
+                'model_dir': self.model_dir,
+                'indexed_versions': len(self.versions),
+                'loaded_versions': list(self._loaded),
+                'current': self.current,
+                'previous': self.previous
+            }
@@ -3,9 +3,18 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import logging
 
+from src.app.utils.indicators import (
+    technical_indicators,
+    indicators_to_frame,
+    frame_values,
+    rsi,
+    stochastic_k
+)
+from src.app.utils.quantile_sketch import QuantileSketchStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -13,8 +22,13 @@ class DataProcessor:
     """Utility class for data processing operations."""
     
     @staticmethod
-    def clean_data(df: pd.DataFrame) -> pd.DataFrame:
-        """Clean and validate data."""
+    def clean_data(df: pd.DataFrame, sketches: Optional[QuantileSketchStore] = None) -> pd.DataFrame:
+        """Clean and validate data.
+        
+        With ``sketches`` the unseen rows are streamed into the per-series
+        quantile sketches and the IQR bounds come from them instead of a full
+        quantile pass per column.
+        """
         if df.empty:
             return df
         
@@ -25,23 +39,23 @@ class DataProcessor:
         df = df.sort_values('date')
         
         # Remove outliers using IQR method
-        numeric_columns = df.select_dtypes(include=[np.number]).columns
+        numeric_columns = [col for col in df.select_dtypes(include=[np.number]).columns if col != 'date']
+        if sketches is not None:
+            sketches.update_frame(df, numeric_columns)
         for col in numeric_columns:
-            if col != 'date':
+            bounds = sketches.bounds(col) if sketches is not None else None
+            if bounds is None:
                 Q1 = df[col].quantile(0.25)
                 Q3 = df[col].quantile(0.75)
                 IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                
-                # Replace outliers with NaN
-                df.loc[(df[col] < lower_bound) | (df[col] > upper_bound), col] = np.nan
-        
-        # Forward fill missing values
-        df = df.fillna(method='ffill')
+                bounds = (Q1 - 1.5 * IQR, Q3 + 1.5 * IQR)
+            lower_bound, upper_bound = bounds
+            
+            # Replace outliers with NaN
+            df.loc[(df[col] < lower_bound) | (df[col] > upper_bound), col] = np.nan
         
-        # Backward fill any remaining missing values
-        df = df.fillna(method='bfill')
+        # Forward fill missing values, then backward fill any remaining ones
+        df = df.ffill().bfill()
         
         return df
     
@@ -53,55 +67,53 @@ class DataProcessor:
         
         df = df.copy()
         
-        # Moving averages
-        for window in [7, 14, 20, 30]:
-            df[f'ma_{window}'] = df[price_col].rolling(window=window).mean()
+        indicators = technical_indicators(frame_values(df, [price_col]))
+        indicator_frame = indicators_to_frame(indicators, [price_col], df.index, prefix_series=False)
         
-        # Exponential moving averages
-        for window in [7, 14, 21]:
-            df[f'ema_{window}'] = df[price_col].ewm(span=window).mean()
+        return DataProcessor._assign_columns(df, indicator_frame)
+    
+    @staticmethod
+    def add_multi_series_indicators(df: pd.DataFrame, columns: List[str] = None,
+                                    volatility_windows: List[int] = None) -> pd.DataFrame:
+        """Add the technical indicator set for many price series in one pass.
         
-        # Bollinger Bands
-        df['bb_middle'] = df[price_col].rolling(window=20).mean()
-        bb_std = df[price_col].rolling(window=20).std()
-        df['bb_upper'] = df['bb_middle'] + (2 * bb_std)
-        df['bb_lower'] = df['bb_middle'] - (2 * bb_std)
-        df['bb_width'] = df['bb_upper'] - df['bb_lower']
-        df['bb_position'] = (df[price_col] - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'])
+        Columns are named ``{series}_{indicator}``. If ``columns`` is omitted
+        every numeric column is treated as a price series.
+        """
+        if df.empty:
+            return df
         
-        # RSI
-        df['rsi_14'] = DataProcessor.calculate_rsi(df[price_col], 14)
+        if columns is None:
+            columns = df.select_dtypes(include=[np.number]).columns.tolist()
+        columns = [col for col in columns if col in df.columns]
+        if not columns:
+            return df
         
-        # MACD
-        ema_12 = df[price_col].ewm(span=12).mean()
-        ema_26 = df[price_col].ewm(span=26).mean()
-        df['macd'] = ema_12 - ema_26
-        df['macd_signal'] = df['macd'].ewm(span=9).mean()
-        df['macd_histogram'] = df['macd'] - df['macd_signal']
+        if volatility_windows is None:
+            volatility_windows = [7, 14, 30]
         
-        # Stochastic Oscillator
-        df['stoch_k'] = DataProcessor.calculate_stochastic(df[price_col], 14)
-        df['stoch_d'] = df['stoch_k'].rolling(window=3).mean()
+        df = df.copy()
         
-        return df
+        indicators = technical_indicators(frame_values(df, columns), volatility_windows=volatility_windows)
+        indicator_frame = indicators_to_frame(indicators, columns, df.index)
+        
+        return DataProcessor._assign_columns(df, indicator_frame)
+    
+    @staticmethod
+    def _assign_columns(df: pd.DataFrame, new_columns: pd.DataFrame) -> pd.DataFrame:
+        """Attach ``new_columns`` to ``df``, replacing any columns with the same name."""
+        df = df.drop(columns=[col for col in new_columns.columns if col in df.columns])
+        return pd.concat([df, new_columns], axis=1)
     
     @staticmethod
     def calculate_rsi(prices: pd.Series, window: int = 14) -> pd.Series:
         """Calculate Relative Strength Index."""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return pd.Series(rsi(prices.to_numpy(dtype=np.float64), window)[:, 0], index=prices.index)
     
     @staticmethod
     def calculate_stochastic(prices: pd.Series, window: int = 14) -> pd.Series:
         """Calculate Stochastic Oscillator %K."""
-        lowest_low = prices.rolling(window=window).min()
-        highest_high = prices.rolling(window=window).max()
-        stoch_k = 100 * ((prices - lowest_low) / (highest_high - lowest_low))
-        return stoch_k
+        return pd.Series(stochastic_k(prices.to_numpy(dtype=np.float64), window)[:, 0], index=prices.index)
     
     @staticmethod
     def add_seasonal_features(df: pd.DataFrame) -> pd.DataFrame:
@@ -186,6 +198,43 @@ class DataProcessor:
         
         return features, target
     
+    @staticmethod
+    def load_processed_history(csv_path: str) -> pd.DataFrame:
+        """Load a processed dataset in the column layout used by SteelRebarPredictor."""
+        raw = pd.read_csv(csv_path, parse_dates=['date'])
+        
+        history = pd.DataFrame({
+            'date': raw['date'],
+            'price': raw['steel_rebar_price']
+        })
+        # Optional economic series, mapped to the predictor's input names
+        optional_columns = {
+            'iron_ore_price': 'iron_ore_price',
+            'coking_coal_price': 'coal_price',
+            'usd_mxn_rate': 'usd_mxn_rate'
+        }
+        for source, target in optional_columns.items():
+            if source in raw.columns:
+                history[target] = raw[source]
+        
+        logger.info(f"Loaded {len(history)} records from {csv_path}")
+        return history
+    
+    @staticmethod
+    def generate_synthetic_history(start: str = '2022-01-01', end: str = '2024-12-31', seed: int = 42) -> pd.DataFrame:
+        """Generate a synthetic history with trend, seasonality and random-walk noise."""
+        dates = pd.date_range(start=start, end=end, freq='D')
+        rng = np.random.default_rng(seed)
+        seasonal = np.sin(2 * np.pi * dates.dayofyear / 365.25) * 30
+        
+        return pd.DataFrame({
+            'date': dates,
+            'price': 650 + np.linspace(0, 100, len(dates)) + seasonal + np.cumsum(rng.normal(0, 4, len(dates))),
+            'iron_ore_price': 100 + np.cumsum(rng.normal(0, 1, len(dates))),
+            'coal_price': 150 + np.cumsum(rng.normal(0, 1.5, len(dates))),
+            'usd_mxn_rate': 20 + np.cumsum(rng.normal(0, 0.05, len(dates)))
+        })
+    
     @staticmethod
     def create_feature_importance_plot(feature_importance: Dict, top_n: int = 10) -> Dict:
         """Create feature importance data for visualization."""
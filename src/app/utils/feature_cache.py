@@ -0,0 +1,80 @@
+"""Content hashing of training frames and an on-disk cache of feature matrices."""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+import joblib
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def frame_hash(df: pd.DataFrame, config: Optional[Dict[str, Any]] = None) -> str:
+    """Stable content hash of a frame (values, column names, dtypes) plus a config dict."""
+    digest = hashlib.sha1()
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    digest.update(json.dumps([list(map(str, df.columns)), list(map(str, df.dtypes))]).encode())
+    if config is not None:
+        digest.update(json.dumps(config, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:20]
+
+
+class FeatureMatrixCache:
+    """Feature and scaled matrices memoized on disk, keyed by content hash.
+
+    Entries are plain joblib files, so the API, the training scripts and the
+    backtester share them as long as they point at the same directory. The
+    oldest entries are removed beyond ``max_entries``.
+    """
+
+    def __init__(self, cache_dir: str = os.path.join("data", "processed", "feature_cache"),
+                 max_entries: int = 20):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"matrices_{key}.joblib")
+
+    def load(self, key: str) -> Optional[Dict]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            self.misses += 1
+            return None
+        try:
+            entry = joblib.load(path)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable feature cache entry {key}: {e}")
+            os.remove(path)
+            self.misses += 1
+            return None
+        # Touch so eviction keeps recently used entries
+        os.utime(path)
+        self.hits += 1
+        return entry
+
+    def save(self, key: str, entry: Dict):
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        joblib.dump(entry, tmp_path)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self):
+        entries = [
+            os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+            if name.startswith("matrices_") and name.endswith(".joblib")
+        ]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=os.path.getmtime)
+        for path in entries[:len(entries) - self.max_entries]:
+            os.remove(path)
+
+    def get_stats(self) -> Dict:
+        return {'cache_dir': self.cache_dir, 'hits': self.hits, 'misses': self.misses}
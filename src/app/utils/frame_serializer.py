@@ -0,0 +1,145 @@
+"""Columnar DataFrame serialization for cache payloads (no pickle).
+
+Frames are written as an Arrow IPC stream with zstd/lz4 compression when
+pyarrow is installed, and otherwise in a small numpy columnar format:
+a JSON header followed by the raw column buffers (zlib-compressed unless
+``compression`` is None). Both formats carry a magic prefix so readers can
+tell them apart; anything else is rejected rather than unpickled.
+"""
+
+import json
+import struct
+import zlib
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    PYARROW_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    PYARROW_AVAILABLE = False
+
+ARROW_MAGIC = b"SRA1"
+COLUMNAR_MAGIC = b"SRN1"
+
+
+class UnsupportedPayload(ValueError):
+    """The payload is not a frame written by this module (or needs pyarrow)."""
+
+
+def serialize_frame(df: pd.DataFrame, compression: Optional[str] = "zstd", use_arrow: Optional[bool] = None) -> bytes:
+    """Serialize a DataFrame; ``compression`` is zstd or lz4 for Arrow (zlib otherwise) or None."""
+    if use_arrow is None:
+        use_arrow = PYARROW_AVAILABLE
+    if use_arrow:
+        return _serialize_arrow(df, compression)
+    return _serialize_columnar(df, compression)
+
+
+def deserialize_frame(payload: bytes) -> pd.DataFrame:
+    """Rebuild a frame.
+
+    Uncompressed payloads are read without copying the column buffers, so
+    their columns are read-only views of ``payload``; copy the frame before
+    modifying it in place. Compressed payloads (either format) give writable
+    columns.
+    """
+    magic = bytes(payload[:4])
+    if magic == ARROW_MAGIC:
+        if not PYARROW_AVAILABLE:
+            raise UnsupportedPayload("Arrow payload but pyarrow is not installed")
+        return _deserialize_arrow(payload)
+    if magic == COLUMNAR_MAGIC:
+        return _deserialize_columnar(payload)
+    raise UnsupportedPayload("Unknown payload format")
+
+
+def is_frame_payload(payload: bytes) -> bool:
+    return bytes(payload[:4]) in (ARROW_MAGIC, COLUMNAR_MAGIC)
+
+
+def _serialize_arrow(df: pd.DataFrame, compression: Optional[str]) -> bytes:
+    table = pa.Table.from_pandas(df, preserve_index=not isinstance(df.index, pd.RangeIndex))
+    # Recorded so the reader knows whether the columns can be zero-copy views
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), b'compression': (compression or '').encode()})
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return ARROW_MAGIC + sink.getvalue().to_pybytes()
+
+
+def _deserialize_arrow(payload: bytes) -> pd.DataFrame:
+    # py_buffer wraps the bytes without copying; uncompressed columns stay (read-only) views
+    buffer = pa.py_buffer(payload)[len(ARROW_MAGIC):]
+    table = pa.ipc.open_stream(buffer).read_all()
+    if (table.schema.metadata or {}).get(b'compression'):
+        # Consolidating the blocks copies the decompressed buffers into writable
+        # arrays; self_destruct releases each Arrow column once it is converted
+        return table.to_pandas(self_destruct=True)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def _serialize_columnar(df: pd.DataFrame, compression: Optional[str]) -> bytes:
+    index_name = None
+    if not isinstance(df.index, pd.RangeIndex):
+        index_name = df.index.name or "__index__"
+        df = df.reset_index(names=index_name)
+
+    columns, buffers = [], []
+    for name in df.columns:
+        series = df[name]
+        if pd.api.types.is_datetime64_dtype(series.dtype):
+            values = series.to_numpy()
+            buffer, kind, dtype = values.view(np.int64).tobytes(), 'datetime', str(values.dtype)
+        elif isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biuf':
+            buffer, kind, dtype = np.ascontiguousarray(series.to_numpy()).tobytes(), 'numeric', series.dtype.str
+        else:
+            values = series.astype(object).where(series.notna(), None).tolist()
+            buffer, kind, dtype = json.dumps(values, default=str).encode(), 'json', str(series.dtype)
+        columns.append({'name': str(name), 'kind': kind, 'dtype': dtype, 'nbytes': len(buffer)})
+        buffers.append(buffer)
+
+    body = b"".join(buffers)
+    if compression:
+        body = zlib.compress(body, 1)
+    header = json.dumps({
+        'n_rows': len(df), 'index': index_name, 'columns': columns,
+        'compression': 'zlib' if compression else None
+    }).encode()
+    return COLUMNAR_MAGIC + struct.pack("<I", len(header)) + header + body
+
+
+def _deserialize_columnar(payload: bytes) -> pd.DataFrame:
+    view = memoryview(payload)
+    (header_size,) = struct.unpack("<I", view[4:8])
+    header = json.loads(bytes(view[8:8 + header_size]))
+    body = view[8 + header_size:]
+    if header['compression'] == 'zlib':
+        # The decompressed buffer is private to this frame, so make it writable
+        body = memoryview(bytearray(zlib.decompress(body)))
+
+    data, offset = {}, 0
+    for column in header['columns']:
+        chunk = body[offset:offset + column['nbytes']]
+        offset += column['nbytes']
+        if column['kind'] == 'numeric':
+            data[column['name']] = np.frombuffer(chunk, dtype=np.dtype(column['dtype']))
+        elif column['kind'] == 'datetime':
+            data[column['name']] = np.frombuffer(chunk, dtype=np.int64).view(column['dtype'])
+        else:
+            values = json.loads(bytes(chunk))
+            try:
+                data[column['name']] = pd.Series(values, dtype=column['dtype'])
+            except (TypeError, ValueError):
+                data[column['name']] = pd.Series(values, dtype=object)
+
+    df = pd.DataFrame(data, copy=False)
+    if header['index'] is not None:
+        df = df.set_index(header['index'])
+        if header['index'] == "__index__":
+            df.index.name = None
+    return df
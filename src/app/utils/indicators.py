@@ -0,0 +1,268 @@
+"""Vectorized technical-indicator kernels for the Steel Rebar Price Predictor.
+
+Every kernel takes a 2D float array shaped (time, series) and computes the
+indicator for all series in a single pass, so wide datasets with dozens of
+commodity columns cost the same number of Python-level operations as a
+single price series. Rolling statistics use cumulative sums and sliding
+window views; exponential averages use a recursive kernel that is compiled
+with numba when it is installed.
+
+Warm-up rows are NaN, matching ``pandas.Series.rolling(window).<stat>()``.
+"""
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    NUMBA_AVAILABLE = False
+
+
+def as_2d(values) -> np.ndarray:
+    """Return ``values`` as a float64 (time, series) array."""
+    array = np.asarray(values, dtype=np.float64)
+    if array.ndim == 1:
+        array = array[:, None]
+    if array.ndim != 2:
+        raise ValueError("Indicator kernels expect a 1D or 2D (time x series) array")
+    return array
+
+
+def _window_sum(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Sum of each trailing window plus the number of NaNs it contains."""
+    n_rows, n_cols = values.shape
+    nan_mask = np.isnan(values)
+
+    padded = np.zeros((n_rows + 1, n_cols))
+    np.cumsum(np.where(nan_mask, 0.0, values), axis=0, out=padded[1:])
+    nan_counts = np.zeros((n_rows + 1, n_cols))
+    np.cumsum(nan_mask, axis=0, out=nan_counts[1:])
+
+    sums = np.full((n_rows, n_cols), np.nan)
+    counts = np.full((n_rows, n_cols), np.nan)
+    if window <= n_rows:
+        sums[window - 1:] = padded[window:] - padded[:-window]
+        counts[window - 1:] = nan_counts[window:] - nan_counts[:-window]
+    return sums, counts
+
+
+def rolling_mean(values, window: int) -> np.ndarray:
+    """Trailing rolling mean via cumulative sums."""
+    values = as_2d(values)
+    sums, nan_counts = _window_sum(values, window)
+    result = sums / window
+    result[nan_counts != 0] = np.nan
+    return result
+
+
+def rolling_std(values, window: int, ddof: int = 1) -> np.ndarray:
+    """Trailing rolling standard deviation via cumulative sums of x and x²."""
+    values = as_2d(values)
+    # Centre each series first so the running sums stay well conditioned.
+    centred = values - np.nanmean(values, axis=0) if len(values) else values
+    sums, nan_counts = _window_sum(centred, window)
+    squares, _ = _window_sum(centred ** 2, window)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = (squares - sums ** 2 / window) / (window - ddof)
+    result = np.sqrt(np.clip(variance, 0.0, None))
+    result[nan_counts != 0] = np.nan
+    return result
+
+
+def _rolling_extreme(values: np.ndarray, window: int, reducer) -> np.ndarray:
+    """Apply ``reducer`` over trailing sliding windows along the time axis."""
+    n_rows, n_cols = values.shape
+    result = np.full((n_rows, n_cols), np.nan)
+    if window <= n_rows:
+        windows = sliding_window_view(values, window, axis=0)
+        # NaN inside a window propagates through min/max, as in pandas.
+        result[window - 1:] = reducer(windows, axis=-1)
+    return result
+
+
+def rolling_min(values, window: int) -> np.ndarray:
+    """Trailing rolling minimum over sliding window views."""
+    return _rolling_extreme(as_2d(values), window, np.min)
+
+
+def rolling_max(values, window: int) -> np.ndarray:
+    """Trailing rolling maximum over sliding window views."""
+    return _rolling_extreme(as_2d(values), window, np.max)
+
+
+def pct_change(values, periods: int = 1) -> np.ndarray:
+    """Percentage change against the value ``periods`` rows earlier."""
+    values = as_2d(values)
+    result = np.full(values.shape, np.nan)
+    if periods < len(values):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result[periods:] = values[periods:] / values[:-periods] - 1.0
+    return result
+
+
+def _ewm_mean_python(values: np.ndarray, alpha: float) -> np.ndarray:
+    """Adjusted exponential mean; loops over time, vectorized over series."""
+    decay = 1.0 - alpha
+    result = np.empty_like(values)
+    numerator = np.zeros(values.shape[1])
+    denominator = np.zeros(values.shape[1])
+    for t in range(values.shape[0]):
+        row = values[t]
+        valid = ~np.isnan(row)
+        numerator = decay * numerator + np.where(valid, row, 0.0)
+        denominator = decay * denominator + valid
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result[t] = np.where(denominator > 0, numerator / denominator, np.nan)
+    return result
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _ewm_mean_numba(values, alpha):  # pragma: no cover - exercised only with numba
+        decay = 1.0 - alpha
+        n_rows, n_cols = values.shape
+        result = np.empty_like(values)
+        for j in range(n_cols):
+            numerator = 0.0
+            denominator = 0.0
+            for t in range(n_rows):
+                x = values[t, j]
+                numerator *= decay
+                denominator *= decay
+                if not np.isnan(x):
+                    numerator += x
+                    denominator += 1.0
+                result[t, j] = numerator / denominator if denominator > 0 else np.nan
+        return result
+
+
+def ewm_mean(values, span: float) -> np.ndarray:
+    """Exponential moving average equivalent to ``Series.ewm(span=span).mean()``."""
+    values = as_2d(values)
+    alpha = 2.0 / (span + 1.0)
+    if NUMBA_AVAILABLE:
+        return _ewm_mean_numba(np.ascontiguousarray(values), alpha)
+    return _ewm_mean_python(values, alpha)
+
+
+def rsi(values, window: int = 14) -> np.ndarray:
+    """Relative Strength Index using simple rolling means of gains and losses."""
+    values = as_2d(values)
+    delta = np.full(values.shape, np.nan)
+    delta[1:] = np.diff(values, axis=0)
+    # NaN deltas count as zero movement, matching ``delta.where(delta > 0, 0)``.
+    gain = rolling_mean(np.where(delta > 0, delta, 0.0), window)
+    loss = rolling_mean(np.where(delta < 0, -delta, 0.0), window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rs = gain / loss
+        return 100 - (100 / (1 + rs))
+
+
+def stochastic_k(values, window: int = 14) -> np.ndarray:
+    """Stochastic Oscillator %K from close prices."""
+    values = as_2d(values)
+    lowest_low = rolling_min(values, window)
+    highest_high = rolling_max(values, window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return 100 * ((values - lowest_low) / (highest_high - lowest_low))
+
+
+def bollinger_bands(values, window: int = 20, num_std: float = 2.0) -> Dict[str, np.ndarray]:
+    """Bollinger middle/upper/lower bands, width and position."""
+    values = as_2d(values)
+    middle = rolling_mean(values, window)
+    std = rolling_std(values, window)
+    upper = middle + num_std * std
+    lower = middle - num_std * std
+    with np.errstate(invalid='ignore', divide='ignore'):
+        position = (values - lower) / (upper - lower)
+    return {
+        'middle': middle,
+        'std': std,
+        'upper': upper,
+        'lower': lower,
+        'width': upper - lower,
+        'position': position
+    }
+
+
+def macd(values, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, np.ndarray]:
+    """MACD line, signal line and histogram."""
+    values = as_2d(values)
+    macd_line = ewm_mean(values, fast) - ewm_mean(values, slow)
+    signal_line = ewm_mean(macd_line, signal)
+    return {
+        'macd': macd_line,
+        'signal': signal_line,
+        'histogram': macd_line - signal_line
+    }
+
+
+def technical_indicators(values,
+                         ma_windows: Sequence[int] = (7, 14, 20, 30),
+                         ema_spans: Sequence[int] = (7, 14, 21),
+                         volatility_windows: Sequence[int] = (),
+                         rsi_window: int = 14,
+                         stochastic_window: int = 14,
+                         bollinger_window: int = 20) -> Dict[str, np.ndarray]:
+    """Compute the standard indicator set for every series in ``values``.
+
+    Returns a mapping of indicator name to a (time, series) array. Names match
+    the columns produced by ``DataProcessor.add_technical_indicators``.
+    """
+    values = as_2d(values)
+    indicators = {}
+
+    for window in ma_windows:
+        indicators[f'ma_{window}'] = rolling_mean(values, window)
+    for span in ema_spans:
+        indicators[f'ema_{span}'] = ewm_mean(values, span)
+    for window in volatility_windows:
+        indicators[f'volatility_{window}'] = rolling_std(values, window)
+
+    bands = bollinger_bands(values, bollinger_window)
+    indicators['bb_middle'] = bands['middle']
+    indicators['bb_upper'] = bands['upper']
+    indicators['bb_lower'] = bands['lower']
+    indicators['bb_width'] = bands['width']
+    indicators['bb_position'] = bands['position']
+
+    indicators[f'rsi_{rsi_window}'] = rsi(values, rsi_window)
+
+    macd_result = macd(values)
+    indicators['macd'] = macd_result['macd']
+    indicators['macd_signal'] = macd_result['signal']
+    indicators['macd_histogram'] = macd_result['histogram']
+
+    indicators['stoch_k'] = stochastic_k(values, stochastic_window)
+    indicators['stoch_d'] = rolling_mean(indicators['stoch_k'], 3)
+
+    return indicators
+
+
+def indicators_to_frame(indicators: Dict[str, np.ndarray],
+                        series_names: List[str],
+                        index: pd.Index,
+                        prefix_series: bool = True) -> pd.DataFrame:
+    """Flatten an indicator mapping into a DataFrame in one allocation.
+
+    Columns are named ``{series}_{indicator}``; with ``prefix_series=False``
+    and a single series the bare indicator names are used instead.
+    """
+    columns = {}
+    for name, block in indicators.items():
+        for j, series in enumerate(series_names):
+            column = f'{series}_{name}' if prefix_series else name
+            columns[column] = block[:, j]
+    return pd.DataFrame(columns, index=index)
+
+
+def frame_values(df: pd.DataFrame, columns: Iterable[str]) -> np.ndarray:
+    """Extract ``columns`` from ``df`` as a contiguous float64 (time, series) array."""
+    return np.ascontiguousarray(df[list(columns)].to_numpy(dtype=np.float64, na_value=np.nan))
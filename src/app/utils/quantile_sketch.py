@@ -0,0 +1,266 @@
+"""Streaming quantile sketches for IQR outlier checks and data-quality scoring."""
+
+import json
+import os
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class P2Quantile:
+    """Single-quantile estimate with the P-square algorithm (Jain & Chlamtac).
+
+    Five markers track the minimum, the maximum, the target quantile and the
+    midpoints between them; each observation moves the markers in O(1)
+    without storing the data. Until five values were seen the quantile is
+    computed exactly from them. Estimates are close for stationary series;
+    on long monotonic runs the markers lag behind the exact quantile.
+    """
+
+    def __init__(self, p: float):
+        self.p = p
+        self.heights = []
+        self.positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self.desired = [1.0, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5.0]
+        self.increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    @property
+    def count(self) -> int:
+        return int(self.positions[4]) if len(self.heights) == 5 else len(self.heights)
+
+    def update(self, x: float):
+        q = self.heights
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if q[i] <= x < q[i + 1])
+
+        n = self.positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                candidate = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < candidate < q[i + 1]:
+                    # Parabolic step would break monotonicity; fall back to linear
+                    candidate = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = candidate
+                n[i] += d
+
+    def value(self) -> float:
+        if not self.heights:
+            return float('nan')
+        if len(self.heights) < 5:
+            return float(np.quantile(self.heights, self.p))
+        return float(self.heights[2])
+
+    def to_dict(self) -> Dict:
+        return {'p': self.p, 'heights': self.heights, 'positions': self.positions, 'desired': self.desired}
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "P2Quantile":
+        sketch = cls(state['p'])
+        sketch.heights = list(state['heights'])
+        sketch.positions = list(state['positions'])
+        sketch.desired = list(state['desired'])
+        return sketch
+
+
+class SeriesSketch:
+    """Quartile sketches, missing count and outlier count of one series.
+
+    Outliers are counted against the IQR fences at the time each value
+    arrives (after a short warm-up), so the outlier ratio never needs a pass
+    over the history.
+    """
+
+    WARMUP = 5
+
+    def __init__(self):
+        self.q1 = P2Quantile(0.25)
+        self.q3 = P2Quantile(0.75)
+        self.observations = 0
+        self.missing = 0
+        self.outliers = 0
+
+    def update(self, value: Optional[float]):
+        self.observations += 1
+        if value is None or not np.isfinite(value):
+            self.missing += 1
+            return
+        if self.q1.count >= self.WARMUP:
+            lower, upper = self.bounds()
+            self.outliers += int(value < lower or value > upper)
+        self.q1.update(float(value))
+        self.q3.update(float(value))
+
+    def bounds(self, k: float = 1.5) -> Tuple[float, float]:
+        """IQR fences ``Q1 - k*IQR`` and ``Q3 + k*IQR``."""
+        q1, q3 = self.q1.value(), self.q3.value()
+        iqr = q3 - q1
+        return q1 - k * iqr, q3 + k * iqr
+
+    @property
+    def missing_ratio(self) -> float:
+        return self.missing / self.observations if self.observations else 0.0
+
+    @property
+    def outlier_ratio(self) -> float:
+        return self.outliers / self.observations if self.observations else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'q1': self.q1.to_dict(), 'q3': self.q3.to_dict(),
+            'observations': self.observations, 'missing': self.missing, 'outliers': self.outliers
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "SeriesSketch":
+        sketch = cls()
+        sketch.q1 = P2Quantile.from_dict(state['q1'])
+        sketch.q3 = P2Quantile.from_dict(state['q3'])
+        sketch.observations = state['observations']
+        sketch.missing = state['missing']
+        sketch.outliers = state['outliers']
+        return sketch
+
+
+class QuantileSketchStore:
+    """Per-series streaming sketches answering IQR bounds and quality in O(series).
+
+    Rows are fed as they arrive; ``update_frame`` skips rows whose date was
+    already seen, so the same history can be passed repeatedly. The store is
+    persisted as JSON next to the processed data. Updates, stats and saves
+    are serialized by a lock so the store can be fed from worker threads.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.series: Dict[str, SeriesSketch] = {}
+        self.last_date = None
+        self._lock = threading.RLock()
+
+    def update(self, name: str, value: Optional[float]):
+        self.series.setdefault(name, SeriesSketch()).update(value)
+
+    def update_row(self, row: Dict[str, Optional[float]]):
+        for name, value in row.items():
+            self.update(name, value)
+
+    def has_unseen_rows(self, df: pd.DataFrame) -> bool:
+        """Whether ``update_frame`` would feed any row of the frame (a cheap date check)."""
+        if 'date' not in df.columns or self.last_date is None:
+            return not df.empty
+        return bool((pd.to_datetime(df['date']) > self.last_date).any())
+
+    def update_frame(self, df: pd.DataFrame, columns: Optional[Iterable[str]] = None) -> int:
+        """Feed the unseen rows of a frame (all of them when it has no dates); returns the count."""
+        with self._lock:
+            return self._update_frame(df, columns)
+
+    def _update_frame(self, df: pd.DataFrame, columns: Optional[Iterable[str]] = None) -> int:
+        if columns is None:
+            columns = [col for col in df.select_dtypes(include=[np.number]).columns if col != 'date']
+        columns = list(columns)
+        new_rows = df
+        if 'date' in df.columns:
+            dates = pd.to_datetime(df['date'])
+            if self.last_date is not None:
+                new_rows = df[dates > self.last_date]
+            new_rows = new_rows.iloc[np.argsort(pd.to_datetime(new_rows['date']).to_numpy(), kind='stable')]
+        for values in new_rows[columns].to_numpy(dtype=np.float64):
+            for name, value in zip(columns, values):
+                self.update(name, value)
+        if 'date' in new_rows.columns and len(new_rows):
+            self.last_date = pd.to_datetime(new_rows['date']).max()
+        return len(new_rows)
+
+    def bounds(self, name: str, k: float = 1.5) -> Optional[Tuple[float, float]]:
+        sketch = self.series.get(name)
+        return sketch.bounds(k) if sketch is not None and sketch.q1.count else None
+
+    def missing_ratio(self) -> float:
+        total = sum(sketch.observations for sketch in self.series.values())
+        return sum(sketch.missing for sketch in self.series.values()) / total if total else 0.0
+
+    def outlier_ratio(self) -> float:
+        if not self.series:
+            return 0.0
+        return float(np.mean([sketch.outlier_ratio for sketch in self.series.values()]))
+
+    def quality_score(self) -> float:
+        """1 - missing ratio - mean outlier ratio, clipped to [0, 1]."""
+        return max(0.0, min(1.0, 1.0 - self.missing_ratio() - self.outlier_ratio()))
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return self._get_stats()
+
+    def _get_stats(self) -> Dict:
+        return {
+            'series': {
+                name: {
+                    'observations': sketch.observations,
+                    'q1': sketch.q1.value(),
+                    'q3': sketch.q3.value(),
+                    'missing_ratio': sketch.missing_ratio,
+                    'outlier_ratio': sketch.outlier_ratio
+                }
+                for name, sketch in self.series.items()
+            },
+            'last_date': self.last_date.isoformat() if self.last_date is not None else None,
+            'quality_score': self.quality_score()
+        }
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        with self._lock:
+            state = {
+                'last_date': self.last_date.isoformat() if self.last_date is not None else None,
+                'series': {name: sketch.to_dict() for name, sketch in self.series.items()}
+            }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "QuantileSketchStore":
+        """Load a persisted store, or start an empty one if there is none."""
+        store = cls(path)
+        if not os.path.exists(path):
+            return store
+        try:
+            with open(path) as f:
+                state = json.load(f)
+            store.series = {name: SeriesSketch.from_dict(s) for name, s in state['series'].items()}
+            store.last_date = pd.Timestamp(state['last_date']) if state.get('last_date') else None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable quantile sketches at {path}: {e}")
+            store = cls(path)
+        return store
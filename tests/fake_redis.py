@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+In-memory stand-ins for the parts of the redis clients used by the cache services
+"""
+
+import asyncio
+import fnmatch
+import time
+
+
+class FakeServer:
+    """Keyspace and pub/sub subscribers shared by every client of one fake server."""
+
+    def __init__(self):
+        self.data = {}       # key -> (value, expires_at or None)
+        self.subscribers = []
+        self.commands = 0
+        self.scan_cursors = {}
+        self.last_cursor = 0
+
+
+class FakePubSub:
+
+    def __init__(self, server):
+        self.server = server
+
+    def subscribe(self, **handlers):
+        for channel, handler in handlers.items():
+            self.server.subscribers.append((channel, handler))
+
+    def run_in_thread(self, sleep_time=1.0, daemon=True):
+        return None
+
+
+class FakePipeline:
+
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        self.client.server.commands += 1
+        return [getattr(self.client, name)(*args, _count=False, **kwargs) for name, args, kwargs in self.calls]
+
+
+class FakeRedis:
+    """Synchronous subset of redis.Redis with TTLs; every command counts one round trip."""
+
+    def __init__(self, server=None):
+        self.server = server or FakeServer()
+
+    def _live(self, key):
+        entry = self.server.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and time.time() >= expires_at:
+            del self.server.data[key]
+            return None
+        return value
+
+    def _count(self, count):
+        if count:
+            self.server.commands += 1
+
+    def ping(self, _count=True):
+        self._count(_count)
+        return True
+
+    def get(self, key, _count=True):
+        self._count(_count)
+        return self._live(key)
+
+    def mget(self, keys, _count=True):
+        self._count(_count)
+        return [self._live(key) for key in keys]
+
+    def set(self, key, value, ex=None, nx=False, _count=True):
+        self._count(_count)
+        if nx and self._live(key) is not None:
+            return None
+        self.server.data[key] = (value if isinstance(value, bytes) else str(value).encode(),
+                                 time.time() + ex if ex else None)
+        return True
+
+    def setex(self, key, ttl, value, _count=True):
+        return self.set(key, value, ex=ttl, _count=_count)
+
+    def pttl(self, key, _count=True):
+        self._count(_count)
+        if self._live(key) is None:
+            return -2
+        expires_at = self.server.data[key][1]
+        return -1 if expires_at is None else int((expires_at - time.time()) * 1000)
+
+    def delete(self, *keys, _count=True):
+        self._count(_count)
+        keys = [key.decode() if isinstance(key, bytes) else key for key in keys]
+        return sum(self.server.data.pop(key, None) is not None for key in keys)
+
+    def unlink(self, *keys, _count=True):
+        return self.delete(*keys, _count=_count)
+
+    def incr(self, key, _count=True):
+        self._count(_count)
+        value = int(self._live(key) or 0) + 1
+        self.server.data[key] = (str(value).encode(), self.server.data.get(key, (None, None))[1])
+        return value
+
+    def scan(self, cursor=0, match=None, count=10, _count=True):
+        """Cursors name the last key returned, so keys deleted mid-walk do not shift the rest."""
+        self._count(_count)
+        after = self.server.scan_cursors.pop(cursor, None) if cursor else None
+        keys = sorted(key for key in self.server.data if after is None or key > after)
+        page = keys[:count]
+        next_cursor = 0
+        if len(keys) > count:
+            self.server.last_cursor += 1
+            next_cursor = self.server.last_cursor
+            self.server.scan_cursors[next_cursor] = page[-1]
+        return next_cursor, [key.encode() for key in page
+                             if (match is None or fnmatch.fnmatch(key, match)) and self._live(key) is not None]
+
+    def keys(self, pattern, _count=True):
+        self._count(_count)
+        return [key.encode() for key in list(self.server.data) if fnmatch.fnmatch(key, pattern) and self._live(key)]
+
+    def publish(self, channel, message, _count=True):
+        self._count(_count)
+        for subscribed, handler in self.server.subscribers:
+            if subscribed == channel:
+                handler({'type': 'message', 'channel': channel, 'data': message})
+        return len(self.server.subscribers)
+
+    def pubsub(self, ignore_subscribe_messages=True):
+        return FakePubSub(self.server)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def info(self, _count=True):
+        self._count(_count)
+        return {'used_memory_human': '1K', 'connected_clients': 1, 'keyspace_hits': 0, 'keyspace_misses': 0}
+
+
+class FakeAsyncPubSub(FakePubSub):
+
+    async def subscribe(self, **handlers):
+        super().subscribe(**handlers)
+
+    async def run(self, poll_timeout=1.0):
+        # Messages are delivered synchronously on publish; just stay alive until cancelled
+        await asyncio.Event().wait()
+
+    async def aclose(self):
+        pass
+
+
+class FakeAsyncPipeline(FakePipeline):
+
+    async def execute(self):
+        return super().execute()
+
+
+class FakeAsyncRedis:
+    """Awaitable wrapper over ``FakeRedis`` sharing the same fake server."""
+
+    def __init__(self, server=None):
+        self.sync = FakeRedis(server)
+        self.server = self.sync.server
+
+    def __getattr__(self, name):
+        method = getattr(self.sync, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+        return call
+
+    def pubsub(self, ignore_subscribe_messages=True):
+        return FakeAsyncPubSub(self.server)
+
+    def pipeline(self, transaction=True):
+        return FakeAsyncPipeline(self.sync)
+
+    async def aclose(self):
+        pass
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Async cache service tests for Steel Rebar Price Predictor
+"""
+
+import pytest
+import redis
+
+from src.app.services import async_cache_service
+from src.app.services.async_cache_service import AsyncCacheService, InstrumentedConnectionPool
+from src.app.services.cache_service import CacheService
+from tests.fake_redis import FakeAsyncRedis, FakeRedis, FakeServer
+
+
+class StubConnection:
+    """Connection that is always ready, so pool bookkeeping can run without a server."""
+
+    def __init__(self, **kwargs):
+        self.pid = None
+
+    async def connect(self):
+        pass
+
+    async def can_read(self):
+        return False
+
+
+@pytest.mark.asyncio
+async def test_async_service_shares_entries_and_invalidations_with_sync_clients(monkeypatch):
+    """Both clients use the same keys, L1 tier and invalidation channel."""
+    server = FakeServer()
+    monkeypatch.setattr(async_cache_service.aioredis, 'Redis', lambda **kwargs: FakeAsyncRedis(server))
+    monkeypatch.setattr(redis, 'from_url', lambda *args, **kwargs: FakeRedis(server))
+    service = AsyncCacheService()
+    script_client = CacheService()
+
+    script_client.set_prediction({'prediction': {'price': 700}})
+    assert (await service.get_prediction())['prediction']['price'] == 700
+    assert (await service.get_prediction())['prediction']['price'] == 700
+    script_client.set_prediction({'prediction': {'price': 720}})
+    assert (await service.get_prediction())['prediction']['price'] == 720
+
+    assert await service.increment_rate_limit('key', limit=1)
+    assert not await service.increment_rate_limit('key', limit=1)
+
+    stats = await service.get_cache_stats()
+    assert stats['redis_connected'] and stats['l1']['hits'] == 1
+    assert 'utilization' in stats['pool']
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_is_bounded_and_records_waits():
+    """A full pool makes callers wait up to the timeout, and the wait is exported."""
+    pool = InstrumentedConnectionPool(max_connections=1, timeout=0.05, connection_class=StubConnection)
+    await pool.get_connection()
+    with pytest.raises(redis.ConnectionError):
+        await pool.get_connection()
+
+    stats = pool.get_stats()
+    assert stats['in_use'] == 1 and stats['utilization'] == 1.0
+    assert stats['timeouts'] == 1 and stats['max_wait_ms'] >= 50
+
+
+@pytest.mark.asyncio
+async def test_async_clear_cache_reclaims_old_generation_in_background(monkeypatch):
+    """Clearing returns after one INCR; the cleanup task deletes the old keys."""
+    server = FakeServer()
+    monkeypatch.setattr(async_cache_service.aioredis, 'Redis', lambda **kwargs: FakeAsyncRedis(server))
+    service = AsyncCacheService(cleanup_batch_size=1, cleanup_pause=0)
+    await service.set_prediction({'prediction': {'price': 700}})
+    await service.set_rate_limit('key', 3)
+
+    assert await service.clear_cache()
+    assert await service.get_prediction() is None
+    await service._cleanup_task
+    assert service.cleanup_stats['deleted'] == 2
+    assert list(server.data) == ['steel_rebar:generation']
+    await service.close()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Walk-forward backtest tests for Steel Rebar Price Predictor
+"""
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+from src.app.models.backtesting import WalkForwardBacktester
+
+
+def test_rolling_folds_respect_window():
+    """Rolling folds keep a fixed-size training window before each origin."""
+    backtester = WalkForwardBacktester(None, horizons=(1,), origin='rolling',
+                                       initial_train_size=100, window_size=50, step=25)
+    folds = backtester.folds(200)
+    assert [fold['origin'] for fold in folds] == [100, 125, 150, 175]
+    assert all(fold['origin'] - fold['train_start'] == 50 for fold in folds)
+
+
+def test_backtest_reports_per_horizon_metrics(tmp_path):
+    """Every horizon gets a MAPE and, for forests, an interval coverage."""
+    rng = np.random.default_rng(0)
+    y = 700 + np.cumsum(rng.normal(0, 2, 240))
+    X = np.column_stack([y, np.roll(y, 1)])
+
+    backtester = WalkForwardBacktester(
+        RandomForestRegressor(n_estimators=10, random_state=0),
+        horizons=(1, 5), initial_train_size=120, step=40, max_workers=2, cache_dir=str(tmp_path)
+    )
+    result = backtester.run(X, y)
+
+    assert result['n_folds'] == 3
+    assert set(result['horizons']) == {1, 5}
+    for metrics in result['horizons'].values():
+        assert 0 < metrics['mape'] < 0.1
+        assert 0 <= metrics['coverage'] <= 1
+    # Targets are the values h steps after each test row
+    predictions = backtester.predictions_
+    assert np.allclose(predictions['actual'], y[predictions['row'] + predictions['horizon']])
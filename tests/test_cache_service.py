@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Cache service tests for Steel Rebar Price Predictor
+"""
+
+import redis
+
+from src.app.services.cache_service import CacheService, PREDICTION_ENTRY
+from tests.fake_redis import FakeRedis, FakeServer
+
+
+def _services(monkeypatch, count=2, **kwargs):
+    server = FakeServer()
+    monkeypatch.setattr(redis, 'from_url', lambda *args, **kw: FakeRedis(server))
+    return server, [CacheService(**kwargs) for _ in range(count)]
+
+
+def test_l1_serves_repeated_reads_and_follows_invalidations(monkeypatch):
+    """Repeated reads stay in process; another worker's write evicts the stale L1 copy."""
+    server, (worker_a, worker_b) = _services(monkeypatch)
+    worker_a.set_prediction({'prediction': {'price': 700}}, ttl=3600)
+
+    assert worker_b.get_prediction()['prediction']['price'] == 700
+    commands = server.commands
+    for _ in range(5):
+        assert worker_b.get_prediction()['prediction']['price'] == 700
+    assert server.commands == commands
+
+    worker_a.set_prediction({'prediction': {'price': 710}}, ttl=3600)
+    assert worker_b.get_prediction()['prediction']['price'] == 710
+
+    stats = worker_b.get_cache_stats()
+    assert stats['l1']['hits'] == 5
+    assert stats['l2']['hits'] == 2
+
+
+def test_rate_limits_bypass_l1(monkeypatch):
+    """Rate counters are shared exactly between workers."""
+    _, (worker_a, worker_b) = _services(monkeypatch)
+    assert worker_a.increment_rate_limit('key', limit=2)
+    assert worker_b.increment_rate_limit('key', limit=2)
+    assert not worker_a.increment_rate_limit('key', limit=2)
+
+
+def test_request_reads_and_rate_limit_share_one_round_trip(monkeypatch):
+    """A request's rate-limit increment and cache reads go out as one pipeline."""
+    server, (worker_a, worker_b) = _services(monkeypatch, generation_refresh=0)
+    assert worker_a.set_many({PREDICTION_ENTRY: ({'price': 700}, 3600), ('history', '2024-01-02'): ([1, 2], 60)})
+
+    entries = [PREDICTION_ENTRY, ('history', '2024-01-02'), ('history', '2024-01-03')]
+    rate_entry = ('rate_limit', 'key')
+    commands = server.commands
+    values, counts = worker_b.fetch(entries, increments={rate_entry: 3600})
+    assert server.commands == commands + 1
+    assert values == {PREDICTION_ENTRY: {'price': 700}, ('history', '2024-01-02'): [1, 2],
+                      ('history', '2024-01-03'): None}
+    assert counts == {rate_entry: 1}
+    assert worker_a.fetch(increments={rate_entry: 3600})[1] == {rate_entry: 2}
+
+
+def test_training_data_is_stored_columnar_and_chunked(monkeypatch):
+    """Large frames are split into chunks, replaced atomically and never pickled."""
+    import numpy as np
+    import pandas as pd
+
+    server, (worker_a, worker_b) = _services(monkeypatch, chunk_size=4096, frame_compression=None)
+    frame = pd.DataFrame({
+        'date': pd.date_range('2020-01-01', periods=2000, freq='D'),
+        'price': np.linspace(600, 900, 2000)
+    })
+    assert worker_a.set_training_data(frame)
+    assert worker_a.set_training_data(frame.iloc[:1500])
+    chunk_keys = [key for key in server.data if ':chunk:' in key]
+    assert 1 < len(chunk_keys) <= 1500 * 16 // 4096 + 2
+
+    pd.testing.assert_frame_equal(worker_b.get_training_data(), frame.iloc[:1500])
+    assert not worker_a.set_training_data({'not': 'a frame'})
+
+    server.data[worker_b._get_cache_key('training_data', 'latest')] = (b'\x80\x04legacy pickle', None)
+    worker_b.l1.clear()
+    assert worker_b.get_training_data() is None
+
+
+def test_clear_cache_bumps_generation_and_scans_old_keys_away(monkeypatch):
+    """Clearing is one INCR seen by every worker; old keys are deleted in SCAN batches."""
+    server, (worker_a, worker_b) = _services(monkeypatch, cleanup_batch_size=2, cleanup_pause=0)
+    worker_a.set_prediction({'prediction': {'price': 700}})
+    for key in ('a', 'b', 'c'):
+        worker_a.set_rate_limit(key, 5)
+    assert worker_b.get_prediction()['prediction']['price'] == 700
+
+    assert worker_a.clear_cache()
+    worker_a._cleanup_thread.join()
+    assert worker_b.generation == worker_a.generation == 1
+    assert worker_b.get_prediction() is None and worker_b.get_rate_limit('a') is None
+    assert worker_a.cleanup_stats['deleted'] == 4
+    assert [key for key in server.data if key != 'steel_rebar:generation'] == []
+
+
+def test_memory_cache_enforces_byte_budget_and_sweeps_expired_entries():
+    """The fallback evicts by estimated bytes (LFU keeps hot keys) and sweeps expired keys."""
+    import time
+    from src.app.services.memory_cache import LRUCache
+
+    cache = LRUCache(max_entries=100, default_ttl=60, max_bytes=3000, policy='lfu')
+    cache.set('hot', b'x' * 900)
+    for _ in range(3):
+        assert cache.get('hot') is not None
+    cache.set('cold', b'x' * 900)
+    cache.set('new', b'x' * 900)
+    cache.set('newer', b'x' * 900)
+    assert cache.get('hot') is not None and cache.get('cold') is None
+    assert cache.get_stats()['bytes'] <= 3000 and cache.stats['evictions'] == 1
+
+    cache.set('too_big', b'x' * 5000)
+    assert cache.get('too_big') is None and cache.stats['rejected'] == 1
+
+    cache.set('short', b'x', ttl=0.01)
+    time.sleep(0.02)
+    assert cache.sweep() == 1 and len(cache) == 3
+
+
+def test_fallback_without_redis_is_bounded(monkeypatch):
+    """Without Redis, entries go to the bounded cache and its stats are reported."""
+    def unavailable(*args, **kwargs):
+        raise redis.ConnectionError("no server")
+    monkeypatch.setattr(redis, 'from_url', unavailable)
+
+    service = CacheService(memory_max_entries=2, sweep_interval=0)
+    for key in ('a', 'b', 'c'):
+        service.set_rate_limit(key, 1)
+    assert service.get_rate_limit('a') is None and service.get_rate_limit('c')['requests'] == 1
+
+    stats = service.get_cache_stats()
+    assert stats['memory_cache_size'] == 2
+    assert stats['memory_cache']['evictions'] == 1
+    service.close()
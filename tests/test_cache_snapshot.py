@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Cache snapshot tests for Steel Rebar Price Predictor
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.app import main
+from src.app.services.cache_service import PREDICTION_ENTRY, TRAINING_DATA_ENTRY
+from src.app.services.cache_snapshot import read_snapshot, write_snapshot
+
+
+def _frame():
+    return pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=30, freq='D'),
+        'price': np.linspace(600, 650, 30)
+    })
+
+
+class _RecordingCache:
+    def __init__(self):
+        self.items = {}
+
+    async def get_many(self, entries):
+        return {entry: None for entry in entries}
+
+    async def set_many(self, items):
+        self.items.update(items)
+        return True
+
+
+def test_snapshot_round_trip(tmp_path):
+    """Prediction, training window and model metadata come back as written."""
+    path = str(tmp_path / "cache_snapshot.bin")
+    frame = _frame()
+    prediction = {'prediction': {'predicted_price_usd_per_ton': 640.5}, 'cached_at': '2024-01-31T10:00:00'}
+    metadata = {'model_version': 'v1', 'training_data_hash': 'abc'}
+
+    assert write_snapshot(path, prediction, frame, metadata, '2024-01-31T09:00:00') > 0
+    snapshot = read_snapshot(path, max_age=60)
+    assert snapshot['prediction'] == prediction and snapshot['model'] == metadata
+    assert snapshot['training_data_cached_at'] == '2024-01-31T09:00:00'
+    pd.testing.assert_frame_equal(snapshot['training_data'], frame)
+
+
+def test_stale_or_corrupt_snapshots_are_ignored(tmp_path):
+    """Startup never fails on a snapshot; it just starts cold."""
+    path = tmp_path / "cache_snapshot.bin"
+    write_snapshot(str(path), {'cached_at': '2024-01-31T10:00:00'}, None, {})
+    assert read_snapshot(str(path), max_age=60)['training_data'] is None
+    assert read_snapshot(str(path), max_age=-1) is None
+
+    path.write_bytes(path.read_bytes()[:10])
+    assert read_snapshot(str(path), max_age=60) is None
+    assert read_snapshot(str(tmp_path / "missing.bin"), max_age=60) is None
+
+
+@pytest.mark.asyncio
+async def test_restore_keeps_the_training_window_expiry(tmp_path, monkeypatch):
+    """A restored training window only gets what was left of its TTL when it was cached."""
+    path = tmp_path / "cache_snapshot.bin"
+    cached_at = datetime.now() - timedelta(hours=20)
+    write_snapshot(str(path), None, _frame(), main.cache_snapshot_metadata(), cached_at.isoformat())
+
+    cache = _RecordingCache()
+    monkeypatch.setattr(main, 'cache_service', cache)
+    monkeypatch.setattr(main, 'training_data_cached_at', None)
+    monkeypatch.setattr(main.settings, 'cache_snapshot_path', str(path))
+    await main.restore_cache_snapshot()
+
+    _, ttl = cache.items[TRAINING_DATA_ENTRY]
+    assert 4 * 3600 - 60 < ttl <= 4 * 3600
+    assert PREDICTION_ENTRY not in cache.items
+    assert main.training_data_cached_at == cached_at
+
+    # A window whose cache time is unknown is not restored with a fresh TTL
+    write_snapshot(str(path), None, _frame(), main.cache_snapshot_metadata())
+    cache.items.clear()
+    await main.restore_cache_snapshot()
+    assert TRAINING_DATA_ENTRY not in cache.items
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Compiled forest tests for Steel Rebar Price Predictor
+"""
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+from src.app.models.compiled_forest import CompiledForest
+
+
+def _forest():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(300, 6))
+    y = 700 + 25 * X[:, 0] - 10 * X[:, 3] + rng.normal(0, 2, 300)
+    model = RandomForestRegressor(n_estimators=25, max_depth=8, random_state=1).fit(X, y)
+    return model, rng.normal(size=(40, 6))
+
+
+def test_compiled_forest_matches_sklearn_per_tree():
+    """The flattened traversal reproduces every tree's prediction."""
+    model, X = _forest()
+    compiled = CompiledForest.from_estimator(model)
+    expected = np.array([tree.predict(X) for tree in model.estimators_])
+    np.testing.assert_allclose(compiled.predict_all(X), expected)
+    np.testing.assert_allclose(compiled.predict(X), model.predict(X))
+
+
+def test_prediction_distribution_shapes():
+    """Mean, bounds and quantiles come back with one value per row."""
+    model, X = _forest()
+    distribution = CompiledForest.from_estimator(model).prediction_distribution(X, quantiles=(0.1, 0.9))
+    assert distribution['tree_predictions'].shape == (25, 40)
+    assert np.all(distribution['lower_bound'] <= distribution['upper_bound'])
+    assert np.all(distribution['quantiles'][0.1] <= distribution['quantiles'][0.9])
+
+
+def test_contributions_add_up_to_prediction():
+    """Bias plus path contributions reproduces the forest prediction per row."""
+    model, X = _forest()
+    bias, contributions = CompiledForest.from_estimator(model).contributions(X)
+    assert contributions.shape == (40, 6)
+    np.testing.assert_allclose(bias + contributions.sum(axis=1), model.predict(X))
+    # The driving features carry the largest contributions
+    assert set(np.argsort(np.abs(contributions).mean(axis=0))[-2:]) == {0, 3}
+
+
+def test_compaction_respects_error_bound():
+    """Compacted forests survive pickling and stay within their error bound."""
+    import pickle
+    from src.app.models.model_compaction import compact_forest, COMPACTION_PROFILES
+
+    model, X = _forest()
+    for profile, settings in COMPACTION_PROFILES.items():
+        compact, stats = compact_forest(model, profile)
+        restored = pickle.loads(pickle.dumps(compact))
+        drift = np.abs(restored.predict(X) - model.predict(X)).max()
+        assert drift <= settings['prune_error'] + stats['max_value_error'] + 1e-9
+        assert stats['nodes_after'] <= stats['nodes_before']
+
+
+def test_compacted_forest_is_re_encoded_not_re_pruned():
+    """Compacting an already compacted forest keeps its nodes and applies the new quantization."""
+    from src.app.models.model_compaction import compact_forest
+
+    model, X = _forest()
+    compact, _ = compact_forest(model, 'balanced')
+    again, stats = compact_forest(compact, 'tiny')
+    assert stats['nodes_after'] == stats['nodes_before'] == compact.n_nodes
+    assert again.value.dtype == np.float16 or stats['value_dtype'] == 'float32'
+    assert np.abs(again.predict(X) - compact.predict(X)).max() <= stats['max_value_error'] + 1e-9
+
+
+def test_loaded_compact_artifact_is_saved_compacted(tmp_path):
+    """Re-saving a served compact artifact with a profile keeps it compacted."""
+    import joblib
+    from src.app.models.ml_model import SteelRebarPredictor
+    from src.app.utils.data_processor import DataProcessor
+
+    history = DataProcessor.generate_synthetic_history(end='2022-08-31')
+    predictor = SteelRebarPredictor()
+    predictor.forest_params['n_estimators'] = 10
+    predictor.train(history)
+    predictor.save_model(str(tmp_path / "first.joblib"), compaction_profile='balanced')
+
+    served = SteelRebarPredictor()
+    served.load_model(str(tmp_path / "first.joblib"))
+    served.save_model(str(tmp_path / "second.joblib"), compaction_profile='lossless')
+    artifact = joblib.load(tmp_path / "second.joblib")
+    assert isinstance(artifact['model'], CompiledForest)
+    assert artifact['compaction']['profile'] == 'lossless'
+    assert abs(served.predict(history)[0] - predictor.predict(history)[0]) < 1.0
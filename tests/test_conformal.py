@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Conformal interval tests for Steel Rebar Price Predictor
+"""
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+
+from src.app.models.conformal import ConformalCalibrator
+
+
+def test_oob_calibration_covers_new_data():
+    """OOB residuals of a forest give intervals close to the nominal coverage."""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(1500, 4))
+    y = 3 * X[:, 0] + rng.normal(0, 1, 1500)
+    model = RandomForestRegressor(n_estimators=60, min_samples_leaf=5, oob_score=True, random_state=0)
+    model.fit(X[:1000], y[:1000])
+
+    calibrator = ConformalCalibrator.from_model(model, X[:1000], y[:1000])
+    lower, upper = calibrator.interval(model.predict(X[1000:]), alpha=0.1)
+    coverage = np.mean((y[1000:] >= lower) & (y[1000:] <= upper))
+
+    assert calibrator.method == 'oob'
+    assert 0.85 <= coverage <= 0.97
+    assert calibrator.radius(0.05) >= calibrator.radius(0.1)
+
+
+def test_models_without_oob_use_a_holdout():
+    """Other models are calibrated on the most recent rows; tiny sets give infinite radius."""
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(200, 2))
+    y = X[:, 0] + rng.normal(0, 0.5, 200)
+    calibrator = ConformalCalibrator.from_model(LinearRegression().fit(X, y), X, y)
+    assert calibrator.method == 'holdout'
+    assert calibrator.n_calibration == 40
+    assert ConformalCalibrator(np.ones(5)).radius(0.05) == float('inf')
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Feature drift monitoring tests for Steel Rebar Price Predictor
+"""
+
+import numpy as np
+
+from src.app.models.drift import DriftMonitor, FeatureSketch
+
+
+def _monitor(**kwargs):
+    rng = np.random.default_rng(0)
+    training = rng.normal(0, 1, size=(1000, 3))
+    sketch = FeatureSketch.from_matrix(training, ['a', 'b', 'c'], level_features=['c'])
+    return DriftMonitor(sketch, **kwargs), rng
+
+
+def test_same_distribution_does_not_trigger():
+    """Rows from the training distribution keep every score near zero."""
+    monitor, rng = _monitor()
+    for row in rng.normal(0, 1, size=(200, 3)):
+        monitor.update(row)
+    assert monitor.should_retrain()['retrain'] is False
+
+
+def test_shift_and_range_exit_trigger_retrain():
+    """A shifted stationary feature and a level leaving its range both count as drift."""
+    monitor, rng = _monitor(min_drifted_features=2)
+    for row in rng.normal(0, 1, size=(100, 3)) + np.array([1.5, 0.0, 10.0]):
+        monitor.update(row)
+    decision = monitor.should_retrain()
+    assert decision['retrain'] is True
+    assert sorted(decision['drifted_features']) == ['a', 'c']
+
+
+def test_live_error_threshold():
+    """Live errors above the threshold trigger a retrain without any drift."""
+    monitor, _ = _monitor(error_threshold=0.02)
+    monitor.record_error(0.05)
+    assert monitor.should_retrain()['reasons'] == ["live MAPE 0.0500 above 0.0200"]
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Dynamic confidence tests for Steel Rebar Price Predictor
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import StandardScaler
+
+from scripts.utilities.dynamic_confidence_calculator import DynamicConfidenceCalculator
+
+
+def _calculator():
+    rng = np.random.default_rng(3)
+    X = np.column_stack([rng.normal(800, 40, 300), rng.normal(20, 5, 300), rng.normal(0, 1, 300)])
+    y = X[:, 0] + rng.normal(0, 5, 300)
+    calculator = DynamicConfidenceCalculator()
+    calculator.scaler = StandardScaler().fit(X)
+    calculator.model = RandomForestRegressor(n_estimators=20, random_state=0).fit(calculator.scaler.transform(X), y)
+    calculator.feature_names = ['price_ma_7', 'price_volatility_7', 'noise']
+    return calculator, X
+
+
+def test_batch_matches_single_row_confidence():
+    """The batch API returns the same components and intervals as row-by-row calls."""
+    calculator, X = _calculator()
+    data = pd.DataFrame(X, columns=calculator.feature_names)
+    data.iloc[5, 2] = np.nan
+    trained = datetime(2024, 1, 1)
+    dates = [trained + timedelta(days=i) for i in range(60)]
+
+    batch = calculator.calculate_dynamic_confidence_batch(X[:60], data.iloc[:60], dates, trained, quality_window=30)
+
+    for i in (0, 31, 59):
+        window = data.iloc[(i // 30) * 30:(i // 30 + 1) * 30]
+        single = calculator.calculate_dynamic_confidence(X[i:i + 1], window, dates[i], trained)
+        assert batch.loc[i, 'confidence_level'] == single['confidence_level']
+        assert np.isclose(batch.loc[i, 'dynamic_confidence'], single['dynamic_confidence'])
+        for name, value in single['components'].items():
+            assert np.isclose(batch.loc[i, name], value)
+        assert np.isclose(batch.loc[i, 'width'], single['prediction_interval']['width'])
+
+
+def test_repeated_snapshot_is_served_from_result_cache():
+    """The same model, feature vector and data hit the LRU; a new model misses it."""
+    calculator, X = _calculator()
+    data = pd.DataFrame(X[:30], columns=calculator.feature_names)
+    trained = datetime(2024, 1, 1)
+
+    first = calculator.calculate_dynamic_confidence(X[:1], data, trained, trained)
+    first['components']['interval_confidence'] = -1.0
+    second = calculator.calculate_dynamic_confidence(X[:1], data, trained, trained)
+    assert calculator.get_result_cache_stats()['hits'] == 1
+    assert second['components']['interval_confidence'] >= 0
+
+    calculator.model = RandomForestRegressor(n_estimators=5, random_state=1).fit(
+        calculator.scaler.transform(X), X[:, 0])
+    calculator.calculate_dynamic_confidence(X[:1], data, trained, trained)
+    assert calculator.get_result_cache_stats()['misses'] == 2
+
+
+def test_windowed_quality_ignores_quality_sketches(tmp_path):
+    """Windowed scores (including the partial tail) use the window IQR and leave the sketches alone."""
+    calculator, X = _calculator()
+    data = pd.DataFrame(X[:70], columns=calculator.feature_names)
+    expected = calculator.calculate_data_quality_scores(data, window=30)
+
+    sketches = calculator.use_quality_sketches(str(tmp_path / "sketches.json"))
+    assert np.allclose(calculator.calculate_data_quality_scores(data, window=30), expected)
+    assert len(expected) == 3
+    assert not sketches.series
+
+
+def test_result_cache_hits_on_first_repeat_with_quality_sketches(tmp_path):
+    """Feeding the sketches happens before the cache key, so an identical repeat is a hit."""
+    calculator, X = _calculator()
+    calculator.use_quality_sketches(str(tmp_path / "sketches.json"))
+    data = pd.DataFrame(X[:30], columns=calculator.feature_names)
+    data['date'] = pd.date_range('2024-01-01', periods=30, freq='D')
+    trained = datetime(2024, 1, 1)
+
+    for _ in range(3):
+        calculator.calculate_dynamic_confidence(X[:1], data, trained, trained)
+    stats = calculator.get_result_cache_stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (2, 1, 1)
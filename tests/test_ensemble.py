@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Blended ensemble tests for Steel Rebar Price Predictor
+"""
+
+import time
+
+import numpy as np
+import pytest
+from sklearn.base import BaseEstimator, RegressorMixin
+
+from src.app.models.ensemble import BlendedEnsemble
+
+
+class _ConstantRegressor(BaseEstimator, RegressorMixin):
+    def __init__(self, value=0.0, delay=0.0):
+        self.value = value
+        self.delay = delay
+
+    def fit(self, X, y):
+        return self
+
+    def predict(self, X):
+        time.sleep(self.delay)
+        return np.full(len(X), self.value)
+
+
+def test_weighted_blend():
+    """Predictions are the weighted mean of the members."""
+    ensemble = BlendedEnsemble(
+        estimators=[('low', _ConstantRegressor(600)), ('high', _ConstantRegressor(700))],
+        weights={'low': 0.75, 'high': 0.25}
+    ).fit(np.zeros((5, 2)), np.zeros(5))
+    assert np.allclose(ensemble.predict(np.zeros((3, 2))), 625)
+
+
+def test_slow_member_is_skipped():
+    """A member over the latency budget is dropped from the blend and then skipped."""
+    ensemble = BlendedEnsemble(
+        estimators=[('fast', _ConstantRegressor(600)), ('slow', _ConstantRegressor(700, delay=0.2))],
+        weights={'fast': 0.5, 'slow': 0.5},
+        latency_budget_ms=50
+    ).fit(np.zeros((5, 2)), np.zeros(5))
+
+    assert np.allclose(ensemble.predict(np.zeros((1, 2))), 600)
+    time.sleep(0.3)  # let the late member record its latency
+    assert np.allclose(ensemble.predict(np.zeros((1, 2))), 600)
+
+    stats = ensemble.get_latency_stats()['members']['slow']
+    assert stats['budget_misses'] == 1
+    assert stats['skipped'] == 1
+
+
+def test_all_zero_weights_rejected():
+    """An ensemble whose members all have zero weight cannot be built."""
+    with pytest.raises(ValueError):
+        BlendedEnsemble(estimators=[('low', _ConstantRegressor(600)), ('high', _ConstantRegressor(700))],
+                        weights={'low': 0, 'high': 0.0})
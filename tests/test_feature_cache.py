@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Training data hash and feature cache tests for Steel Rebar Price Predictor
+"""
+
+from src.app.models.ml_model import SteelRebarPredictor
+from src.app.utils.data_processor import DataProcessor
+
+
+def test_unchanged_data_skips_training_and_reuses_matrices(tmp_path):
+    """Same data is not retrained; a new predictor reuses the cached matrices."""
+    history = DataProcessor.generate_synthetic_history(end='2022-08-31')
+    predictor = SteelRebarPredictor(feature_cache_dir=str(tmp_path))
+    predictor.forest_params['n_estimators'] = 10
+
+    first = predictor.train(history)
+    assert first['cache_hits'] == {'training_data': False, 'feature_matrices': 0, 'feature_matrix_misses': 1}
+
+    skipped = predictor.train(history)
+    assert skipped['training_mode'] == 'skipped'
+    assert skipped['training_data_hash'] == first['training_data_hash']
+
+    other = SteelRebarPredictor(feature_cache_dir=str(tmp_path))
+    other.forest_params['n_estimators'] = 10
+    second = other.train(history)
+    assert second['cache_hits']['feature_matrices'] == 1
+    assert other.feature_names == predictor.feature_names
+
+    changed = predictor.train(history.iloc[:-1])
+    assert changed.get('training_mode') != 'skipped'
+    assert changed['training_data_hash'] != first['training_data_hash']
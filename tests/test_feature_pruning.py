@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Feature pruning tests for Steel Rebar Price Predictor
+"""
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+from src.app.models.feature_pruning import FeaturePruner, required_inputs
+
+
+def test_pruner_drops_duplicates_and_noise():
+    """Duplicated and pure-noise features are removed without hurting MAPE."""
+    rng = np.random.default_rng(0)
+    signal = np.cumsum(rng.normal(0, 1, 300))
+    X = np.column_stack([signal, signal * 1.0001, rng.normal(size=300), rng.normal(size=300)])
+    y = 700 + 5 * signal
+
+    pruner = FeaturePruner(RandomForestRegressor(n_estimators=20, random_state=0),
+                           tolerance=0.05, min_features=1, n_splits=3, n_jobs=1)
+    report = pruner.fit(X, y, ['signal', 'signal_copy', 'noise_a', 'noise_b'])
+
+    assert len(report['selected_features']) == 1
+    assert report['selected_features'][0].startswith('signal')
+    assert report['final_mape'] <= report['baseline_mape'] * 1.05
+
+
+def test_required_inputs_follow_selected_features():
+    """Only inputs with a surviving derived feature are still collected."""
+    prefixes = {'iron_ore_price': 'iron_ore', 'coal_price': 'coal'}
+    assert required_inputs(None, prefixes) is None
+    assert required_inputs(['price_ma_7', 'coal_ma_7'], prefixes) == ['coal_price']
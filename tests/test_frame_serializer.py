@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Frame serialization tests for Steel Rebar Price Predictor
+"""
+
+import pytest
+
+from src.app.utils.data_processor import DataProcessor
+from src.app.utils.frame_serializer import deserialize_frame, serialize_frame
+
+
+def test_compressed_frames_are_writable():
+    """Frames read from compressed payloads can be modified in place and cleaned."""
+    history = DataProcessor.generate_synthetic_history(end='2022-08-31')
+    frame = deserialize_frame(serialize_frame(history, use_arrow=False))
+    assert frame.equals(history)
+
+    frame.loc[0, 'price'] = 0.0
+    assert frame['price'].iloc[0] == 0.0
+    assert len(DataProcessor.clean_data(frame)) == len(history)
+
+
+def test_uncompressed_frames_are_read_only_views():
+    """Uncompressed payloads are read without copying, so they must be copied before writing."""
+    history = DataProcessor.generate_synthetic_history(end='2022-08-31')
+    frame = deserialize_frame(serialize_frame(history, compression=None, use_arrow=False))
+    assert frame.equals(history)
+
+    with pytest.raises(ValueError, match="read-only"):
+        frame.loc[0, 'price'] = 0.0
+    writable = frame.copy()
+    writable.loc[0, 'price'] = 0.0
+    assert writable['price'].iloc[0] == 0.0
+
+
+@pytest.mark.parametrize("compression", ["zstd", "lz4"])
+def test_arrow_round_trip_is_writable(compression):
+    """Compressed Arrow payloads round-trip to frames that can be modified in place."""
+    pytest.importorskip("pyarrow")
+    history = DataProcessor.generate_synthetic_history(end='2022-08-31')
+    payload = serialize_frame(history, compression=compression, use_arrow=True)
+    frame = deserialize_frame(payload)
+    assert frame.equals(history)
+
+    frame.loc[0, 'price'] = 0.0
+    assert frame['price'].iloc[0] == 0.0
+    assert len(DataProcessor.clean_data(frame)) == len(history)
+
+
+def test_uncompressed_arrow_frames_are_read_only_views():
+    """Uncompressed Arrow payloads keep the zero-copy, read-only contract."""
+    pytest.importorskip("pyarrow")
+    history = DataProcessor.generate_synthetic_history(end='2022-08-31')
+    frame = deserialize_frame(serialize_frame(history, compression=None, use_arrow=True))
+    assert frame.equals(history)
+
+    with pytest.raises(ValueError, match="read-only"):
+        frame.loc[0, 'price'] = 0.0
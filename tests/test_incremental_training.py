@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Incremental training tests for Steel Rebar Price Predictor
+"""
+
+from src.app.models.ml_model import SteelRebarPredictor
+from src.app.utils.data_processor import DataProcessor
+
+
+def test_incremental_updates_swap_trees_and_rebuild(tmp_path):
+    """Oldest trees are replaced by a batch fitted on the window until a full rebuild is due."""
+    history = DataProcessor.generate_synthetic_history(end='2022-08-31')
+    predictor = SteelRebarPredictor()
+    predictor.forest_params['n_estimators'] = 10
+    predictor.train(history.iloc[:-3])
+
+    retained = predictor.model.estimators_[4:]
+    first = predictor.train_incremental(history.iloc[:-2], new_trees=4, window_days=60, full_rebuild_every=2)
+    assert first['training_mode'] == 'incremental'
+    assert first['training_samples'] == 60
+    assert first['total_trees'] == 10
+    assert predictor.model.estimators_[:6] == retained
+    assert not any(tree in retained for tree in predictor.model.estimators_[6:])
+
+    second = predictor.train_incremental(history.iloc[:-1], new_trees=4, window_days=60, full_rebuild_every=2)
+    assert second['incremental_updates'] == 2
+    rebuilt = predictor.train_incremental(history, new_trees=4, window_days=60, full_rebuild_every=2)
+    assert rebuilt['training_mode'] == 'full'
+    assert predictor.incremental_updates == 0
+    assert predictor.incremental_batches == 2
+
+    # Batch seeds keep counting across rebuilds instead of repeating
+    after_rebuild = predictor.train_incremental(history.iloc[:-4], new_trees=4, window_days=60, full_rebuild_every=2)
+    assert after_rebuild['incremental_updates'] == 1
+    assert predictor.incremental_batches == 3
+
+    path = tmp_path / "model.joblib"
+    predictor.save_model(str(path))
+    loaded = SteelRebarPredictor()
+    loaded.load_model(str(path))
+    assert loaded.incremental_batches == 3
+    assert loaded.predict(history)[0] == predictor.predict(history)[0]
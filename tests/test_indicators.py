@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Indicator kernel tests for Steel Rebar Price Predictor
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.app.utils import indicators
+from src.app.utils.data_processor import DataProcessor
+
+
+def _price_frame(n_rows=120, n_series=3):
+    rng = np.random.default_rng(7)
+    values = 700 + np.cumsum(rng.normal(0, 5, size=(n_rows, n_series)), axis=0)
+    values[10, 1] = np.nan
+    return pd.DataFrame(values, columns=[f'series_{i}' for i in range(n_series)])
+
+
+def test_rolling_kernels_match_pandas():
+    """Rolling kernels reproduce pandas results for every series at once."""
+    df = _price_frame()
+    values = df.to_numpy()
+    for window in (7, 20):
+        np.testing.assert_allclose(indicators.rolling_mean(values, window), df.rolling(window).mean(), equal_nan=True)
+        np.testing.assert_allclose(indicators.rolling_std(values, window), df.rolling(window).std(), equal_nan=True, rtol=1e-7)
+        np.testing.assert_allclose(indicators.rolling_min(values, window), df.rolling(window).min(), equal_nan=True)
+        np.testing.assert_allclose(indicators.rolling_max(values, window), df.rolling(window).max(), equal_nan=True)
+
+
+def test_ewm_and_rsi_match_pandas():
+    """EMA and RSI kernels reproduce the series-by-series pandas versions."""
+    df = _price_frame().iloc[:, [0, 2]]
+    values = df.to_numpy()
+    np.testing.assert_allclose(indicators.ewm_mean(values, 12), df.ewm(span=12).mean(), equal_nan=True)
+
+    for j, col in enumerate(df.columns):
+        delta = df[col].diff()
+        gain = delta.where(delta > 0, 0).rolling(14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+        expected = 100 - (100 / (1 + gain / loss))
+        np.testing.assert_allclose(indicators.rsi(values, 14)[:, j], expected, equal_nan=True)
+
+
+def test_multi_series_indicators_names_columns_per_series():
+    """DataProcessor adds the indicator set for every requested series."""
+    df = _price_frame()
+    result = DataProcessor.add_multi_series_indicators(df, ['series_0', 'series_2'])
+    assert 'series_0_rsi_14' in result.columns
+    assert 'series_2_macd_histogram' in result.columns
+    assert 'series_1_rsi_14' not in result.columns
+    assert len(result) == len(df)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Model registry tests for Steel Rebar Price Predictor
+"""
+
+import asyncio
+import threading
+
+import joblib
+import pytest
+
+from src.app import main
+from src.app.services.model_registry import ModelRegistry
+
+
+class _ConstantModel:
+    def __init__(self, value):
+        self.value = value
+
+    def predict(self, X):
+        return [self.value] * len(X)
+
+
+def _publish(registry, value):
+    return registry.publish(lambda path: joblib.dump({'model': _ConstantModel(value)}, path),
+                            metadata={'value': value})
+
+
+def test_publish_promote_and_rollback(tmp_path):
+    """Publishing promotes the new version and rollback restores the previous one."""
+    registry = ModelRegistry(str(tmp_path))
+    first = _publish(registry, 1)
+    second = _publish(registry, 2)
+
+    version, artifact = registry.get_current()
+    assert version == second and artifact['model'].value == 2
+    assert registry.previous == first
+    assert registry.get_metadata(second)['value'] == 2
+
+    assert registry.rollback()['model'].value == 1
+    assert (registry.current, registry.previous) == (first, second)
+
+
+def test_rollback_after_restart_is_resident_or_leaves_pointers(tmp_path):
+    """A restarted registry preloads the previous version; a missing one does not corrupt the pointers."""
+    registry = ModelRegistry(str(tmp_path))
+    first = _publish(registry, 1)
+    second = _publish(registry, 2)
+
+    restarted = ModelRegistry(str(tmp_path))
+    restarted.get_current()
+    assert set(restarted.get_stats()['loaded_versions']) == {first, second}
+
+    broken = ModelRegistry(str(tmp_path))
+    (tmp_path / f"{first}.joblib").unlink()
+    broken.get_current()
+    with pytest.raises(FileNotFoundError):
+        broken.rollback()
+    assert (broken.current, broken.previous) == (second, first)
+    assert ModelRegistry(str(tmp_path)).get_current()[0] == second
+
+
+def test_lru_keeps_current_and_previous(tmp_path):
+    """Eviction never drops the current or previous version."""
+    registry = ModelRegistry(str(tmp_path), max_loaded=2)
+    versions = [_publish(registry, value) for value in range(4)]
+    assert set(registry.get_stats()['loaded_versions']) == {versions[2], versions[3]}
+
+    registry.load(versions[0])
+    registry.load(versions[1])
+    assert set(registry.get_stats()['loaded_versions']) == {versions[1], versions[2], versions[3]}
+
+
+def test_other_instance_hot_reloads(tmp_path):
+    """A second registry on the same directory follows new versions and pointer changes."""
+    writer = ModelRegistry(str(tmp_path))
+    first = _publish(writer, 1)
+    reader = ModelRegistry(str(tmp_path))
+    swaps = []
+    reader.add_listener(lambda version, artifact: swaps.append(version))
+
+    second = _publish(writer, 2)
+    assert reader.check_for_updates() == second
+    writer.rollback()
+    assert reader.check_for_updates() == first
+    assert swaps == [second, first]
+
+
+def test_incompatible_versions_are_not_promoted(tmp_path):
+    """Artifacts rejected by the validator cannot become current."""
+    registry = ModelRegistry(str(tmp_path), validator=lambda artifact: isinstance(artifact, dict))
+    with pytest.raises(ValueError):
+        registry.publish(lambda path: joblib.dump([1, 2, 3], path))
+    assert registry.current is None
+
+
+class _RecordingPredictor:
+    last_training_date = None
+
+    def __init__(self):
+        self.loaded_in = []
+
+    def load_model_data(self, model_data):
+        self.loaded_in.append(threading.current_thread())
+
+
+class _NullCache:
+    async def invalidate_prediction(self):
+        return True
+
+
+@pytest.mark.asyncio
+async def test_hot_swap_runs_on_the_event_loop(tmp_path, monkeypatch):
+    """Listeners called from worker threads swap the serving model on the loop, once per version."""
+    registry = ModelRegistry(str(tmp_path))
+    predictor = _RecordingPredictor()
+    monkeypatch.setattr(main, 'ml_model', predictor)
+    monkeypatch.setattr(main, 'cache_service', _NullCache())
+    monkeypatch.setattr(main, 'serving_model_version', None)
+    monkeypatch.setattr(main, 'event_loop', asyncio.get_running_loop())
+    registry.add_listener(main.activate_model_version)
+
+    version = await asyncio.to_thread(_publish, registry, 1)
+    await asyncio.to_thread(registry.promote, version)
+    # The swap is queued on the loop before to_thread returns, so it has already run
+
+    assert main.serving_model_version == version
+    assert predictor.loaded_in == [threading.main_thread()]
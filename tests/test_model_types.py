@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Model type tests for Steel Rebar Price Predictor
+"""
+
+import numpy as np
+
+from src.app.models.ml_model import SteelRebarPredictor
+from src.app.utils.data_processor import DataProcessor
+
+
+def test_hist_gradient_boosting_trains_predicts_and_round_trips(tmp_path):
+    """The gradient boosting engine gets permutation importances and survives save/load."""
+    history = DataProcessor.generate_synthetic_history(end='2022-08-31')
+    predictor = SteelRebarPredictor(model_type='hist_gradient_boosting')
+
+    result = predictor.train(history)
+    assert result.get('training_mode') != 'skipped'
+    importances = predictor.feature_importances
+    assert len(importances) == len(predictor.feature_names)
+    assert np.all(np.isfinite(importances))
+
+    price, details = predictor.predict(history)
+    assert 0 < price < 2 * history['price'].max()
+
+    path = tmp_path / "model.joblib"
+    predictor.save_model(str(path))
+    loaded = SteelRebarPredictor(model_type='hist_gradient_boosting')
+    loaded.load_model(str(path))
+    assert type(loaded.model) is type(predictor.model)
+    assert np.allclose(loaded.feature_importances, importances)
+    assert loaded.predict(history)[0] == price
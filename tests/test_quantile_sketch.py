@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Streaming quantile sketch tests for Steel Rebar Price Predictor
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.app.utils.data_processor import DataProcessor
+from src.app.utils.quantile_sketch import P2Quantile, QuantileSketchStore
+
+
+def test_p2_quartiles_track_exact_quantiles():
+    """P-square estimates stay close to the exact quartiles of a stationary series."""
+    values = np.random.default_rng(0).normal(100, 10, 5000)
+    q1, q3 = P2Quantile(0.25), P2Quantile(0.75)
+    for value in values:
+        q1.update(value)
+        q3.update(value)
+    assert abs(q1.value() - np.quantile(values, 0.25)) < 0.5
+    assert abs(q3.value() - np.quantile(values, 0.75)) < 0.5
+
+
+def test_store_skips_seen_rows_and_persists(tmp_path):
+    """Re-sent history is not counted twice and the state survives a reload."""
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=300, freq='D'),
+        'price': rng.normal(700, 5, 300)
+    })
+    df.loc[10, 'price'] = np.nan
+    df.loc[200, 'price'] = 900.0
+
+    path = str(tmp_path / 'sketches.json')
+    store = QuantileSketchStore(path)
+    assert store.has_unseen_rows(df)
+    assert store.update_frame(df) == 300
+    assert not store.has_unseen_rows(df)
+    assert store.update_frame(df) == 0
+    store.save()
+
+    reloaded = QuantileSketchStore.load(path)
+    assert reloaded.series['price'].observations == 300
+    assert reloaded.missing_ratio() == 1 / 300
+    assert reloaded.series['price'].outliers >= 1
+    assert reloaded.quality_score() == store.quality_score()
+
+    cleaned = DataProcessor.clean_data(df, sketches=reloaded)
+    assert cleaned['price'].max() < 900.0
+    assert not cleaned['price'].isna().any()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Retraining trigger tests for Steel Rebar Price Predictor
+"""
+
+from datetime import datetime
+
+import pytest
+
+from src.app import main
+from src.app.models.ml_model import SteelRebarPredictor
+from src.app.utils.data_processor import DataProcessor
+
+
+class _StaticCollector:
+    def __init__(self, history):
+        self.history = history
+        self.collections = 0
+
+    def get_all_economic_data(self, sources=None):
+        self.collections += 1
+        return {}
+
+    def combine_data_for_training(self, economic_data):
+        return self.history
+
+
+class _StaleCache:
+    def __init__(self, history):
+        self.history = history
+
+    async def get_training_data(self):
+        return self.history
+
+    async def set_training_data(self, data, ttl=None):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_live_error_trigger_skips_cache_and_resets_when_nothing_changed(monkeypatch):
+    """A live-error retrain collects fresh data; if it is unchanged the trigger is reset."""
+    history = DataProcessor.generate_synthetic_history(end='2022-08-31')
+    predictor = SteelRebarPredictor(drift_settings={'error_threshold': 0.01})
+    predictor.forest_params['n_estimators'] = 10
+    predictor.train(history)
+    predictor.drift_monitor.record_error(0.05)
+
+    collector = _StaticCollector(history)
+    monkeypatch.setattr(main, 'ml_model', predictor)
+    monkeypatch.setattr(main, 'data_collector', collector)
+    monkeypatch.setattr(main, 'cache_service', _StaleCache(history))
+    monkeypatch.setattr(main, 'last_model_update', datetime.now())
+    monkeypatch.setattr(main.settings, 'incremental_training', False)
+
+    assert main.retraining_reasons() == ["live MAPE 0.0500 above 0.0100"]
+    await main.train_model_if_needed()
+
+    assert collector.collections == 1
+    assert main.retraining_reasons() == []
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Validation strategy tests for Steel Rebar Price Predictor
+"""
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from src.app.models.validation import get_validation_strategy, confidence_from_mape, oob_mask
+
+
+def _fitted_forest():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 4))
+    y = 700 + 20 * X[:, 0] + rng.normal(0, 2, 200)
+    model = RandomForestRegressor(n_estimators=20, random_state=0, oob_score=True, bootstrap=True)
+    model.fit(X, y)
+    return model, X, y
+
+
+@pytest.mark.parametrize("strategy", ["oob", "timeseries", "kfold"])
+def test_strategies_return_mape(strategy):
+    """Every strategy reports a small positive MAPE for an easy problem."""
+    model, X, y = _fitted_forest()
+    result = get_validation_strategy(strategy, n_splits=3, n_jobs=1).evaluate(model, X, y)
+    assert result['strategy'] == strategy
+    assert 0 < result['mape'] < 0.1
+    assert 0.5 <= confidence_from_mape(result['mape']) <= 0.95
+
+
+def test_unknown_strategy_rejected():
+    """Unknown strategy names raise a ValueError."""
+    with pytest.raises(ValueError):
+        get_validation_strategy("bootstrap")
+
+
+def test_oob_ignores_rows_without_oob_votes():
+    """Rows that were in every bootstrap (reported as 0 by sklearn) are left out of the OOB score."""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(30, 3))
+    y = 700 + 20 * X[:, 0] + rng.normal(0, 2, 30)
+    model = RandomForestRegressor(n_estimators=3, random_state=0, oob_score=True, bootstrap=True).fit(X, y)
+
+    mask = oob_mask(model, len(y))
+    assert not mask.all()
+    assert np.all(model.oob_prediction_[~mask] == 0)
+    result = get_validation_strategy("oob").evaluate(model, X, y)
+    assert result['mape'] < 0.1